@@ -1,10 +1,16 @@
+import time
 from typing import Dict
 
 from robotics_integration_tests.custom_containers.sara import Sara
 from robotics_integration_tests.settings.settings import settings
+from testcontainers.core.container import DockerContainer
 from testcontainers.core.network import Network
 from loguru import logger
-from robotics_integration_tests.custom_containers.azurite import FlotillaStorage
+from robotics_integration_tests.custom_containers.azurite import (
+    FlotillaStorage,
+    clear_blob_containers,
+    list_blob_containers,
+)
 from robotics_integration_tests.custom_containers.flotilla_backend import (
     FlotillaBackend,
 )
@@ -13,8 +19,16 @@ from robotics_integration_tests.custom_containers.mosquitto import FlotillaBroke
 from robotics_integration_tests.custom_containers.postgres import (
     FlotillaDatabase,
     SaraDatabase,
+    reset_database,
 )
+from robotics_integration_tests.utilities.isar_simulator import SimulatedIsarRobot
 from robotics_integration_tests.utilities.keyvault import Keyvault
+from robotics_integration_tests.utilities.seed_dataset import load_seed_dataset
+from robotics_integration_tests.utilities.seeding import (
+    seed_flotilla,
+    wait_for_database_to_be_populated,
+)
+from robotics_integration_tests.utilities.status_watcher import FlotillaStatusWatcher
 
 
 class Armada:
@@ -27,7 +41,30 @@ class Armada:
         self.flotilla_storage: FlotillaStorage | None = None
         self.sara: Sara | None = None
         self.sara_database: SaraDatabase | None = None
-        self.robots: Dict[str, IsarRobot] = {}
+        self.robots: Dict[str, IsarRobot | SimulatedIsarRobot] = {}
+        self.status_watcher: FlotillaStatusWatcher | None = None
+
+    def containers(self) -> Dict[str, DockerContainer]:
+        """Running containers of the armada by name, robots included."""
+        containers: Dict[str, DockerContainer | None] = {
+            "flotilla_database": self.flotilla_database
+            and self.flotilla_database.database,
+            "flotilla_broker": self.flotilla_broker and self.flotilla_broker.broker,
+            "flotilla_backend": self.flotilla_backend
+            and self.flotilla_backend.container,
+            "sara": self.sara and self.sara.container,
+            "sara_database": self.sara_database and self.sara_database.database,
+        }
+        if self.flotilla_storage is not None:
+            for alias, azurite in self.flotilla_storage.azurite_containers.items():
+                containers[f"azurite_{alias}"] = azurite.container
+        for name, robot in list(self.robots.items()):
+            containers[name] = robot.container
+        return {
+            name: container
+            for name, container in containers.items()
+            if container is not None
+        }
 
     def log_startup_info(self) -> None:
         logger.info("Armada has been deployed")
@@ -37,9 +74,58 @@ class Armada:
         logger.info(
             f"Backend exposed port is {self.flotilla_backend.container.get_exposed_port(8000)}"
         )
+        simulated_robots: int = 0
+        for robot in self.robots.values():
+            if robot.container is None:
+                simulated_robots += 1
+                continue
+            logger.info(
+                f"ISAR Robot {robot.name} in {robot.installation_code} exposed port is {robot.container.get_exposed_port(robot.port)}"
+            )
+        if simulated_robots:
+            logger.info(f"{simulated_robots} simulated ISAR robots are running")
         logger.info(
-            f"ISAR Robot exposed port is {self.robots[settings.ISAR_ROBOT_NAME].container.get_exposed_port(3000)}"
+            f"Sara exposed port is {self.sara.container.get_exposed_port(8100)}"
         )
+
+    def reset_state(self) -> None:
+        """Bring a deployed armada back to the state it had right after deployment.
+
+        Robots are not kept between tests, each new ISAR robot registers itself in
+        Flotilla again when it connects to the broker.
+        """
+        start_time: float = time.perf_counter()
+        self.robots.clear()
+
+        self.reset_databases()
+        for azurite_container in self.flotilla_storage.azurite_containers.values():
+            # Fleets also upload to the containers of the installations they are in
+            clear_blob_containers(
+                azurite_container.host_connection_string,
+                *list_blob_containers(azurite_container.host_connection_string),
+            )
+        self.seed()
+
         logger.info(
-            f"Sara exposed port is {self.sara.container.get_exposed_port(8100)}"
+            f"Armada state has been reset in {time.perf_counter() - start_time:.2f} seconds"
+        )
+
+    def reset_databases(self) -> None:
+        reset_database(
+            database=self.flotilla_database.database,
+            username=settings.DB_USER,
+            dbname=settings.DB_ALIAS,
+        )
+        reset_database(
+            database=self.sara_database.database,
+            username=settings.SARA_DB_USER,
+            dbname=settings.SARA_DB_ALIAS,
+        )
+
+    def seed(self) -> None:
+        seed_flotilla(
+            backend_url=self.flotilla_backend.backend_url,
+            flotilla_database=self.flotilla_database,
+            seed_data=load_seed_dataset(settings.SEED_DATASET),
         )
+        wait_for_database_to_be_populated(backend_url=self.flotilla_backend.backend_url)
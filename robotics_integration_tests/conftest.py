@@ -1,388 +1,220 @@
-import time
-from contextlib import ExitStack
-from datetime import datetime
-from typing import Dict
+import re
+import uuid
+from pathlib import Path
 
 import pytest
 from loguru import logger
-from testcontainers.core.container import DockerContainer
 from testcontainers.core.network import Network
 
 from robotics_integration_tests.armada import Armada
-from robotics_integration_tests.custom_containers.azurite import (
-    create_azurite_container,
-    azurite_connection_string_for_containers,
-    ensure_blob_containers,
-    FlotillaStorage,
-    AzuriteStorageContainer,
+from robotics_integration_tests.custom_containers.images import prepare_images
+from robotics_integration_tests.custom_containers.log_store import (
+    prune_log_directories,
 )
-from robotics_integration_tests.custom_containers.flotilla_backend import (
-    create_flotilla_backend_container,
-    FlotillaBackend,
-)
-from robotics_integration_tests.custom_containers.isar import (
-    create_isar_robot_container,
-    IsarRobot,
-)
-from robotics_integration_tests.custom_containers.migrations_runner import (
-    create_migrations_runner_container,
-    create_sara_migrations_runner_container,
-)
-from robotics_integration_tests.custom_containers.mosquitto import (
-    create_flotilla_broker_container,
-    FlotillaBroker,
-)
-from robotics_integration_tests.custom_containers.postgres import (
-    SaraDatabase,
-    create_postgres_container,
-    FlotillaDatabase,
-    create_sara_postgres_container,
-)
-from robotics_integration_tests.custom_containers.sara import (
-    Sara,
-    create_sara_container,
-)
-from robotics_integration_tests.custom_containers.stream_logging_docker_container import (
-    StreamLoggingDockerContainer,
+from robotics_integration_tests.deployment import (
+    deploy_armada_without_robots,
+    deploy_isar_fleet,
+    deploy_isar_robot,
+    deploy_simulated_isar_fleet,
 )
 from robotics_integration_tests.settings.settings import settings
-from robotics_integration_tests.utilities.flotilla_backend_api import (
-    setup_robot_in_flotilla,
-    wait_for_backend_to_be_responsive,
-    populate_database_with_minimum_models,
-    wait_for_database_to_be_populated,
-)
-from robotics_integration_tests.utilities.keyvault import Keyvault
-from robotics_integration_tests.utilities.sara_backend_api import (
-    wait_for_sara_to_be_responsive,
+from robotics_integration_tests.startup_profiler import StartupProfiler
+from robotics_integration_tests.utilities.benchmarking import BenchmarkSuite
+from robotics_integration_tests.utilities.keyvault import Keyvault, create_keyvault
+from robotics_integration_tests.utilities.mission_timeline import (
+    MissionTimeline,
+    start_recording,
+    stop_recording,
 )
+from robotics_integration_tests.utilities.polling import recorded_poll_metrics
+from robotics_integration_tests.utilities.resource_telemetry import ResourceSampler
 
 
-@pytest.fixture
-def keyvault():
-    keyvault: Keyvault = Keyvault(
-        keyvault_name=settings.KEYVAULT_NAME,
-        client_secret=settings.FLOTILLA_AZURE_CLIENT_SECRET,
-        client_id=settings.FLOTILLA_AZURE_CLIENT_ID,
-        tenant_id=settings.AZURE_TENANT_ID,
-    )
-
-    yield keyvault
-
-
-@pytest.fixture
-def network():
-    with Network() as network:
-        yield network
-
-
-@pytest.fixture
-def flotilla_database(network: Network, keyvault: Keyvault):
-    with create_postgres_container(network) as database:
-        wait_for_port_mapping_to_be_available(container=database, port=5432)
-        logger.info(
-            f"Postgres URL: {database.get_connection_url()}, "
-            f"Port: {database.get_exposed_port(5432)}"
+def _armada_scope(fixture_name: str, config: pytest.Config) -> str:
+    if settings.ARMADA_SCOPE not in ("function", "session"):
+        raise ValueError(
+            f"ARMADA_SCOPE must be 'function' or 'session', got '{settings.ARMADA_SCOPE}'"
         )
+    return settings.ARMADA_SCOPE
 
-        connection_string: str = (
-            f"Host={settings.DB_ALIAS}; Port={5432}; Username={settings.DB_USER}; Password={settings.DB_PASSWORD}; "
-            f"Database={settings.DB_ALIAS}; SSL Mode=Disable;"
-        )
-
-        with create_migrations_runner_container(
-            network=network,
-            postgres_connection_string=connection_string,
-        ) as migrations_runner:
-            # Block until the container exits; returns {"StatusCode": int}
-            result = migrations_runner.get_wrapped_container().wait()
-            status = int(result.get("StatusCode", 1))
-            if status != 0:
-                raise RuntimeError(f"Migrator failed with exit code {status}")
-
-        logger.info("Migrations completed successfully (container exited cleanly)")
-
-        keyvault.set_secret(
-            secret_name="flotilla-database-connection-string",
-            secret_value=connection_string,
-        )
 
-        yield FlotillaDatabase(
-            database=database,
-            connection_string=connection_string,
-            alias=settings.DB_ALIAS,
-        )
+def _artifact_name(request: pytest.FixtureRequest) -> str:
+    return re.sub(r"[^\w.-]+", "_", request.node.nodeid)
 
 
-@pytest.fixture
-def sara_database(network: Network, keyvault: Keyvault):
-    with create_sara_postgres_container(network) as database:
-        wait_for_port_mapping_to_be_available(container=database, port=5432)
-        logger.info(
-            f"Postgres URL: {database.get_connection_url()}, "
-            f"Port: {database.get_exposed_port(5432)}"
-        )
+_image_session_id_key: pytest.StashKey[str] = pytest.StashKey[str]()
 
-        connection_string: str = (
-            f"Host={settings.SARA_DB_ALIAS}; Port={5432}; Username={settings.SARA_DB_USER}; Password={settings.SARA_DB_PASSWORD}; "
-            f"Database={settings.SARA_DB_ALIAS}; SSL Mode=Disable;"
-        )
 
-        with create_sara_migrations_runner_container(
-            network=network,
-            postgres_connection_string=connection_string,
-        ) as migrations_runner:
-            # Block until the container exits; returns {"StatusCode": int}
-            result = migrations_runner.get_wrapped_container().wait()
-            status = int(result.get("StatusCode", 1))
-            if status != 0:
-                raise RuntimeError(f"Sara migrator failed with exit code {status}")
-
-        logger.info("Sara migrations completed successfully (container exited cleanly)")
-
-        keyvault.set_secret(
-            secret_name="sara-database-connection-string",
-            secret_value=connection_string,
+def pytest_configure(config: pytest.Config) -> None:
+    if settings.STARTUP_PROFILE_ENABLED:
+        config.pluginmanager.register(StartupProfiler(), "startup-profiler")
+    if not hasattr(config, "workerinput"):
+        prune_log_directories(
+            directory=Path(settings.CONTAINER_LOG_DIRECTORY),
+            keep=settings.CONTAINER_LOG_KEEP_RUNS,
         )
-
-        yield SaraDatabase(
-            database=database,
-            connection_string=connection_string,
-            alias=settings.SARA_DB_ALIAS,
+    if settings.IMAGE_PREPULL_ENABLED and not config.option.collectonly:
+        is_xdist_worker: bool = hasattr(config, "workerinput")
+        # The controller hands its session id to the workers in pytest_configure_node
+        session_id: str = (
+            config.workerinput.get("armada_image_session_id", "")
+            if is_xdist_worker
+            else uuid.uuid4().hex
         )
+        config.stash[_image_session_id_key] = session_id
+        try:
+            prepare_images(session_id=session_id, is_xdist_worker=is_xdist_worker)
+        except Exception as e:
+            logger.warning(f"Failed to pre-pull images, pulling them on demand: {e}")
 
 
-@pytest.fixture
-def flotilla_storage(network: Network, keyvault: Keyvault):
-    with ExitStack() as stack:
-        azurite_containers: Dict[str, AzuriteStorageContainer] = {}
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node) -> None:
+    node.workerinput["armada_image_session_id"] = node.config.stash.get(
+        _image_session_id_key, ""
+    )
 
-        for azurite_container_alias in settings.AZURITE_ALIASES:
-            container: StreamLoggingDockerContainer = stack.enter_context(
-                create_azurite_container(network=network, name=azurite_container_alias)
-            )
 
-            wait_for_port_mapping_to_be_available(container=container, port=10000)
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    for statistics in recorded_poll_metrics():
+        logger.info(
+            f"{statistics.description}: {statistics.polls} polls, "
+            f"{statistics.timeouts} timed out, {statistics.attempts} attempts, "
+            f"{statistics.total_elapsed:.2f} seconds in total, "
+            f"{statistics.max_elapsed:.2f} seconds at most"
+        )
+
+
+@pytest.fixture(autouse=True)
+def mission_timeline(request: pytest.FixtureRequest):
+    """Timeline of the status transitions of mission runs, tasks and robots the test
+    fetches from Flotilla."""
+    if not settings.MISSION_TIMELINE_ENABLED:
+        yield None
+        return
+
+    timeline: MissionTimeline = MissionTimeline(name=_artifact_name(request))
+    start_recording(timeline)
+    try:
+        yield timeline
+    finally:
+        stop_recording(timeline)
+        timeline.write(Path(settings.MISSION_TIMELINE_DIRECTORY))
+
+
+@pytest.fixture(scope="session")
+def benchmark_suite():
+    suite: BenchmarkSuite = BenchmarkSuite(
+        baselines_path=Path(
+            settings.BENCHMARK_BASELINES_PATH
+            or Path(__file__).parent / "benchmarks" / "baselines.json"
+        ),
+        threshold=settings.BENCHMARK_REGRESSION_THRESHOLD,
+        update_baselines=settings.BENCHMARK_UPDATE_BASELINES,
+    )
 
-            docker_connection_string: str = azurite_connection_string_for_containers(
-                settings.AZURITE_ACCOUNT,
-                settings.AZURITE_KEY,
-                azurite_container_alias,
-                port=10000,
-            )
-            host_connection_string: str = azurite_connection_string_for_containers(
-                settings.AZURITE_ACCOUNT,
-                settings.AZURITE_KEY,
-                "localhost",
-                port=container.get_exposed_port(10000),
-            )
-            azurite_containers[azurite_container_alias] = AzuriteStorageContainer(
-                alias=azurite_container_alias,
-                container=container,
-                docker_connection_string=docker_connection_string,
-                host_connection_string=host_connection_string,
-            )
-            if azurite_container_alias == settings.SARA_RAW_STORAGE_CONTAINER:
-                keyvault.set_secret(
-                    secret_name="AZURE-STORAGE-CONNECTION-STRING-DATA",
-                    secret_value=docker_connection_string,
-                )
-            elif azurite_container_alias == settings.SARA_ANON_STORAGE_CONTAINER:
-                keyvault.set_secret(
-                    secret_name="AZURE-STORAGE-CONNECTION-STRING-METADATA",
-                    secret_value=docker_connection_string,
-                )
+    yield suite
 
-            ensure_blob_containers(host_connection_string, "hua", "kaa", "nls", "test")
+    suite.write_results(Path(settings.BENCHMARK_RESULTS_PATH))
 
-        yield FlotillaStorage(azurite_containers=azurite_containers)
 
+@pytest.fixture(scope=_armada_scope)
+def keyvault():
+    keyvault: Keyvault = create_keyvault()
 
-@pytest.fixture
-def flotilla_broker(network: Network):
-    with create_flotilla_broker_container(
-        network=network,
-        image=settings.FLOTILLA_BROKER_IMAGE,
-        name=settings.FLOTILLA_BROKER_NAME,
-        port=settings.FLOTILLA_BROKER_PORT,
-        alias=settings.FLOTILLA_BROKER_ALIAS,
-    ) as broker:
-        wait_for_port_mapping_to_be_available(
-            container=broker, port=settings.FLOTILLA_BROKER_PORT
-        )
+    yield keyvault
 
-        yield FlotillaBroker(
-            broker=broker,
-            name=settings.FLOTILLA_BROKER_NAME,
-            port=settings.FLOTILLA_BROKER_PORT,
-            alias=settings.FLOTILLA_BROKER_ALIAS,
-        )
 
+@pytest.fixture(scope=_armada_scope)
+def network():
+    with Network() as network:
+        yield network
 
-@pytest.fixture
-def flotilla_backend(network: Network, flotilla_database: FlotillaDatabase):
-    with create_flotilla_backend_container(
-        network=network,
-        database_connection_string=flotilla_database.connection_string,
-        image=settings.FLOTILLA_BACKEND_IMAGE,
-        name=settings.FLOTILLA_BACKEND_NAME,
-        port=settings.FLOTILLA_BACKEND_PORT,
-        alias=settings.FLOTILLA_BACKEND_ALIAS,
-    ) as flotilla_backend:
-        wait_for_port_mapping_to_be_available(
-            container=flotilla_backend, port=settings.FLOTILLA_BACKEND_PORT
-        )
 
-        backend_url: str = f"http://localhost:{flotilla_backend.get_exposed_port(8000)}"
-        wait_for_backend_to_be_responsive(backend_url=backend_url)
-        populate_database_with_minimum_models(backend_url=backend_url)
-        wait_for_database_to_be_populated(backend_url=backend_url)
-
-        yield FlotillaBackend(
-            flotilla_backend=flotilla_backend,
-            backend_url=backend_url,
-            name=settings.FLOTILLA_BACKEND_NAME,
-            port=settings.FLOTILLA_BACKEND_PORT,
-            alias=settings.FLOTILLA_BACKEND_ALIAS,
-        )
+@pytest.fixture(scope=_armada_scope)
+def armada_without_robots(keyvault: Keyvault, network: Network):
+    with deploy_armada_without_robots(network=network, keyvault=keyvault) as armada:
+        yield armada
 
 
 @pytest.fixture
-def sara(network: Network, sara_database: SaraDatabase):
-    with create_sara_container(
-        network=network,
-        database_connection_string=sara_database.connection_string,
-        image=settings.SARA_IMAGE,
-        name=settings.SARA_NAME,
-        port=settings.SARA_PORT,
-        alias=settings.SARA_ALIAS,
-    ) as sara_container:
-        wait_for_port_mapping_to_be_available(
-            container=sara_container, port=settings.SARA_PORT
-        )
-
-        sara_url: str = f"http://localhost:{sara_container.get_exposed_port(8100)}"
-        wait_for_sara_to_be_responsive(sara_url=sara_url)
-
-        yield Sara(
-            sara=sara_container,
-            backend_url=sara_url,
-            name=settings.SARA_NAME,
-            port=settings.SARA_PORT,
-            alias=settings.SARA_ALIAS,
-        )
-
+def clean_armada(armada_without_robots: Armada, request: pytest.FixtureRequest):
+    armada: Armada = armada_without_robots
+    if settings.ARMADA_SCOPE == "session":
+        armada.reset_state()
+
+    sampler: ResourceSampler | None = None
+    if settings.RESOURCE_TELEMETRY_ENABLED:
+        sampler = ResourceSampler(
+            get_containers=armada.containers,
+            interval=settings.RESOURCE_TELEMETRY_INTERVAL,
+        ).start()
+    try:
+        yield armada
+    finally:
+        if sampler is not None:
+            sampler.stop()
+            sampler.log_summary()
+            sampler.write(
+                Path(settings.RESOURCE_TELEMETRY_DIRECTORY)
+                / f"{_artifact_name(request)}.json.gz"
+            )
 
-@pytest.fixture
-def armada_without_robots(
-    keyvault: Keyvault,
-    network: Network,
-    flotilla_broker: FlotillaBroker,
-    sara_database: SaraDatabase,
-    sara: Sara,
-    flotilla_database: FlotillaDatabase,
-    flotilla_backend: FlotillaBackend,
-    flotilla_storage: FlotillaStorage,
-):
-    armada: Armada = Armada()
-
-    armada.keyvault = keyvault
-    armada.network = network
-    armada.sara_database = sara_database
-    armada.sara = sara
-    armada.flotilla_database = flotilla_database
-    armada.flotilla_storage = flotilla_storage
-    armada.flotilla_broker = flotilla_broker
-    armada.flotilla_backend = flotilla_backend
-
-    yield armada
+    armada.robots.clear()
 
 
 @pytest.fixture
-def armada_with_single_successful_robot(armada_without_robots: Armada):
-    armada: Armada = armada_without_robots
-    with create_isar_robot_container(
-        network=armada.network,
-        image=settings.ISAR_ROBOT_IMAGE,
+def armada_with_single_successful_robot(clean_armada: Armada):
+    armada: Armada = clean_armada
+    with deploy_isar_robot(
+        armada=armada,
         name=settings.ISAR_ROBOT_NAME,
-        port=settings.ISAR_ROBOT_PORT,
         alias=settings.ISAR_ROBOT_ALIAS,
-        blob_storage_connection_string_data=armada.keyvault.get_secret(
-            "AZURE-STORAGE-CONNECTION-STRING-DATA"
-        ).value,
-        blob_storage_connection_string_metadata=armada.keyvault.get_secret(
-            "AZURE-STORAGE-CONNECTION-STRING-METADATA"
-        ).value,
     ) as isar_robot:
-
-        robot_id, installation_code_for_robot = setup_robot_in_flotilla(
-            backend_url=armada.flotilla_backend.backend_url,
-            robot_name=settings.ISAR_ROBOT_NAME,
-        )
-
-        armada.robots[settings.ISAR_ROBOT_NAME] = IsarRobot(
-            container=isar_robot,
-            name=settings.ISAR_ROBOT_NAME,
-            robot_id=robot_id,
-            port=settings.ISAR_ROBOT_PORT,
-            alias=settings.ISAR_ROBOT_ALIAS,
-            installation_code=installation_code_for_robot,
-        )
+        armada.robots[isar_robot.name] = isar_robot
         armada.log_startup_info()
         yield armada
 
 
 @pytest.fixture
-def armada_with_single_failing_robot(armada_without_robots: Armada):
-    armada: Armada = armada_without_robots
-
-    with create_isar_robot_container(
-        network=armada.network,
-        image=settings.ISAR_ROBOT_IMAGE,
+def armada_with_single_failing_robot(clean_armada: Armada):
+    armada: Armada = clean_armada
+    with deploy_isar_robot(
+        armada=armada,
         name=settings.ISAR_ROBOT_NAME,
-        port=settings.ISAR_ROBOT_PORT,
         alias=settings.ISAR_ROBOT_ALIAS,
-        blob_storage_connection_string_data=armada.keyvault.get_secret(
-            "AZURE-STORAGE-CONNECTION-STRING-DATA"
-        ).value,
-        blob_storage_connection_string_metadata=armada.keyvault.get_secret(
-            "AZURE-STORAGE-CONNECTION-STRING-METADATA"
-        ).value,
         should_fail_normal_task=True,
     ) as isar_robot:
+        armada.robots[isar_robot.name] = isar_robot
+        armada.log_startup_info()
+        yield armada
 
-        robot_id, installation_code_for_robot = setup_robot_in_flotilla(
-            backend_url=armada.flotilla_backend.backend_url,
-            robot_name=settings.ISAR_ROBOT_NAME,
-        )
 
-        armada.robots[settings.ISAR_ROBOT_NAME] = IsarRobot(
-            container=isar_robot,
-            name=settings.ISAR_ROBOT_NAME,
-            robot_id=robot_id,
-            port=settings.ISAR_ROBOT_PORT,
-            alias=settings.ISAR_ROBOT_ALIAS,
-            installation_code=installation_code_for_robot,
-        )
+@pytest.fixture
+def armada_with_fleet(clean_armada: Armada, request: pytest.FixtureRequest):
+    """Armada with a fleet of successful robots spread over the installations.
+
+    The fleet size defaults to ISAR_FLEET_SIZE, parametrize the fixture indirectly to
+    pick another size, e.g. @pytest.mark.parametrize("armada_with_fleet", [10],
+    indirect=True).
+    """
+    armada: Armada = clean_armada
+    fleet_size: int = getattr(request, "param", settings.ISAR_FLEET_SIZE)
+    with deploy_isar_fleet(armada=armada, fleet_size=fleet_size):
         armada.log_startup_info()
         yield armada
 
 
-def wait_for_port_mapping_to_be_available(
-    container: DockerContainer, port: int, timeout: int = 60, delay: int = 2
-) -> None:
-    now: datetime = datetime.now()
-    while (datetime.now() - now).seconds < timeout:
-        try:
-            container.get_exposed_port(port)
-            return
-        except ConnectionError:
-            logger.warning(
-                f"Port {port} not yet available, waiting for {delay} seconds..."
-            )
-            time.sleep(delay)
-            continue
-
-    raise ConnectionError(
-        f"Port mapping for container {container.image} on port {port} not available within timeout"
-    )
+@pytest.fixture
+def armada_with_simulated_fleet(clean_armada: Armada, request: pytest.FixtureRequest):
+    """Armada with a fleet of simulated robots spread over the installations.
+
+    The robots run on the in-process ISAR simulator instead of in containers. The fleet
+    size defaults to ISAR_SIMULATOR_FLEET_SIZE and is parametrized like
+    armada_with_fleet.
+    """
+    armada: Armada = clean_armada
+    fleet_size: int = getattr(request, "param", settings.ISAR_SIMULATOR_FLEET_SIZE)
+    with deploy_simulated_isar_fleet(armada=armada, fleet_size=fleet_size):
+        armada.log_startup_info()
+        yield armada
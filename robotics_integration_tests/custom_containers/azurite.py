@@ -1,13 +1,17 @@
-from typing import Dict
+from typing import Dict, List
 
-from azure.core.exceptions import ResourceExistsError
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
 from azure.storage.blob import BlobServiceClient
 from docker.models.networks import Network
 
 from robotics_integration_tests.custom_containers.stream_logging_docker_container import (
     StreamLoggingDockerContainer,
 )
+from robotics_integration_tests.custom_containers.naming import (
+    namespaced_container_name,
+)
 from robotics_integration_tests.settings.settings import settings
+from robotics_integration_tests.utilities.blob_storage import get_blob_service_client
 
 
 class AzuriteStorageContainer:
@@ -39,7 +43,7 @@ def create_azurite_container(
 
     container: StreamLoggingDockerContainer = (
         StreamLoggingDockerContainer(image=settings.AZURITE_IMAGE, command=cmd)
-        .with_name(name)
+        .with_name(namespaced_container_name(name))
         .with_network(network)
         .with_network_aliases(name)
         .with_exposed_ports(10000)
@@ -59,9 +63,26 @@ def azurite_connection_string_for_containers(
 
 
 def ensure_blob_containers(connection_string: str, *names: str) -> None:
-    svc: BlobServiceClient = BlobServiceClient.from_connection_string(connection_string)
+    svc: BlobServiceClient = get_blob_service_client(connection_string)
     for name in names:
         try:
             svc.create_container(name)
         except ResourceExistsError:
             pass
+
+
+def list_blob_containers(connection_string: str) -> List[str]:
+    svc: BlobServiceClient = get_blob_service_client(connection_string)
+    return [container.name for container in svc.list_containers()]
+
+
+def clear_blob_containers(connection_string: str, *names: str) -> None:
+    svc: BlobServiceClient = get_blob_service_client(connection_string)
+    for name in names:
+        container_client = svc.get_container_client(name)
+        try:
+            blob_names: List[str] = list(container_client.list_blob_names())
+        except ResourceNotFoundError:
+            continue
+        for blob_name in blob_names:
+            container_client.delete_blob(blob_name)
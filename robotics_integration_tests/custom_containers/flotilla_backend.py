@@ -3,7 +3,13 @@ from docker.models.networks import Network
 from robotics_integration_tests.custom_containers.stream_logging_docker_container import (
     StreamLoggingDockerContainer,
 )
+from robotics_integration_tests.custom_containers.naming import (
+    namespaced_container_name,
+)
 from robotics_integration_tests.settings.settings import settings
+from robotics_integration_tests.utilities.flotilla_backend_api import (
+    FlotillaBackendClient,
+)
 
 
 class FlotillaBackend:
@@ -20,6 +26,7 @@ class FlotillaBackend:
         self.name: str = name
         self.port: int = port
         self.alias: str = alias
+        self.client: FlotillaBackendClient = FlotillaBackendClient.for_url(backend_url)
 
 
 def create_flotilla_backend_container(
@@ -32,7 +39,7 @@ def create_flotilla_backend_container(
 ) -> StreamLoggingDockerContainer:
     container: StreamLoggingDockerContainer = (
         StreamLoggingDockerContainer(image=image)
-        .with_name(name)
+        .with_name(namespaced_container_name(name))
         .with_exposed_ports(port)
         .with_network(network)
         .with_network_aliases(alias)
@@ -47,6 +54,8 @@ def create_flotilla_backend_container(
         .with_env("Database__PostgreSqlConnectionString", database_connection_string)
         .with_env("AzureAd__ClientSecret", settings.FLOTILLA_AZURE_CLIENT_SECRET)
         .with_env("AzureAd__Audience", f"api://{settings.SARA_AZURE_CLIENT_ID}")
+        # Simulated ISAR robots serve their APIs on the Docker host
+        .with_kwargs(extra_hosts={"host.docker.internal": "host-gateway"})
     )
 
     return container
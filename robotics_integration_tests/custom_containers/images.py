@@ -0,0 +1,228 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+from types import TracebackType
+from typing import Dict, List, Optional, Tuple, Type
+
+from docker import DockerClient as DockerSDKClient
+from docker.auth import resolve_repository_name
+from docker.errors import ImageNotFound
+from docker.utils import parse_repository_tag
+from loguru import logger
+from testcontainers.core.container import DockerContainer
+from testcontainers.core.docker_client import DockerClient
+
+from robotics_integration_tests.settings.settings import settings
+from robotics_integration_tests.utilities.polling import poll_until
+from robotics_integration_tests.utilities.profiling import profile_phase
+
+# Settings holding the images of the armada, they are pinned to the pulled image ids
+_image_settings: Tuple[str, ...] = (
+    "FLOTILLA_BACKEND_IMAGE",
+    "FLOTILLA_BROKER_IMAGE",
+    "ISAR_ROBOT_IMAGE",
+    "SARA_IMAGE",
+    "AZURITE_IMAGE",
+    "POSTGRESQL_IMAGE",
+)
+
+_registry_urls: Dict[str, str] = {"docker.io": "https://registry-1.docker.io"}
+
+
+def image_exists(image: str) -> bool:
+    try:
+        DockerClient().client.images.get(image)
+    except ImageNotFound:
+        return False
+    return True
+
+
+class PulledImage:
+    def __init__(self, reference: str, image_id: str, repo_digest: str) -> None:
+        self.reference: str = reference
+        self.image_id: str = image_id
+        self.repo_digest: str = repo_digest
+
+
+def _split_reference(reference: str) -> Tuple[str, str, str]:
+    """Split an image reference into registry, repository in the registry and tag."""
+    repository, tag = parse_repository_tag(reference)
+    registry, remote_name = resolve_repository_name(repository)
+    if registry == "docker.io" and "/" not in remote_name:
+        remote_name = f"library/{remote_name}"
+    return registry, remote_name, tag or "latest"
+
+
+class RegistryCache:
+    """Pull-through caches for the registries of the armada images.
+
+    A registry:2 proxy only mirrors a single upstream, so one cache container is
+    started per registry. The cached blobs are kept in IMAGE_PULL_CACHE_DIRECTORY,
+    so later runs, also after the Docker image store has been pruned, only fetch
+    manifests from the upstream registries. Docker allows plain HTTP to registries on
+    localhost, which is where the caches are published on the Docker host.
+    """
+
+    def __init__(self, registries: List[str]) -> None:
+        self.registries: List[str] = registries
+        self.ports: Dict[str, str] = {}
+        self._stack: ExitStack = ExitStack()
+
+    def __enter__(self) -> "RegistryCache":
+        try:
+            for registry in self.registries:
+                self.ports[registry] = self._start_cache(registry)
+        except BaseException:
+            self._stack.close()
+            raise
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self._stack.close()
+
+    def _start_cache(self, registry: str) -> str:
+        storage: Path = Path(settings.IMAGE_PULL_CACHE_DIRECTORY).resolve() / registry
+        storage.mkdir(parents=True, exist_ok=True)
+        container: DockerContainer = self._stack.enter_context(
+            DockerContainer(image=settings.IMAGE_PULL_CACHE_IMAGE)
+            .with_exposed_ports(5000)
+            .with_env(
+                "REGISTRY_PROXY_REMOTEURL",
+                _registry_urls.get(registry, f"https://{registry}"),
+            )
+            .with_volume_mapping(str(storage), "/var/lib/registry", "rw")
+        )
+        port: str = poll_until(
+            condition=lambda: container.get_exposed_port(5000),
+            description=f"Waiting for the pull-through cache of {registry}",
+            timeout=30,
+            retry_exceptions=(ConnectionError,),
+        ).value
+        logger.info(f"Pull-through cache of {registry} listens on port {port}")
+        return port
+
+    def mirror(self, registry: str, remote_name: str) -> Optional[str]:
+        port: Optional[str] = self.ports.get(registry)
+        return f"localhost:{port}/{remote_name}" if port else None
+
+
+def pull_image(
+    client: DockerSDKClient, reference: str, cache: Optional[RegistryCache] = None
+) -> PulledImage:
+    registry, remote_name, tag = _split_reference(reference)
+    repository, _ = parse_repository_tag(reference)
+    mirror: Optional[str] = cache.mirror(registry, remote_name) if cache else None
+
+    with profile_phase("images", f"pull {reference}"):
+        if mirror is None:
+            image = client.images.pull(repository, tag=tag)
+        else:
+            image = client.images.pull(mirror, tag=tag)
+            # Tag the cached image with the original reference so that it is also
+            # found under that name
+            if not tag.startswith("sha256:"):
+                image.tag(repository, tag=tag)
+
+    repo_digests: List[str] = image.attrs.get("RepoDigests") or []
+    logger.info(f"Pulled {reference} as {image.id}")
+    return PulledImage(
+        reference=reference,
+        image_id=image.id,
+        repo_digest=repo_digests[0] if repo_digests else "",
+    )
+
+
+def prepull_images() -> Dict[str, PulledImage]:
+    """Pull the images of the armada concurrently, through the pull-through caches
+    when IMAGE_PULL_CACHE_ENABLED is set."""
+    references: List[str] = sorted(
+        {getattr(settings, setting) for setting in _image_settings}
+    )
+    client: DockerSDKClient = DockerClient().client
+
+    with ExitStack() as stack:
+        cache: Optional[RegistryCache] = None
+        if settings.IMAGE_PULL_CACHE_ENABLED:
+            cache = stack.enter_context(
+                RegistryCache(
+                    sorted({_split_reference(reference)[0] for reference in references})
+                )
+            )
+        with ThreadPoolExecutor(
+            max_workers=settings.IMAGE_PULL_MAX_WORKERS, thread_name_prefix="image-pull"
+        ) as executor:
+            pulled: List[PulledImage] = list(
+                executor.map(
+                    lambda reference: pull_image(client, reference, cache), references
+                )
+            )
+    return {image.reference: image for image in pulled}
+
+
+def write_image_digests(
+    pulled: Dict[str, PulledImage], path: Path, session_id: str
+) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path: Path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    temporary_path.write_text(
+        json.dumps(
+            {
+                "session_id": session_id,
+                "images": {
+                    reference: vars(image) for reference, image in pulled.items()
+                },
+            },
+            indent=2,
+        )
+    )
+    os.replace(temporary_path, path)
+
+
+def read_image_digests(path: Path, session_id: str) -> Dict[str, PulledImage]:
+    """Images pulled by the session session_id, a file left by another session, e.g.
+    when the pull of this session failed, is ignored."""
+    if not path.exists():
+        return {}
+    digests: Dict = json.loads(path.read_text())
+    if digests.get("session_id") != session_id:
+        logger.warning(
+            f"Ignoring image digests in {path}, they were not pulled by this session"
+        )
+        return {}
+    return {
+        reference: PulledImage(**image)
+        for reference, image in digests["images"].items()
+    }
+
+
+def pin_images(pulled: Dict[str, PulledImage]) -> None:
+    """Point the image settings at the pulled image ids, so that every container of the
+    session runs exactly the pulled image even if a tag moves during the session."""
+    for setting in _image_settings:
+        image: Optional[PulledImage] = pulled.get(getattr(settings, setting))
+        if image is not None:
+            setattr(settings, setting, image.image_id)
+
+
+def prepare_images(session_id: str, is_xdist_worker: bool) -> None:
+    """Pull and pin the armada images once per session.
+
+    Under pytest-xdist only the controller pulls, before the workers are started,
+    and the workers pin the images it recorded in IMAGE_DIGESTS_PATH under the same
+    session_id.
+    """
+    path: Path = Path(settings.IMAGE_DIGESTS_PATH)
+    if is_xdist_worker:
+        pin_images(read_image_digests(path, session_id))
+        return
+
+    pulled: Dict[str, PulledImage] = prepull_images()
+    write_image_digests(pulled, path, session_id)
+    pin_images(pulled)
@@ -3,6 +3,9 @@ from docker.models.networks import Network
 from robotics_integration_tests.custom_containers.stream_logging_docker_container import (
     StreamLoggingDockerContainer,
 )
+from robotics_integration_tests.custom_containers.naming import (
+    namespaced_container_name,
+)
 from robotics_integration_tests.settings.settings import settings
 
 
@@ -33,7 +36,12 @@ def create_isar_robot_container(
     blob_storage_connection_string_data: str = "",
     blob_storage_connection_string_metadata: str = "",
     should_fail_normal_task: bool = False,
+    installation_code: str = "HUA",
+    plant_name: str = "Huldra",
+    isar_id: str = "",
 ) -> StreamLoggingDockerContainer:
+    """Create an ISAR robot container, the robot registers itself in Flotilla with
+    name as its name and installation_code as its current installation."""
 
     failure_prob = 0.0
     if should_fail_normal_task:
@@ -41,7 +49,7 @@ def create_isar_robot_container(
 
     container: StreamLoggingDockerContainer = (
         StreamLoggingDockerContainer(image=image)
-        .with_name(name)
+        .with_name(namespaced_container_name(name))
         .with_exposed_ports(port)
         .with_network(network)
         .with_network_aliases(alias)
@@ -61,12 +69,15 @@ def create_isar_robot_container(
             "ISAR_BLOB_STORAGE_CONNECTION_STRING_METADATA",
             blob_storage_connection_string_metadata,
         )
-        .with_env("ISAR_BLOB_CONTAINER", "hua")
-        .with_env("ISAR_PLANT_CODE", "Huldra")
-        .with_env("ISAR_PLANT_SHORT_NAME", "HUA")
-        .with_env("ISAR_API_HOST_VIEWED_EXTERNALLY", "isar_robot")
+        .with_env("ISAR_ROBOT_NAME", name)
+        .with_env("ISAR_BLOB_CONTAINER", installation_code.lower())
+        .with_env("ISAR_PLANT_CODE", plant_name)
+        .with_env("ISAR_PLANT_SHORT_NAME", installation_code)
+        .with_env("ISAR_API_HOST_VIEWED_EXTERNALLY", alias)
         .with_env("MISSION_SIMULATION_TIME_TO_START", 2)
         .with_env("ROBOT_MISSION_SIMULATION_TASK_FAILURE_PROBABILITY", failure_prob)
         .with_env("ROBOT_MISSION_SIMULATION_MISSION_COMPLETION_DELAY", 5)
     )
+    if isar_id:
+        container.with_env("ISAR_ISAR_ID", isar_id)
     return container
@@ -0,0 +1,274 @@
+import re
+import selectors
+import socket
+import ssl
+import time
+from queue import Empty, SimpleQueue
+from threading import Lock, Thread
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
+
+from docker.errors import APIError
+from loguru import logger
+
+from robotics_integration_tests.settings.settings import settings
+
+if TYPE_CHECKING:
+    from robotics_integration_tests.custom_containers.stream_logging_docker_container import (
+        StreamLoggingDockerContainer,
+    )
+
+# Docker prefixes every frame of a non-TTY attach stream with the stream type and size
+_frame_header_size: int = 8
+
+_log_levels: Dict[str, int] = {
+    "TRACE": 5,
+    "DEBUG": 10,
+    "INFO": 20,
+    "SUCCESS": 25,
+    "WARNING": 30,
+    "ERROR": 40,
+    "CRITICAL": 50,
+}
+
+# Level markers of Python, .NET ("fail:", "warn:", "info:", "dbug:") and Go loggers
+_level_pattern: re.Pattern = re.compile(
+    r"\b(CRITICAL|FATAL|crit|ERROR|fail|WARNING|WARN|warn|INFO|info|DEBUG|dbug|TRACE|trce)\b"
+)
+_level_aliases: Dict[str, str] = {
+    "FATAL": "CRITICAL",
+    "crit": "CRITICAL",
+    "fail": "ERROR",
+    "WARN": "WARNING",
+    "warn": "WARNING",
+    "info": "INFO",
+    "dbug": "DEBUG",
+    "trce": "TRACE",
+}
+
+
+def detect_log_level(line: str) -> str:
+    """Best effort level of a log line, lines without a level marker count as INFO."""
+    match: Optional[re.Match] = _level_pattern.search(line)
+    if match is None:
+        return "INFO"
+    return _level_aliases.get(match.group(1), match.group(1))
+
+
+class _RateLimiter:
+    """Token bucket allowing rate lines per second with bursts of up to rate lines."""
+
+    def __init__(self, rate: float) -> None:
+        self.rate: float = rate
+        self.tokens: float = rate
+        self.updated_at: float = time.monotonic()
+        self.suppressed: int = 0
+
+    def allow(self) -> bool:
+        now: float = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens < 1:
+            self.suppressed += 1
+            return False
+        self.tokens -= 1
+        return True
+
+
+class _LogSource:
+    def __init__(
+        self,
+        container: "StreamLoggingDockerContainer",
+        sock: Optional[socket.socket],
+        multiplexed: bool,
+    ) -> None:
+        self.container: "StreamLoggingDockerContainer" = container
+        self.sock: Optional[socket.socket] = sock
+        self.multiplexed: bool = multiplexed
+        self.frames: bytearray = bytearray()
+        self.partial_line: bytearray = bytearray()
+        self.rate_limiter: _RateLimiter = _RateLimiter(
+            settings.CONTAINER_LOG_RATE_LIMIT
+        )
+
+    def feed(self, data: bytes) -> None:
+        if not self.multiplexed:
+            self._feed_payload(data)
+            return
+
+        self.frames += data
+        while len(self.frames) >= _frame_header_size:
+            size: int = int.from_bytes(self.frames[4:_frame_header_size], "big")
+            if len(self.frames) < _frame_header_size + size:
+                break
+            self._feed_payload(
+                bytes(self.frames[_frame_header_size : _frame_header_size + size])
+            )
+            del self.frames[: _frame_header_size + size]
+
+    def flush(self) -> None:
+        if self.partial_line:
+            self._emit(bytes(self.partial_line))
+            self.partial_line.clear()
+
+    def _feed_payload(self, payload: bytes) -> None:
+        self.partial_line += payload
+        *lines, rest = self.partial_line.split(b"\n")
+        for line in lines:
+            self._emit(line)
+        self.partial_line = bytearray(rest)
+        # Bound the buffer for output without newlines, emit it as a truncated line
+        if len(self.partial_line) > settings.CONTAINER_LOG_MAX_LINE_BYTES:
+            self._emit(bytes(self.partial_line))
+            self.partial_line.clear()
+
+    def _emit(self, raw_line: bytes) -> None:
+        line: str = raw_line.decode(errors="replace").rstrip()
+        self.container.append_log_line(line)
+
+        level: str = detect_log_level(line)
+        if _log_levels[level] < _log_levels[self.container.log_level]:
+            return
+        if not self.rate_limiter.allow():
+            return
+        if self.rate_limiter.suppressed:
+            logger.warning(
+                f"{self.container._name}: {self.rate_limiter.suppressed} log lines suppressed by the rate limit"
+            )
+            self.rate_limiter.suppressed = 0
+        logger.log(level, f"{self.container._name}: {line}")
+
+
+class LogCollector:
+    """Multiplexes the log streams of all containers on a single selector thread.
+
+    A container is attached right after it has started, the attach stream replays the
+    logs from the start of the container and then follows them. Lines are stored on
+    the container for readiness checks and forwarded to loguru when they are at or
+    above the level of the container, subject to a per container rate limit. A stream
+    is closed when the container stops or is detached.
+    """
+
+    def __init__(self) -> None:
+        self.selector: selectors.BaseSelector = selectors.DefaultSelector()
+        self.sources: Dict[int, _LogSource] = {}
+        self._commands: SimpleQueue[Tuple[Callable, tuple]] = SimpleQueue()
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._wake_reader.setblocking(False)
+        self.selector.register(self._wake_reader, selectors.EVENT_READ)
+        self._thread: Optional[Thread] = None
+        self._thread_lock: Lock = Lock()
+
+    def attach(self, container: "StreamLoggingDockerContainer") -> None:
+        wrapped_container = container.get_wrapped_container()
+        docker_api = container.get_docker_client().client.api
+        try:
+            response_socket = docker_api.attach_socket(
+                wrapped_container.id,
+                params={"stdout": 1, "stderr": 1, "stream": 1, "logs": 1},
+            )
+        except APIError:
+            # The container has already exited, its logs are complete
+            self._read_logs_in_thread(container)
+            return
+
+        sock = getattr(response_socket, "_sock", response_socket)
+        if not isinstance(sock, socket.socket):
+            # Named pipes and SSH channels can not be selected on
+            self._read_logs_in_thread(container, follow=True)
+            return
+
+        sock.setblocking(False)
+        multiplexed: bool = not wrapped_container.attrs["Config"]["Tty"]
+        self._submit(self._register, _LogSource(container, sock, multiplexed))
+
+    def detach(self, container: "StreamLoggingDockerContainer") -> None:
+        self._submit(self._unregister_container, container)
+
+    def _submit(self, command: Callable, *args) -> None:
+        self._ensure_started()
+        self._commands.put((command, args))
+        self._wake_writer.send(b"\0")
+
+    def _ensure_started(self) -> None:
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = Thread(
+                    target=self._run, name="log-collector", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            for key, _ in self.selector.select():
+                try:
+                    if key.fileobj is self._wake_reader:
+                        self._run_commands()
+                    else:
+                        self._read(key.data)
+                except Exception:
+                    # One misbehaving stream must not stop the collection of the others
+                    logger.exception("Log collector failed to process a log stream")
+
+    def _run_commands(self) -> None:
+        try:
+            while self._wake_reader.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+        while True:
+            try:
+                command, args = self._commands.get_nowait()
+            except Empty:
+                return
+            command(*args)
+
+    def _register(self, source: _LogSource) -> None:
+        self.sources[source.sock.fileno()] = source
+        self.selector.register(source.sock, selectors.EVENT_READ, data=source)
+
+    def _read(self, source: _LogSource) -> None:
+        while True:
+            try:
+                data: bytes = source.sock.recv(settings.CONTAINER_LOG_READ_BYTES)
+            except (BlockingIOError, ssl.SSLWantReadError):
+                return
+            except OSError:
+                data = b""
+            if not data:
+                self._unregister(source)
+                return
+            source.feed(data)
+            # TLS sockets may hold decrypted data that the selector does not report
+            if not isinstance(source.sock, ssl.SSLSocket) or not source.sock.pending():
+                return
+
+    def _unregister_container(self, container: "StreamLoggingDockerContainer") -> None:
+        for source in list(self.sources.values()):
+            if source.container is container:
+                self._unregister(source)
+
+    def _unregister(self, source: _LogSource) -> None:
+        self.sources.pop(source.sock.fileno(), None)
+        self.selector.unregister(source.sock)
+        source.sock.close()
+        source.flush()
+        source.container.close_log_stream()
+
+    def _read_logs_in_thread(
+        self, container: "StreamLoggingDockerContainer", follow: bool = False
+    ) -> None:
+        def read_logs() -> None:
+            source: _LogSource = _LogSource(container, None, multiplexed=False)
+            try:
+                for chunk in container.get_wrapped_container().logs(
+                    stream=True, follow=follow
+                ):
+                    source.feed(chunk)
+            finally:
+                source.flush()
+                container.close_log_stream()
+
+        Thread(target=read_logs, daemon=True).start()
+
+
+log_collector: LogCollector = LogCollector()
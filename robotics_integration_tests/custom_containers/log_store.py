@@ -0,0 +1,204 @@
+import mmap
+import re
+import shutil
+import struct
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from threading import Condition
+from typing import BinaryIO, List, Optional, Tuple
+
+# Every index record holds the byte offset of a line in the log file and its time
+_index_record: struct.Struct = struct.Struct("<Qd")
+
+# Map of the log file, line count and size in bytes covered by the map
+_Snapshot = Tuple[Optional[mmap.mmap], int, int]
+
+
+class LogMatch:
+    def __init__(self, line_number: int, timestamp: float, text: str) -> None:
+        self.line_number: int = line_number
+        self.timestamp: float = timestamp
+        self.text: str = text
+
+
+class ContainerLogStore:
+    """Append-only log file of one container with a line and time index.
+
+    Lines are appended to <name>.log, and the offset and arrival time of every line to
+    <name>.idx. The index is also kept in memory, so a query finds its first line by
+    bisecting on time and then runs the regular expression over the memory-mapped file
+    from there, instead of iterating over lines in Python. The search runs outside the
+    lock on a snapshot of the lines appended so far, so it does not block append.
+    Waiters remember how far they have scanned and only search lines appended since.
+    """
+
+    def __init__(self, directory: Path, name: str) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        self.log_path: Path = directory / f"{name}.log"
+        self.index_path: Path = directory / f"{name}.idx"
+        self._log_file: BinaryIO = open(self.log_path, "wb")
+        self._index_file: BinaryIO = open(self.index_path, "wb")
+        self._size: int = 0
+        self._flushed_size: int = 0
+        self._offsets: array = array("Q")
+        self._timestamps: array = array("d")
+        self._map: Optional[mmap.mmap] = None
+        self._closed: bool = False
+        self._condition: Condition = Condition()
+
+    @property
+    def line_count(self) -> int:
+        return len(self._offsets)
+
+    def append(self, line: str, timestamp: Optional[float] = None) -> None:
+        data: bytes = line.replace("\n", " ").encode() + b"\n"
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._condition:
+            if self._closed:
+                return
+            # Keep the index sorted by time even if the clock steps back
+            if self._timestamps and timestamp < self._timestamps[-1]:
+                timestamp = self._timestamps[-1]
+            self._log_file.write(data)
+            self._index_file.write(_index_record.pack(self._size, timestamp))
+            self._offsets.append(self._size)
+            self._timestamps.append(timestamp)
+            self._size += len(data)
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """Mark the stream as complete, waiters that have not matched yet fail."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._log_file.close()
+            self._index_file.close()
+            self._condition.notify_all()
+
+    def line(self, line_number: int) -> str:
+        with self._condition:
+            return self._line(line_number)
+
+    def lines(self, start: int = 0, end: Optional[int] = None) -> List[str]:
+        with self._condition:
+            end = self.line_count if end is None else min(end, self.line_count)
+            return [self._line(line_number) for line_number in range(start, end)]
+
+    def first_match(
+        self, pattern: str, after: Optional[float] = None, start_line: int = 0
+    ) -> Optional[LogMatch]:
+        """Return the first line matching the regular expression.
+
+        Only lines logged at or after the time after, and from start_line on, are
+        searched.
+        """
+        with self._condition:
+            if after is not None:
+                start_line = max(start_line, bisect_left(self._timestamps, after))
+            snapshot: _Snapshot = self._snapshot()
+        return self._search(
+            re.compile(pattern.encode(), re.MULTILINE), start_line, snapshot
+        )
+
+    def wait_for_log(
+        self, pattern: str, timeout: float = 60, after: Optional[float] = None
+    ) -> LogMatch:
+        """Block until a line matching the regular expression is logged.
+
+        Lines logged before the call match as well, unless after is given. Raises
+        RuntimeError if the stream closes and TimeoutError if the timeout expires
+        without a match.
+        """
+        regex: re.Pattern = re.compile(pattern.encode(), re.MULTILINE)
+        deadline: float = time.monotonic() + timeout
+        with self._condition:
+            next_line: int = (
+                0 if after is None else bisect_left(self._timestamps, after)
+            )
+        while True:
+            with self._condition:
+                snapshot: _Snapshot = self._snapshot()
+            match: Optional[LogMatch] = self._search(regex, next_line, snapshot)
+            if match is not None:
+                return match
+            next_line = max(next_line, snapshot[1])
+
+            with self._condition:
+                if self.line_count > next_line:
+                    # Lines were appended while searching
+                    continue
+                if self._closed:
+                    raise RuntimeError(
+                        f"Log stream {self.log_path.name} closed before a line matched '{pattern}'"
+                    )
+                remaining: float = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"No line in {self.log_path.name} matched '{pattern}' within {timeout} seconds"
+                    )
+                self._condition.wait(timeout=remaining)
+
+    def _snapshot(self) -> _Snapshot:
+        """Map of the log file with the line count and size it covers, callers hold the
+        lock. Lines are only ever appended, so the snapshot stays valid after the lock
+        is released."""
+        if self._size == 0:
+            return None, 0, 0
+        return self._mapped(), self.line_count, self._size
+
+    def _search(
+        self, regex: re.Pattern, start_line: int, snapshot: _Snapshot
+    ) -> Optional[LogMatch]:
+        log_map, line_count, size = snapshot
+        if start_line >= line_count:
+            return None
+        match: Optional[re.Match] = regex.search(
+            log_map, self._offsets[start_line], size
+        )
+        if match is None:
+            return None
+        line_number: int = bisect_right(self._offsets, match.start(), 0, line_count) - 1
+        return LogMatch(
+            line_number=line_number,
+            timestamp=self._timestamps[line_number],
+            text=self._line(line_number, snapshot),
+        )
+
+    def _line(self, line_number: int, snapshot: Optional[_Snapshot] = None) -> str:
+        log_map, line_count, size = snapshot or self._snapshot()
+        start: int = self._offsets[line_number]
+        end: int = (
+            self._offsets[line_number + 1] if line_number + 1 < line_count else size
+        )
+        return log_map[start : end - 1].decode(errors="replace")
+
+    def _mapped(self) -> mmap.mmap:
+        """Map the log file, remapping it when lines have been appended since.
+
+        A replaced map is not closed, searches running outside the lock may still use
+        it, it is unmapped once the last of them drops it.
+        """
+        if self._flushed_size != self._size:
+            if not self._closed:
+                self._log_file.flush()
+                self._index_file.flush()
+            with open(self.log_path, "rb") as log_file:
+                self._map = mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._flushed_size = self._size
+        return self._map
+
+
+def prune_log_directories(directory: Path, keep: int) -> None:
+    """Remove the log directories of all but the keep most recent runs."""
+    if not directory.is_dir():
+        return
+    run_directories: List[Path] = sorted(
+        (path for path in directory.iterdir() if path.is_dir()),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    for run_directory in run_directories[keep:]:
+        shutil.rmtree(run_directory, ignore_errors=True)
@@ -1,26 +1,170 @@
+import hashlib
+from functools import lru_cache
 from pathlib import Path
-import uuid
+from typing import Dict, Optional, Tuple
 
+import requests
 from docker.models.networks import Network
+from loguru import logger
 from testcontainers.core.image import DockerImage
 
+from robotics_integration_tests.custom_containers.images import image_exists
 from robotics_integration_tests.custom_containers.stream_logging_docker_container import (
     StreamLoggingDockerContainer,
 )
+from robotics_integration_tests.custom_containers.naming import (
+    namespaced_container_name,
+)
 from robotics_integration_tests.settings.settings import settings
 
 
+@lru_cache(maxsize=None)
+def _resolve_latest_release(git_repository: str) -> Optional[str]:
+    """Return the tag of the latest release of the repository, or None if GitHub
+    cannot be reached. The request is authenticated with GITHUB_TOKEN when it is set,
+    unauthenticated requests are subject to a low rate limit."""
+    headers: Dict[str, str] = (
+        {"Authorization": f"token {settings.GITHUB_TOKEN}"}
+        if settings.GITHUB_TOKEN
+        else {}
+    )
+    try:
+        response: requests.Response = requests.get(
+            f"https://api.github.com/repos/{git_repository}/releases/latest",
+            headers=headers,
+            timeout=10,
+        )
+        response.raise_for_status()
+        return response.json()["tag_name"]
+    except (requests.RequestException, KeyError, ValueError) as e:
+        logger.warning(f"Could not resolve the latest release of {git_repository}: {e}")
+        return None
+
+
+def _migrations_runner_image(
+    dockerfile_folder: str,
+    name: str,
+    git_repository: str,
+    git_ref: str,
+    ef_project_path: str,
+) -> Tuple[Path, str, Optional[str]]:
+    """Return the Dockerfile folder, the image tag and the resolved ref, which is None
+    when "latest" cannot be resolved."""
+    path: Path = Path(dockerfile_folder).resolve(strict=True)
+
+    content_hash = hashlib.sha256()
+    for file_name in ("Dockerfile", "entrypoint.sh"):
+        content_hash.update((path / file_name).read_bytes())
+    content_hash.update(f"{git_repository}|{git_ref}|{ef_project_path}".encode())
+
+    resolved_ref: Optional[str] = git_ref
+    if git_ref == "latest":
+        resolved_ref = _resolve_latest_release(git_repository)
+        content_hash.update(f"|{resolved_ref}".encode())
+    return path, f"{name}:{content_hash.hexdigest()[:16]}", resolved_ref
+
+
+def migrations_runner_image_tag(
+    dockerfile_folder: str,
+    name: str,
+    git_repository: str,
+    git_ref: str,
+    ef_project_path: str,
+) -> Optional[str]:
+    """Tag of the migrations runner image, or None when it cannot be content-addressed
+    because "latest" cannot be resolved."""
+    _, image, resolved_ref = _migrations_runner_image(
+        dockerfile_folder=dockerfile_folder,
+        name=name,
+        git_repository=git_repository,
+        git_ref=git_ref,
+        ef_project_path=ef_project_path,
+    )
+    return image if resolved_ref is not None else None
+
+
+def build_migrations_runner_image(
+    dockerfile_folder: str,
+    name: str,
+    git_repository: str,
+    git_ref: str,
+    ef_project_path: str,
+) -> str:
+    """Build the migrations runner image with the repository prebuilt into it.
+
+    The image is tagged with a hash of the Dockerfile, the entrypoint and the git
+    inputs, so an image that already exists locally is reused without building. The
+    "latest" ref is resolved to the tag of the latest release, which is included in
+    the hash and passed as the RESOLVED_GIT_REF build argument that the image checks
+    out, so only the clone layer is rebuilt when a new release is published.
+    """
+    path, image, resolved_ref = _migrations_runner_image(
+        dockerfile_folder=dockerfile_folder,
+        name=name,
+        git_repository=git_repository,
+        git_ref=git_ref,
+        ef_project_path=ef_project_path,
+    )
+    if resolved_ref is None:
+        raise RuntimeError(
+            f"Could not resolve the latest release of {git_repository}, set "
+            f"GITHUB_TOKEN or pin the migrations ref to a tag"
+        )
+    if image_exists(image):
+        logger.info(f"Reusing cached migrations runner image {image}")
+        return image
+
+    DockerImage(
+        path=str(path),
+        tag=image,
+        buildargs={
+            "GIT_REPO": git_repository,
+            "GIT_REF": git_ref,
+            "EF_PROJECT_PATH": ef_project_path,
+            "RESOLVED_GIT_REF": resolved_ref,
+        },
+    ).build()
+    return image
+
+
+def flotilla_migrations_runner_image_tag() -> Optional[str]:
+    return migrations_runner_image_tag(**_flotilla_migrations_runner())
+
+
+def sara_migrations_runner_image_tag() -> Optional[str]:
+    return migrations_runner_image_tag(**_sara_migrations_runner())
+
+
+def _flotilla_migrations_runner() -> Dict[str, str]:
+    return {
+        "dockerfile_folder": settings.RELATIVE_PATH_TO_DOCKERFILE,
+        "name": "flotilla-migrations-runner",
+        "git_repository": settings.GIT_REPOSITORY_FOR_MIGRATIONS,
+        "git_ref": settings.GIT_REPOSITORY_FOR_MIGRATIONS_REF,
+        "ef_project_path": settings.BACKEND_PROJECT_FILE_FOLDER,
+    }
+
+
+def _sara_migrations_runner() -> Dict[str, str]:
+    return {
+        "dockerfile_folder": settings.SARA_RELATIVE_PATH_TO_DOCKERFILE,
+        "name": "sara-migrations-runner",
+        "git_repository": settings.SARA_GIT_REPOSITORY_FOR_MIGRATIONS,
+        "git_ref": settings.SARA_GIT_REPOSITORY_FOR_MIGRATIONS_REF,
+        "ef_project_path": settings.SARA_BACKEND_PROJECT_FILE_FOLDER,
+    }
+
+
 def create_migrations_runner_container(
     network: Network, postgres_connection_string: str
 ) -> StreamLoggingDockerContainer:
-    migrations_runner_image: DockerImage = DockerImage(
-        path=str(Path(settings.RELATIVE_PATH_TO_DOCKERFILE).resolve(strict=True)),
-        tag="flotilla-migrations-runner",
-    ).build()
+    migrations_runner_image: str = build_migrations_runner_image(
+        **_flotilla_migrations_runner()
+    )
 
     container = (
-        StreamLoggingDockerContainer(image=str(migrations_runner_image))
-        .with_name("migrations_runner")
+        StreamLoggingDockerContainer(image=migrations_runner_image)
+        .with_name(namespaced_container_name("migrations_runner"))
         .with_network(network)
         .with_env("DATABASE_URL", postgres_connection_string)
         .with_env("AZURE_CLIENT_SECRET", settings.FLOTILLA_AZURE_CLIENT_SECRET)
@@ -37,14 +181,13 @@ def create_migrations_runner_container(
 def create_sara_migrations_runner_container(
     network: Network, postgres_connection_string: str
 ) -> StreamLoggingDockerContainer:
-    sara_migrations_runner_image: DockerImage = DockerImage(
-        path=str(Path(settings.SARA_RELATIVE_PATH_TO_DOCKERFILE).resolve(strict=True)),
-        tag="sara-migrations-runner",
-    ).build()
+    sara_migrations_runner_image: str = build_migrations_runner_image(
+        **_sara_migrations_runner()
+    )
 
     container = (
-        StreamLoggingDockerContainer(image=str(sara_migrations_runner_image))
-        .with_name(f"sara-migrations-runner-{uuid.uuid4().hex[:8]}")
+        StreamLoggingDockerContainer(image=sara_migrations_runner_image)
+        .with_name(namespaced_container_name("sara_migrations_runner"))
         .with_network(network)
         .with_env("DATABASE_URL", postgres_connection_string)
         .with_env("AZURE_CLIENT_SECRET", settings.SARA_AZURE_CLIENT_SECRET)
@@ -1,6 +1,9 @@
 from docker.models.networks import Network
 from testcontainers.core.container import DockerContainer
 
+from robotics_integration_tests.custom_containers.naming import (
+    namespaced_container_name,
+)
 from robotics_integration_tests.settings.settings import settings
 
 
@@ -23,7 +26,7 @@ def create_flotilla_broker_container(
 ) -> DockerContainer:
     container: DockerContainer = (
         DockerContainer(image=image)
-        .with_name(name)
+        .with_name(namespaced_container_name(name))
         .with_exposed_ports(port)
         .with_network(network=network)
         .with_network_aliases(alias)
@@ -0,0 +1,16 @@
+import os
+import uuid
+
+from robotics_integration_tests.settings.settings import settings
+
+# Unique per test run and pytest-xdist worker so that several armadas can share one
+# Docker host. Network aliases are not namespaced since every armada has its own network.
+run_namespace: str = settings.ARMADA_NAMESPACE or "-".join(
+    part
+    for part in (os.environ.get("PYTEST_XDIST_WORKER"), uuid.uuid4().hex[:8])
+    if part
+)
+
+
+def namespaced_container_name(name: str) -> str:
+    return f"{name}-{run_namespace}"
@@ -1,30 +1,57 @@
+import csv
+import hashlib
+import io
+import tarfile
+import uuid
+from typing import Dict, List, Sequence, Tuple
+
 from docker.models.networks import Network
+from loguru import logger
+from testcontainers.core.labels import LABEL_SESSION_ID
 from testcontainers.postgres import PostgresContainer
 
+from robotics_integration_tests.custom_containers.naming import (
+    namespaced_container_name,
+)
 from robotics_integration_tests.settings.settings import settings
 
 
 class FlotillaDatabase:
     def __init__(
-        self, database: PostgresContainer, connection_string: str, alias: str
+        self,
+        database: PostgresContainer,
+        connection_string: str,
+        alias: str,
+        snapshot_image: str | None = None,
+        restored_from_snapshot: bool = False,
     ) -> None:
         self.database: PostgresContainer = database
         self.connection_string: str = connection_string
         self.alias: str = alias
+        self.snapshot_image: str | None = snapshot_image
+        self.restored_from_snapshot: bool = restored_from_snapshot
+
 
+# Keep the data directory outside the VOLUME declared by the postgres image so that it
+# ends up in the container layer and is included when the container is committed
+_data_directory: str = "/armada-pgdata"
 
-def create_postgres_container(network: Network) -> PostgresContainer:
+
+def create_postgres_container(
+    network: Network, image: str | None = None
+) -> PostgresContainer:
     container: PostgresContainer = (
         PostgresContainer(
-            image=settings.POSTGRESQL_IMAGE,
+            image=image or settings.POSTGRESQL_IMAGE,
             username=settings.DB_USER,
             password=settings.DB_PASSWORD,
             dbname=settings.DB_ALIAS,
         )
-        .with_name(settings.DB_ALIAS)
+        .with_name(namespaced_container_name(settings.DB_ALIAS))
         .with_exposed_ports(5432)
         .with_network(network)
         .with_network_aliases(settings.DB_ALIAS)
+        .with_env("PGDATA", _data_directory)
     )
 
     return container
@@ -39,18 +66,244 @@ class SaraDatabase:
         self.alias: str = alias
 
 
-def create_sara_postgres_container(network: Network) -> PostgresContainer:
+def create_sara_postgres_container(
+    network: Network, image: str | None = None
+) -> PostgresContainer:
     container: PostgresContainer = (
         PostgresContainer(
-            image=settings.POSTGRESQL_IMAGE,
+            image=image or settings.POSTGRESQL_IMAGE,
             username=settings.SARA_DB_USER,
             password=settings.SARA_DB_PASSWORD,
             dbname=settings.SARA_DB_ALIAS,
         )
-        .with_name(settings.SARA_DB_ALIAS)
+        .with_name(namespaced_container_name(settings.SARA_DB_ALIAS))
         .with_exposed_ports(5432)
         .with_network(network)
         .with_network_aliases(settings.SARA_DB_ALIAS)
+        .with_env("PGDATA", _data_directory)
     )
 
     return container
+
+
+# Truncates every table except the EF migrations history so the migrated schema is kept
+_truncate_all_tables_sql: str = """
+DO $$
+DECLARE
+    table_record record;
+BEGIN
+    FOR table_record IN
+        SELECT tablename FROM pg_tables
+        WHERE schemaname = 'public' AND tablename <> '__EFMigrationsHistory'
+    LOOP
+        EXECUTE 'TRUNCATE TABLE ' || quote_ident(table_record.tablename) || ' CASCADE';
+    END LOOP;
+END $$;
+"""
+
+
+def reset_database(database: PostgresContainer, username: str, dbname: str) -> None:
+    result = database.exec(
+        [
+            "psql",
+            "--username",
+            username,
+            "--dbname",
+            dbname,
+            "-v",
+            "ON_ERROR_STOP=1",
+            "-c",
+            _truncate_all_tables_sql,
+        ]
+    )
+    if result.exit_code != 0:
+        raise RuntimeError(
+            f"Failed to reset database {dbname}: {result.output.decode().strip()}"
+        )
+    logger.info(f"Database {dbname} has been reset")
+
+
+def check_table_columns(
+    database: PostgresContainer,
+    username: str,
+    dbname: str,
+    tables: Dict[str, Dict[str, str]],
+) -> None:
+    """Fail clearly when the schema has drifted from the columns a bulk load writes.
+
+    tables maps a table name to the data type of every column that will be written,
+    as named in information_schema.columns. Missing tables and columns, other data
+    types, e.g. an enum stored as integer instead of text, and required columns
+    without a default that are not written are reported together.
+    """
+    table_list: str = ", ".join(
+        "'" + table.replace("'", "''") + "'" for table in tables
+    )
+    result = database.exec(
+        [
+            "psql",
+            "--username",
+            username,
+            "--dbname",
+            dbname,
+            "-v",
+            "ON_ERROR_STOP=1",
+            "--no-align",
+            "--tuples-only",
+            "--field-separator=|",
+            "-c",
+            "SELECT table_name, column_name, data_type, is_nullable, "
+            "column_default IS NOT NULL FROM information_schema.columns "
+            f"WHERE table_schema = 'public' AND table_name IN ({table_list})",
+        ]
+    )
+    if result.exit_code != 0:
+        raise RuntimeError(
+            f"Failed to read the columns of database {dbname}: {result.output.decode().strip()}"
+        )
+
+    columns: Dict[str, Dict[str, Tuple[str, bool]]] = {}
+    for line in result.output.decode().splitlines():
+        if not line.strip():
+            continue
+        table, column, data_type, is_nullable, has_default = line.split("|")
+        columns.setdefault(table, {})[column] = (
+            data_type,
+            is_nullable == "NO" and has_default != "t",
+        )
+
+    problems: List[str] = []
+    for table, expected_columns in tables.items():
+        if table not in columns:
+            problems.append(f"table {table} does not exist")
+            continue
+        for column, expected_type in expected_columns.items():
+            if column not in columns[table]:
+                problems.append(f"{table}.{column} does not exist")
+            elif columns[table][column][0] != expected_type:
+                problems.append(
+                    f"{table}.{column} is {columns[table][column][0]}, expected {expected_type}"
+                )
+        for column, (_, is_required) in columns[table].items():
+            if is_required and column not in expected_columns:
+                problems.append(f"{table}.{column} is required but not written")
+    if problems:
+        raise RuntimeError(
+            f"The schema of database {dbname} does not match the columns of the "
+            f"bulk load: {'; '.join(problems)}"
+        )
+
+
+def copy_rows_into_database(
+    database: PostgresContainer,
+    username: str,
+    dbname: str,
+    tables: Dict[str, Tuple[Sequence[str], List[Sequence[str]]]],
+) -> None:
+    """Bulk load rows with COPY, tables maps a table name to its columns and rows.
+
+    The rows are written as CSV files into the container and loaded in a single
+    transaction in the order of tables, so foreign keys can reference rows of earlier
+    tables. Nothing is loaded if any table fails.
+    """
+    directory: str = f"armada-copy-{uuid.uuid4().hex[:8]}"
+    archive_buffer: io.BytesIO = io.BytesIO()
+    script_lines: List[str] = []
+    with tarfile.open(fileobj=archive_buffer, mode="w") as archive:
+        directory_info: tarfile.TarInfo = tarfile.TarInfo(directory)
+        directory_info.type = tarfile.DIRTYPE
+        directory_info.mode = 0o755
+        archive.addfile(directory_info)
+
+        for table, (columns, rows) in tables.items():
+            csv_buffer: io.StringIO = io.StringIO()
+            csv.writer(csv_buffer).writerows(rows)
+            data: bytes = csv_buffer.getvalue().encode()
+            file_info: tarfile.TarInfo = tarfile.TarInfo(f"{directory}/{table}.csv")
+            file_info.size = len(data)
+            file_info.mode = 0o644
+            archive.addfile(file_info, io.BytesIO(data))
+
+            column_list: str = ", ".join(f'"{column}"' for column in columns)
+            script_lines.append(
+                f"COPY \"{table}\" ({column_list}) FROM '/tmp/{directory}/{table}.csv' WITH (FORMAT csv);"
+            )
+
+    wrapped_container = database.get_wrapped_container()
+    wrapped_container.put_archive("/tmp", archive_buffer.getvalue())
+    try:
+        result = database.exec(
+            [
+                "psql",
+                "--username",
+                username,
+                "--dbname",
+                dbname,
+                "-v",
+                "ON_ERROR_STOP=1",
+                "--single-transaction",
+                "-c",
+                "\n".join(script_lines),
+            ]
+        )
+    finally:
+        database.exec(["rm", "-rf", f"/tmp/{directory}"])
+    if result.exit_code != 0:
+        raise RuntimeError(
+            f"Failed to copy rows into database {dbname}: {result.output.decode().strip()}"
+        )
+    logger.info(
+        f"Copied {sum(len(rows) for _, rows in tables.values())} rows into database {dbname}"
+    )
+
+
+def database_snapshot_image(
+    name: str,
+    username: str,
+    dbname: str,
+    migrations_runner_image: str | None,
+    seed_fingerprint: str = "",
+) -> str | None:
+    """Image tag of the database snapshot for the given migrations runner image and
+    seed data.
+
+    Returns None when snapshots are disabled or the migrations runner image is not
+    content-addressed, since the snapshot would silently go stale.
+    """
+    if not settings.DATABASE_SNAPSHOTS_ENABLED or migrations_runner_image is None:
+        return None
+
+    key: str = hashlib.sha256(
+        "|".join(
+            [
+                settings.POSTGRESQL_IMAGE,
+                username,
+                dbname,
+                migrations_runner_image,
+                seed_fingerprint,
+            ]
+        ).encode()
+    ).hexdigest()[:16]
+    return f"armada-{name}-snapshot:{key}"
+
+
+def commit_database_snapshot(
+    database: PostgresContainer, snapshot_image: str, username: str, dbname: str
+) -> None:
+    result = database.exec(
+        ["psql", "--username", username, "--dbname", dbname, "-c", "CHECKPOINT"]
+    )
+    if result.exit_code != 0:
+        raise RuntimeError(
+            f"Failed to checkpoint database {dbname}: {result.output.decode().strip()}"
+        )
+
+    repository, tag = snapshot_image.rsplit(":", 1)
+    database.get_wrapped_container().commit(
+        repository=repository,
+        tag=tag,
+        # Overriding the session label keeps the testcontainers reaper from removing
+        # the snapshot when the session ends
+        conf={"Labels": {LABEL_SESSION_ID: "armada-database-snapshot"}},
+    )
+    logger.info(f"Database {dbname} has been committed to snapshot {snapshot_image}")
@@ -3,7 +3,11 @@ from docker.models.networks import Network
 from robotics_integration_tests.custom_containers.stream_logging_docker_container import (
     StreamLoggingDockerContainer,
 )
+from robotics_integration_tests.custom_containers.naming import (
+    namespaced_container_name,
+)
 from robotics_integration_tests.settings.settings import settings
+from robotics_integration_tests.utilities.sara_backend_api import SaraClient
 
 
 class Sara:
@@ -20,6 +24,7 @@ class Sara:
         self.name: str = name
         self.port: int = port
         self.alias: str = alias
+        self.client: SaraClient = SaraClient.for_url(backend_url)
 
 
 def create_sara_container(
@@ -32,7 +37,7 @@ def create_sara_container(
 ) -> StreamLoggingDockerContainer:
     container: StreamLoggingDockerContainer = (
         StreamLoggingDockerContainer(image=image)
-        .with_name(name)
+        .with_name(namespaced_container_name(name))
         .with_exposed_ports(port)
         .with_network(network)
         .with_network_aliases(alias)
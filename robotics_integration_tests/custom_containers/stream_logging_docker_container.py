@@ -1,11 +1,19 @@
-import time
-from threading import Thread
-from typing import Optional, Any
+from pathlib import Path
+from typing import Optional, Any, Self
 
-from loguru import logger
+from docker.errors import ImageNotFound
 from testcontainers.core.container import DockerContainer
 from testcontainers.core.waiting_utils import WaitStrategy
 
+from robotics_integration_tests.custom_containers.log_collector import log_collector
+from robotics_integration_tests.custom_containers.log_store import (
+    ContainerLogStore,
+    LogMatch,
+)
+from robotics_integration_tests.custom_containers.naming import run_namespace
+from robotics_integration_tests.settings.settings import settings
+from robotics_integration_tests.utilities.profiling import profile_phase
+
 
 class StreamLoggingDockerContainer(DockerContainer):
     def __init__(
@@ -22,11 +30,72 @@ class StreamLoggingDockerContainer(DockerContainer):
             **kwargs,
         )
 
-        self.logging_thread: Thread = Thread(target=self._stream_logs)
-        self.logging_thread.start()
+        # Every log line is stored on disk for readiness checks and assertions in tests
+        self.log_store: Optional[ContainerLogStore] = None
+        self.log_level: str = settings.CONTAINER_LOG_LEVEL
+
+    def with_log_level(self, level: str) -> Self:
+        """Only forward log lines at or above level to the test log."""
+        self.log_level = level
+        return self
+
+    def start(self) -> Self:
+        component: str = self._name or self.image
+        with profile_phase(component, "image pull"):
+            self._pull_image_if_missing()
+        with profile_phase(component, "container start"):
+            super().start()
+        # Container names repeat when the armada is deployed for every test, the id
+        # keeps the logs of an earlier container with the same name
+        short_id: str = self.get_wrapped_container().short_id
+        self.log_store = ContainerLogStore(
+            directory=Path(settings.CONTAINER_LOG_DIRECTORY) / run_namespace,
+            name=f"{self._name}-{short_id}" if self._name else short_id,
+        )
+        log_collector.attach(self)
+        return self
+
+    def _pull_image_if_missing(self) -> None:
+        # Docker pulls missing images when creating the container, pulling first
+        # separates the pull from the container start in the startup profile
+        images = self.get_docker_client().client.images
+        try:
+            images.get(self.image)
+        except ImageNotFound:
+            images.pull(self.image)
+
+    def stop(self, force: bool = True, delete_volume: bool = True) -> None:
+        log_collector.detach(self)
+        super().stop(force=force, delete_volume=delete_volume)
+
+    def append_log_line(self, line: str) -> None:
+        self.log_store.append(line)
+
+    def close_log_stream(self) -> None:
+        self.log_store.close()
+
+    def wait_for_log(
+        self, pattern: str, timeout: float = 60, after: Optional[float] = None
+    ) -> LogMatch:
+        """Block until a log line matching the regular expression is stored.
+
+        Lines logged before the call are matched as well, so there is no race between
+        starting the container and starting to wait. Pass a time.time() timestamp as
+        after to only match lines logged from then on.
+        """
+        if self.log_store is None:
+            raise RuntimeError(f"Container {self.image} has not been started")
+        return self.log_store.wait_for_log(
+            pattern=pattern, timeout=timeout, after=after
+        )
+
+    def wait_for_log_line(self, pattern: str, timeout: float = 60) -> str:
+        return self.wait_for_log(pattern=pattern, timeout=timeout).text
 
-    def _stream_logs(self) -> None:
-        while not self.get_wrapped_container():
-            time.sleep(0.1)
-        for line in self.get_wrapped_container().logs(stream=True, follow=True):
-            logger.info(f"{self._name}: {line.decode().rstrip()}")
+    def first_log_match(
+        self, pattern: str, after: Optional[float] = None
+    ) -> Optional[LogMatch]:
+        """Return the first stored log line matching the regular expression, if any."""
+        if self.log_store is None:
+            return None
+        return self.log_store.first_match(pattern=pattern, after=after)
@@ -17,19 +17,29 @@ WAIT_FOR_DB_TIMEOUT="${WAIT_FOR_DB_TIMEOUT:-60}"
 : "${AZURE_CLIENT_ID:?AZURE_CLIENT_ID must be set at runtime}"
 : "${AZURE_TENANT_ID:?AZURE_TENANT_ID must be set at runtime}"
 
-echo "Cloning $GIT_REPO @ $GIT_REF ..."
-rm -rf /work/repo
-if [ "$GIT_REF" = "latest" ]; then
-  GIT_REF=$(curl -s ${GITHUB_TOKEN:+-H "Authorization: token $GITHUB_TOKEN"} \
-    "https://api.github.com/repos/$GIT_REPO/releases/latest" | jq -r .tag_name)
-  echo "Resolved latest to $GIT_REF"
-fi
-git clone --depth 1 --branch "$GIT_REF" "https://github.com/$GIT_REPO" /work/repo
+EF_BUILD_ARGS=()
+if [ -d /work/repo ] \
+    && [ "$GIT_REPO" = "${PREBUILT_GIT_REPO:-}" ] \
+    && [ "$GIT_REF" = "${PREBUILT_GIT_REF:-}" ] \
+    && [ "$EF_PROJECT_PATH" = "${PREBUILT_EF_PROJECT_PATH:-}" ]; then
+  echo "Using $GIT_REPO @ $GIT_REF prebuilt into the image"
+  cd /work/repo
+  EF_BUILD_ARGS=(--no-build)
+else
+  echo "Cloning $GIT_REPO @ $GIT_REF ..."
+  rm -rf /work/repo
+  if [ "$GIT_REF" = "latest" ]; then
+    GIT_REF=$(curl -s ${GITHUB_TOKEN:+-H "Authorization: token $GITHUB_TOKEN"} \
+      "https://api.github.com/repos/$GIT_REPO/releases/latest" | jq -r .tag_name)
+    echo "Resolved latest to $GIT_REF"
+  fi
+  git clone --depth 1 --branch "$GIT_REF" "https://github.com/$GIT_REPO" /work/repo
 
-cd /work/repo
+  cd /work/repo
 
-echo "Restoring projects for EF design-time..."
-dotnet restore "$EF_STARTUP_PATH" || dotnet restore "$EF_PROJECT_PATH" || true
+  echo "Restoring projects for EF design-time..."
+  dotnet restore "$EF_STARTUP_PATH" || dotnet restore "$EF_PROJECT_PATH" || true
+fi
 
 echo "Waiting for DB and applying migrations (timeout: ${WAIT_FOR_DB_TIMEOUT}s)..."
 end=$((SECONDS + WAIT_FOR_DB_TIMEOUT))
@@ -39,7 +49,8 @@ while true; do
   if dotnet ef database update \
       --connection "$DATABASE_URL" \
       --project "$EF_PROJECT_PATH" \
-      --startup-project "$EF_STARTUP_PATH" ; then
+      --startup-project "$EF_STARTUP_PATH" \
+      "${EF_BUILD_ARGS[@]}" ; then
     echo "Migrations applied successfully."
     break
   fi
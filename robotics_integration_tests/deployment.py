@@ -0,0 +1,746 @@
+import asyncio
+from contextlib import AbstractContextManager, ExitStack, contextmanager, nullcontext
+from functools import partial
+from typing import Any, Dict, Iterator, List, Tuple
+
+from loguru import logger
+from testcontainers.core.network import Network
+
+from robotics_integration_tests.armada import Armada
+from robotics_integration_tests.custom_containers.azurite import (
+    AzuriteStorageContainer,
+    FlotillaStorage,
+    azurite_connection_string_for_containers,
+    create_azurite_container,
+    ensure_blob_containers,
+)
+from robotics_integration_tests.custom_containers.flotilla_backend import (
+    FlotillaBackend,
+    create_flotilla_backend_container,
+)
+from robotics_integration_tests.custom_containers.images import image_exists
+from robotics_integration_tests.custom_containers.isar import (
+    IsarRobot,
+    create_isar_robot_container,
+)
+from robotics_integration_tests.custom_containers.migrations_runner import (
+    create_migrations_runner_container,
+    create_sara_migrations_runner_container,
+    flotilla_migrations_runner_image_tag,
+    sara_migrations_runner_image_tag,
+)
+from robotics_integration_tests.custom_containers.mosquitto import (
+    FlotillaBroker,
+    create_flotilla_broker_container,
+)
+from robotics_integration_tests.custom_containers.naming import (
+    namespaced_container_name,
+)
+from robotics_integration_tests.custom_containers.postgres import (
+    FlotillaDatabase,
+    SaraDatabase,
+    commit_database_snapshot,
+    create_postgres_container,
+    create_sara_postgres_container,
+    database_snapshot_image,
+)
+from robotics_integration_tests.custom_containers.sara import (
+    Sara,
+    create_sara_container,
+)
+from robotics_integration_tests.custom_containers.stream_logging_docker_container import (
+    StreamLoggingDockerContainer,
+)
+from robotics_integration_tests.settings.settings import settings
+from robotics_integration_tests.utilities.backend_client import BackendClient
+from robotics_integration_tests.utilities.flotilla_backend_api import (
+    setup_robot_in_flotilla,
+    wait_for_backend_to_be_responsive,
+)
+from robotics_integration_tests.utilities.flotilla_backend_async_api import (
+    AsyncFlotillaBackendClient,
+    setup_robots_in_flotilla,
+)
+from robotics_integration_tests.utilities.isar_simulator import (
+    BlobUploader,
+    IsarSimulator,
+    MqttPublisher,
+    SimulatedIsarRobot,
+    SimulationParameters,
+)
+from robotics_integration_tests.utilities.keyvault import Keyvault
+from robotics_integration_tests.utilities.profiling import profile_phase
+from robotics_integration_tests.utilities.readiness import (
+    wait_for_container_log,
+    wait_for_port_mapping_to_be_available,
+)
+from robotics_integration_tests.utilities.sara_backend_api import (
+    wait_for_sara_to_be_responsive,
+)
+from robotics_integration_tests.utilities.seed_dataset import (
+    SeedData,
+    load_seed_dataset,
+)
+from robotics_integration_tests.utilities.seeding import (
+    seed_flotilla,
+    wait_for_database_to_be_populated,
+)
+from robotics_integration_tests.utilities.startup_orchestrator import (
+    StartupOrchestrator,
+)
+from robotics_integration_tests.utilities.status_watcher import FlotillaStatusWatcher
+
+
+@contextmanager
+def deploy_flotilla_database(
+    network: Network, keyvault: Keyvault
+) -> Iterator[FlotillaDatabase]:
+    """Start a migrated Flotilla database.
+
+    The snapshot of the database is committed by deploy_flotilla_backend once the
+    database has been seeded, so a restored database is both migrated and seeded.
+    """
+    snapshot_image: str | None = database_snapshot_image(
+        name="flotilla-database",
+        username=settings.DB_USER,
+        dbname=settings.DB_ALIAS,
+        migrations_runner_image=flotilla_migrations_runner_image_tag(),
+        seed_fingerprint=load_seed_dataset(settings.SEED_DATASET).fingerprint(),
+    )
+    restore_from_snapshot: bool = snapshot_image is not None and image_exists(
+        snapshot_image
+    )
+
+    with create_postgres_container(
+        network, image=snapshot_image if restore_from_snapshot else None
+    ) as database:
+        wait_for_port_mapping_to_be_available(container=database, port=5432)
+        logger.info(
+            f"Postgres URL: {database.get_connection_url()}, "
+            f"Port: {database.get_exposed_port(5432)}"
+        )
+
+        connection_string: str = (
+            f"Host={settings.DB_ALIAS}; Port={5432}; Username={settings.DB_USER}; Password={settings.DB_PASSWORD}; "
+            f"Database={settings.DB_ALIAS}; SSL Mode=Disable;"
+        )
+
+        if restore_from_snapshot:
+            logger.info(f"Flotilla database restored from snapshot {snapshot_image}")
+        else:
+            with (
+                profile_phase("flotilla_database", "migrations"),
+                create_migrations_runner_container(
+                    network=network,
+                    postgres_connection_string=connection_string,
+                ) as migrations_runner,
+            ):
+                # Block until the container exits; returns {"StatusCode": int}
+                result = migrations_runner.get_wrapped_container().wait()
+                status = int(result.get("StatusCode", 1))
+                if status != 0:
+                    raise RuntimeError(f"Migrator failed with exit code {status}")
+
+            logger.info("Migrations completed successfully (container exited cleanly)")
+
+        keyvault.set_secret(
+            secret_name="flotilla-database-connection-string",
+            secret_value=connection_string,
+        )
+
+        yield FlotillaDatabase(
+            database=database,
+            connection_string=connection_string,
+            alias=settings.DB_ALIAS,
+            snapshot_image=snapshot_image,
+            restored_from_snapshot=restore_from_snapshot,
+        )
+
+
+@contextmanager
+def deploy_sara_database(
+    network: Network, keyvault: Keyvault
+) -> Iterator[SaraDatabase]:
+    snapshot_image: str | None = database_snapshot_image(
+        name="sara-database",
+        username=settings.SARA_DB_USER,
+        dbname=settings.SARA_DB_ALIAS,
+        migrations_runner_image=sara_migrations_runner_image_tag(),
+    )
+    restore_from_snapshot: bool = snapshot_image is not None and image_exists(
+        snapshot_image
+    )
+
+    with create_sara_postgres_container(
+        network, image=snapshot_image if restore_from_snapshot else None
+    ) as database:
+        wait_for_port_mapping_to_be_available(container=database, port=5432)
+        logger.info(
+            f"Postgres URL: {database.get_connection_url()}, "
+            f"Port: {database.get_exposed_port(5432)}"
+        )
+
+        connection_string: str = (
+            f"Host={settings.SARA_DB_ALIAS}; Port={5432}; Username={settings.SARA_DB_USER}; Password={settings.SARA_DB_PASSWORD}; "
+            f"Database={settings.SARA_DB_ALIAS}; SSL Mode=Disable;"
+        )
+
+        if restore_from_snapshot:
+            logger.info(f"Sara database restored from snapshot {snapshot_image}")
+        else:
+            with (
+                profile_phase("sara_database", "migrations"),
+                create_sara_migrations_runner_container(
+                    network=network,
+                    postgres_connection_string=connection_string,
+                ) as migrations_runner,
+            ):
+                # Block until the container exits; returns {"StatusCode": int}
+                result = migrations_runner.get_wrapped_container().wait()
+                status = int(result.get("StatusCode", 1))
+                if status != 0:
+                    raise RuntimeError(f"Sara migrator failed with exit code {status}")
+
+            logger.info(
+                "Sara migrations completed successfully (container exited cleanly)"
+            )
+
+            if snapshot_image is not None:
+                with profile_phase("sara_database", "snapshot commit"):
+                    commit_database_snapshot(
+                        database=database,
+                        snapshot_image=snapshot_image,
+                        username=settings.SARA_DB_USER,
+                        dbname=settings.SARA_DB_ALIAS,
+                    )
+
+        keyvault.set_secret(
+            secret_name="sara-database-connection-string",
+            secret_value=connection_string,
+        )
+
+        yield SaraDatabase(
+            database=database,
+            connection_string=connection_string,
+            alias=settings.SARA_DB_ALIAS,
+        )
+
+
+@contextmanager
+def deploy_azurite_storage_container(
+    network: Network, keyvault: Keyvault, alias: str
+) -> Iterator[AzuriteStorageContainer]:
+    with create_azurite_container(network=network, name=alias) as container:
+        wait_for_port_mapping_to_be_available(container=container, port=10000)
+        wait_for_container_log(
+            container=container, pattern=settings.AZURITE_READY_LOG_PATTERN
+        )
+
+        docker_connection_string: str = azurite_connection_string_for_containers(
+            settings.AZURITE_ACCOUNT,
+            settings.AZURITE_KEY,
+            alias,
+            port=10000,
+        )
+        host_connection_string: str = azurite_connection_string_for_containers(
+            settings.AZURITE_ACCOUNT,
+            settings.AZURITE_KEY,
+            "localhost",
+            port=container.get_exposed_port(10000),
+        )
+        if alias == settings.SARA_RAW_STORAGE_CONTAINER:
+            keyvault.set_secret(
+                secret_name="AZURE-STORAGE-CONNECTION-STRING-DATA",
+                secret_value=docker_connection_string,
+            )
+        elif alias == settings.SARA_ANON_STORAGE_CONTAINER:
+            keyvault.set_secret(
+                secret_name="AZURE-STORAGE-CONNECTION-STRING-METADATA",
+                secret_value=docker_connection_string,
+            )
+
+        with profile_phase(alias, "blob containers"):
+            ensure_blob_containers(host_connection_string, *settings.BLOB_CONTAINERS)
+
+        yield AzuriteStorageContainer(
+            alias=alias,
+            container=container,
+            docker_connection_string=docker_connection_string,
+            host_connection_string=host_connection_string,
+        )
+
+
+@contextmanager
+def deploy_flotilla_broker(network: Network) -> Iterator[FlotillaBroker]:
+    with create_flotilla_broker_container(
+        network=network,
+        image=settings.FLOTILLA_BROKER_IMAGE,
+        name=settings.FLOTILLA_BROKER_NAME,
+        port=settings.FLOTILLA_BROKER_PORT,
+        alias=settings.FLOTILLA_BROKER_ALIAS,
+    ) as broker:
+        wait_for_port_mapping_to_be_available(
+            container=broker, port=settings.FLOTILLA_BROKER_PORT
+        )
+
+        yield FlotillaBroker(
+            broker=broker,
+            name=settings.FLOTILLA_BROKER_NAME,
+            port=settings.FLOTILLA_BROKER_PORT,
+            alias=settings.FLOTILLA_BROKER_ALIAS,
+        )
+
+
+@contextmanager
+def deploy_status_watcher(
+    flotilla_broker: FlotillaBroker,
+) -> Iterator[FlotillaStatusWatcher | None]:
+    """Start a status watcher on the broker, or yield None when it is disabled or cannot
+    connect, in which case the status waits fall back to polling the backend."""
+    if not settings.STATUS_WATCHER_ENABLED:
+        yield None
+        return
+
+    status_watcher: FlotillaStatusWatcher = FlotillaStatusWatcher(
+        host=flotilla_broker.broker.get_container_host_ip(),
+        port=flotilla_broker.broker.get_exposed_port(flotilla_broker.port),
+        username=settings.STATUS_WATCHER_MQTT_USERNAME,
+        password=settings.FLOTILLA_MQTT_PASSWORD,
+        use_tls=settings.FLOTILLA_BROKER_USE_TLS,
+    )
+    try:
+        status_watcher.start()
+    except (ConnectionError, OSError) as e:
+        logger.warning(f"Status watcher is not available, falling back to polling: {e}")
+        yield None
+        return
+
+    try:
+        yield status_watcher
+    finally:
+        status_watcher.stop()
+
+
+@contextmanager
+def deploy_flotilla_backend(
+    network: Network, flotilla_database: FlotillaDatabase
+) -> Iterator[FlotillaBackend]:
+    with create_flotilla_backend_container(
+        network=network,
+        database_connection_string=flotilla_database.connection_string,
+        image=settings.FLOTILLA_BACKEND_IMAGE,
+        name=settings.FLOTILLA_BACKEND_NAME,
+        port=settings.FLOTILLA_BACKEND_PORT,
+        alias=settings.FLOTILLA_BACKEND_ALIAS,
+    ) as flotilla_backend:
+        wait_for_port_mapping_to_be_available(
+            container=flotilla_backend, port=settings.FLOTILLA_BACKEND_PORT
+        )
+
+        backend_url: str = f"http://localhost:{flotilla_backend.get_exposed_port(8000)}"
+        _wait_for_ready_log_line(
+            container=flotilla_backend,
+            pattern=settings.FLOTILLA_BACKEND_READY_LOG_PATTERN,
+        )
+        with profile_phase("flotilla_backend", "warm-up"):
+            wait_for_backend_to_be_responsive(backend_url=backend_url)
+        if flotilla_database.restored_from_snapshot:
+            logger.info("Flotilla database was restored already seeded")
+        else:
+            with profile_phase("flotilla_backend", "seeding"):
+                seed_flotilla(
+                    backend_url=backend_url,
+                    flotilla_database=flotilla_database,
+                    seed_data=load_seed_dataset(settings.SEED_DATASET),
+                )
+        wait_for_database_to_be_populated(backend_url=backend_url)
+
+        if (
+            flotilla_database.snapshot_image is not None
+            and not flotilla_database.restored_from_snapshot
+        ):
+            with profile_phase("flotilla_database", "snapshot commit"):
+                commit_database_snapshot(
+                    database=flotilla_database.database,
+                    snapshot_image=flotilla_database.snapshot_image,
+                    username=settings.DB_USER,
+                    dbname=settings.DB_ALIAS,
+                )
+
+        flotilla_backend_deployment: FlotillaBackend = FlotillaBackend(
+            flotilla_backend=flotilla_backend,
+            backend_url=backend_url,
+            name=settings.FLOTILLA_BACKEND_NAME,
+            port=settings.FLOTILLA_BACKEND_PORT,
+            alias=settings.FLOTILLA_BACKEND_ALIAS,
+        )
+        try:
+            yield flotilla_backend_deployment
+        finally:
+            _close_backend_client(flotilla_backend_deployment.client)
+
+
+@contextmanager
+def deploy_sara(network: Network, sara_database: SaraDatabase) -> Iterator[Sara]:
+    with create_sara_container(
+        network=network,
+        database_connection_string=sara_database.connection_string,
+        image=settings.SARA_IMAGE,
+        name=settings.SARA_NAME,
+        port=settings.SARA_PORT,
+        alias=settings.SARA_ALIAS,
+    ) as sara_container:
+        wait_for_port_mapping_to_be_available(
+            container=sara_container, port=settings.SARA_PORT
+        )
+
+        sara_url: str = f"http://localhost:{sara_container.get_exposed_port(8100)}"
+        _wait_for_ready_log_line(
+            container=sara_container, pattern=settings.SARA_READY_LOG_PATTERN
+        )
+        with profile_phase("sara", "warm-up"):
+            wait_for_sara_to_be_responsive(sara_url=sara_url)
+
+        sara: Sara = Sara(
+            sara=sara_container,
+            backend_url=sara_url,
+            name=settings.SARA_NAME,
+            port=settings.SARA_PORT,
+            alias=settings.SARA_ALIAS,
+        )
+        try:
+            yield sara
+        finally:
+            _close_backend_client(sara.client)
+
+
+@contextmanager
+def deploy_armada_without_robots(
+    network: Network, keyvault: Keyvault
+) -> Iterator[Armada]:
+    """Deploy every armada component except the robots.
+
+    The components are started as a dependency graph so that bring-up time is bounded
+    by the critical path (database, migrations, backend) rather than the sum of all
+    containers. Set PARALLEL_STARTUP to false to start one component at a time.
+    """
+    orchestrator: StartupOrchestrator = StartupOrchestrator(
+        max_workers=settings.STARTUP_MAX_WORKERS if settings.PARALLEL_STARTUP else 1
+    )
+
+    orchestrator.add_component(
+        "flotilla_broker", lambda _: deploy_flotilla_broker(network=network)
+    )
+    orchestrator.add_component(
+        "status_watcher",
+        lambda started: deploy_status_watcher(
+            flotilla_broker=started["flotilla_broker"]
+        ),
+        dependencies=["flotilla_broker"],
+    )
+    orchestrator.add_component(
+        "flotilla_database",
+        lambda _: deploy_flotilla_database(network=network, keyvault=keyvault),
+    )
+    orchestrator.add_component(
+        "sara_database",
+        lambda _: deploy_sara_database(network=network, keyvault=keyvault),
+    )
+    for azurite_container_alias in settings.AZURITE_ALIASES:
+        orchestrator.add_component(
+            f"azurite_{azurite_container_alias}",
+            lambda _, alias=azurite_container_alias: deploy_azurite_storage_container(
+                network=network, keyvault=keyvault, alias=alias
+            ),
+        )
+    orchestrator.add_component(
+        "flotilla_storage",
+        lambda started: nullcontext(
+            FlotillaStorage(
+                azurite_containers={
+                    alias: started[f"azurite_{alias}"]
+                    for alias in settings.AZURITE_ALIASES
+                }
+            )
+        ),
+        dependencies=[f"azurite_{alias}" for alias in settings.AZURITE_ALIASES],
+    )
+    orchestrator.add_component(
+        "flotilla_backend",
+        lambda started: deploy_flotilla_backend(
+            network=network, flotilla_database=started["flotilla_database"]
+        ),
+        dependencies=["flotilla_database", "flotilla_broker"],
+    )
+    orchestrator.add_component(
+        "sara",
+        lambda started: deploy_sara(
+            network=network, sara_database=started["sara_database"]
+        ),
+        dependencies=["sara_database", "flotilla_broker"],
+    )
+
+    with ExitStack() as stack:
+        started: Dict[str, Any] = orchestrator.start(stack)
+
+        armada: Armada = Armada()
+        armada.keyvault = keyvault
+        armada.network = network
+        armada.sara_database = started["sara_database"]
+        armada.sara = started["sara"]
+        armada.flotilla_database = started["flotilla_database"]
+        armada.flotilla_storage = started["flotilla_storage"]
+        armada.flotilla_broker = started["flotilla_broker"]
+        armada.flotilla_backend = started["flotilla_backend"]
+        armada.status_watcher = started["status_watcher"]
+
+        yield armada
+
+
+@contextmanager
+def deploy_isar_robot(
+    armada: Armada,
+    name: str,
+    alias: str,
+    installation_code: str = "HUA",
+    plant_name: str = "Huldra",
+    isar_id: str = "",
+    should_fail_normal_task: bool = False,
+) -> Iterator[IsarRobot]:
+    """Start an ISAR robot and wait for it to be ready for missions in Flotilla."""
+    with create_isar_robot_container(
+        network=armada.network,
+        image=settings.ISAR_ROBOT_IMAGE,
+        name=name,
+        port=settings.ISAR_ROBOT_PORT,
+        alias=alias,
+        blob_storage_connection_string_data=armada.keyvault.get_secret(
+            "AZURE-STORAGE-CONNECTION-STRING-DATA"
+        ).value,
+        blob_storage_connection_string_metadata=armada.keyvault.get_secret(
+            "AZURE-STORAGE-CONNECTION-STRING-METADATA"
+        ).value,
+        should_fail_normal_task=should_fail_normal_task,
+        installation_code=installation_code,
+        plant_name=plant_name,
+        isar_id=isar_id,
+    ) as isar_robot:
+        with profile_phase(name, "registration in flotilla"):
+            robot_id, installation_code_for_robot = setup_robot_in_flotilla(
+                backend_url=armada.flotilla_backend.backend_url,
+                robot_name=name,
+            )
+
+        yield IsarRobot(
+            container=isar_robot,
+            name=name,
+            robot_id=robot_id,
+            port=settings.ISAR_ROBOT_PORT,
+            alias=alias,
+            installation_code=installation_code_for_robot,
+        )
+
+
+def fleet_robot_placements(
+    fleet_size: int, seed_data: SeedData
+) -> List[Tuple[str, str]]:
+    """Spread fleet_size robots round robin over the seeded installations that have a
+    plant, returned as (installation code, plant name) per robot."""
+    plant_names: Dict[str, str] = {}
+    for _, installation_code, plant_name in seed_data.plants:
+        plant_names.setdefault(installation_code, plant_name)
+
+    installations: List[Tuple[str, str]] = [
+        (installation_code, plant_names[installation_code])
+        for installation_code, _ in seed_data.installations
+        if installation_code in plant_names
+    ]
+    if not installations:
+        raise ValueError("The seed dataset has no installation with a plant")
+    return [installations[index % len(installations)] for index in range(fleet_size)]
+
+
+def _ensure_installation_blob_containers(
+    armada: Armada, placements: List[Tuple[str, str]]
+) -> None:
+    """Create the blob container of every installation a robot is placed in, robots
+    upload their inspections to the container named after their installation and the
+    storage deployment only creates BLOB_CONTAINERS."""
+    names: List[str] = sorted(
+        {installation_code.lower() for installation_code, _ in placements}
+        - set(settings.BLOB_CONTAINERS)
+    )
+    if not names:
+        return
+    for azurite_container in armada.flotilla_storage.azurite_containers.values():
+        ensure_blob_containers(azurite_container.host_connection_string, *names)
+    logger.info(f"Created blob containers for {len(names)} more installations")
+
+
+def _deploy_fleet_robot(
+    _: Dict[str, Any],
+    armada: Armada,
+    name: str,
+    alias: str,
+    installation_code: str,
+    plant_name: str,
+    should_fail_normal_task: bool,
+) -> AbstractContextManager:
+    return deploy_isar_robot(
+        armada=armada,
+        name=name,
+        alias=alias,
+        installation_code=installation_code,
+        plant_name=plant_name,
+        isar_id=namespaced_container_name(name),
+        should_fail_normal_task=should_fail_normal_task,
+    )
+
+
+@contextmanager
+def deploy_isar_fleet(
+    armada: Armada, fleet_size: int, should_fail_normal_task: bool = False
+) -> Iterator[Dict[str, IsarRobot]]:
+    """Start fleet_size ISAR robots concurrently, spread over the seeded installations.
+
+    Every robot gets a unique name, alias and ISAR id, and is started and registered in
+    Flotilla on its own worker. The robots are added to armada.robots.
+    """
+    orchestrator: StartupOrchestrator = StartupOrchestrator(
+        max_workers=(
+            min(fleet_size, settings.STARTUP_MAX_WORKERS)
+            if settings.PARALLEL_STARTUP
+            else 1
+        )
+    )
+    placements: List[Tuple[str, str]] = fleet_robot_placements(
+        fleet_size=fleet_size, seed_data=load_seed_dataset(settings.SEED_DATASET)
+    )
+    _ensure_installation_blob_containers(armada=armada, placements=placements)
+    for index, (installation_code, plant_name) in enumerate(placements, start=1):
+        name: str = f"{settings.ISAR_ROBOT_NAME}-{index}"
+        orchestrator.add_component(
+            name,
+            partial(
+                _deploy_fleet_robot,
+                armada=armada,
+                name=name,
+                alias=f"{settings.ISAR_ROBOT_ALIAS}_{index}",
+                installation_code=installation_code,
+                plant_name=plant_name,
+                should_fail_normal_task=should_fail_normal_task,
+            ),
+        )
+
+    with ExitStack() as stack:
+        robots: Dict[str, IsarRobot] = orchestrator.start(stack)
+        armada.robots.update(robots)
+        logger.info(
+            f"Fleet of {fleet_size} robots is ready in "
+            f"{len(set(installation_code for installation_code, _ in placements))} installations"
+        )
+        yield robots
+
+
+async def _setup_simulated_robots_in_flotilla(
+    backend_url: str, robots: Dict[str, SimulatedIsarRobot]
+) -> None:
+    async with AsyncFlotillaBackendClient(backend_url) as client:
+        registrations: Dict[str, Tuple[str, str]] = await setup_robots_in_flotilla(
+            client, robot_names=list(robots)
+        )
+    for name, (robot_id, installation_code) in registrations.items():
+        robots[name].robot_id = robot_id
+        robots[name].installation_code = installation_code
+
+
+@contextmanager
+def deploy_simulated_isar_fleet(
+    armada: Armada, fleet_size: int, should_fail_normal_task: bool = False
+) -> Iterator[Dict[str, SimulatedIsarRobot]]:
+    """Start fleet_size simulated ISAR robots, spread over the seeded installations.
+
+    The robots run in this process on the ISAR simulator, which connects to the broker
+    and the blob storage through their ports on the Docker host. The robots are added
+    to armada.robots.
+    """
+    broker: FlotillaBroker = armada.flotilla_broker
+    uploader: BlobUploader | None = None
+    if settings.ISAR_SIMULATOR_UPLOAD_BLOBS:
+        azurite_containers: Dict[str, AzuriteStorageContainer] = (
+            armada.flotilla_storage.azurite_containers
+        )
+        uploader = BlobUploader(
+            connection_string_data=azurite_containers[
+                settings.SARA_RAW_STORAGE_CONTAINER
+            ].host_connection_string,
+            connection_string_metadata=azurite_containers[
+                settings.SARA_ANON_STORAGE_CONTAINER
+            ].host_connection_string,
+            storage_account=settings.AZURITE_ACCOUNT,
+        )
+    placements: List[Tuple[str, str]] = fleet_robot_placements(
+        fleet_size=fleet_size, seed_data=load_seed_dataset(settings.SEED_DATASET)
+    )
+    _ensure_installation_blob_containers(armada=armada, placements=placements)
+
+    with IsarSimulator(
+        publisher=MqttPublisher(
+            host=broker.broker.get_container_host_ip(),
+            port=broker.broker.get_exposed_port(broker.port),
+            username=settings.ISAR_SIMULATOR_MQTT_USERNAME,
+            password=settings.ISAR_MQTT_PASSWORD,
+            use_tls=settings.FLOTILLA_BROKER_USE_TLS,
+        ),
+        parameters=SimulationParameters.from_settings(
+            should_fail_normal_task=should_fail_normal_task
+        ),
+        uploader=uploader,
+        bind_host=settings.ISAR_SIMULATOR_BIND_HOST,
+        advertised_host=settings.ISAR_SIMULATOR_HOST,
+    ) as simulator:
+        with profile_phase("isar_simulator", "robot start"):
+            robots: Dict[str, SimulatedIsarRobot] = simulator.add_robots(
+                [
+                    (
+                        f"{settings.ISAR_ROBOT_NAME}-sim-{index}",
+                        namespaced_container_name(
+                            f"{settings.ISAR_ROBOT_NAME}-sim-{index}"
+                        ),
+                        installation_code,
+                    )
+                    for index, (installation_code, _) in enumerate(placements, start=1)
+                ]
+            )
+        with profile_phase("isar_simulator", "registration in flotilla"):
+            asyncio.run(
+                _setup_simulated_robots_in_flotilla(
+                    backend_url=armada.flotilla_backend.backend_url, robots=robots
+                )
+            )
+
+        armada.robots.update(robots)
+        logger.info(f"Simulated fleet of {fleet_size} robots is ready")
+        yield robots
+
+
+def _close_backend_client(client: BackendClient) -> None:
+    summary: str = client.latency_summary()
+    if summary:
+        logger.info(f"Request latencies for {client.base_url}:\n{summary}")
+    client.close()
+
+
+def _wait_for_ready_log_line(
+    container: StreamLoggingDockerContainer, pattern: str
+) -> None:
+    # The log line only tells when it is worth probing the API, the API probe that
+    # follows decides whether the service is ready
+    try:
+        wait_for_container_log(
+            container=container,
+            pattern=pattern,
+            timeout=settings.READY_LOG_LINE_TIMEOUT,
+        )
+    except (TimeoutError, RuntimeError) as e:
+        logger.warning(f"{e}, falling back to probing the API")
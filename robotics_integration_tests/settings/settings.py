@@ -14,15 +14,78 @@ class Settings(BaseSettings):
         default="3aa4a235-b6e2-48d5-9195-7fcf05b459b0"
     )
     INTEGRATION_TESTS_CLIENT_SECRET: Optional[str] = Field(default="")
+    # Cached access tokens are refreshed this many seconds before they expire
+    TOKEN_REFRESH_MARGIN: float = Field(default=300)
 
     # Keyvault configuration (using Flotilla service principle)
     KEYVAULT_NAME: str = Field(default="FlotillaTestsKv")
+    # "azure" for the vault above, "memory" or "file" to keep the secrets written by the
+    # harness local. Flotilla and Sara still read their secrets from the vault above, so
+    # it must be populated with the values of the armada in any case
+    KEYVAULT_BACKEND: str = Field(default="azure")
+    KEYVAULT_FILE_PATH: str = Field(default=".armada/secrets.json")
+    KEYVAULT_CACHE_TTL: float = Field(default=300)
 
     @computed_field
     @property
     def KEYVAULT_URI(self) -> str:
         return f"https://{self.KEYVAULT_NAME.lower()}.vault.azure.net"
 
+    # Armada lifecycle, "function" deploys a new armada for every test while "session"
+    # deploys it once and resets its state between tests
+    ARMADA_SCOPE: str = Field(default="function")
+    PARALLEL_STARTUP: bool = Field(default=True)
+    STARTUP_MAX_WORKERS: int = Field(default=8)
+    # When enabled, fixture setup and container lifecycle phases are timed, the
+    # breakdown is printed at the end of the session and written to STARTUP_PROFILE_PATH
+    STARTUP_PROFILE_ENABLED: bool = Field(default=False)
+    STARTUP_PROFILE_PATH: str = Field(default=".armada/reports/startup_profile.json")
+    # When enabled, images are pulled concurrently at the start of the session and
+    # pinned to the pulled image ids, optionally through local registry:2 pull-through
+    # caches that keep the layers in IMAGE_PULL_CACHE_DIRECTORY between runs. Off by
+    # default so that runs of the offline tests do not pull anything
+    IMAGE_PREPULL_ENABLED: bool = Field(default=False)
+    IMAGE_PULL_MAX_WORKERS: int = Field(default=6)
+    IMAGE_DIGESTS_PATH: str = Field(default=".armada/image_digests.json")
+    IMAGE_PULL_CACHE_ENABLED: bool = Field(default=False)
+    IMAGE_PULL_CACHE_IMAGE: str = Field(default="registry:2")
+    IMAGE_PULL_CACHE_DIRECTORY: str = Field(default=".armada/registry-cache")
+    # Suffix for container names, defaults to the pytest-xdist worker and a random id
+    ARMADA_NAMESPACE: str = Field(default="")
+
+    # Polling, waits back off exponentially with jitter between these intervals
+    POLL_MIN_INTERVAL: float = Field(default=0.1)
+    POLL_MAX_INTERVAL: float = Field(default=1.0)
+    POLL_BACKOFF_FACTOR: float = Field(default=2.0)
+    POLL_JITTER: float = Field(default=0.1)
+
+    # HTTP clients for the backends, only idempotent requests are retried
+    HTTP_CONNECT_TIMEOUT: float = Field(default=5)
+    HTTP_READ_TIMEOUT: float = Field(default=30)
+    HTTP_MAX_RETRIES: int = Field(default=3)
+    HTTP_RETRY_BACKOFF_FACTOR: float = Field(default=0.2)
+    HTTP_POOL_MAXSIZE: int = Field(default=16)
+
+    # Container logs, every line is written to a per container log file under
+    # CONTAINER_LOG_DIRECTORY, lines below CONTAINER_LOG_LEVEL are not forwarded to the
+    # test log and at most CONTAINER_LOG_RATE_LIMIT lines per second and container are
+    # forwarded, lines beyond that are counted and reported as suppressed
+    CONTAINER_LOG_LEVEL: str = Field(default="INFO")
+    CONTAINER_LOG_RATE_LIMIT: float = Field(default=200)
+    CONTAINER_LOG_DIRECTORY: str = Field(default=".armada/logs")
+    CONTAINER_LOG_MAX_LINE_BYTES: int = Field(default=65536)
+    CONTAINER_LOG_READ_BYTES: int = Field(default=65536)
+    # Log directories of older runs are removed at the start of a session
+    CONTAINER_LOG_KEEP_RUNS: int = Field(default=5)
+
+    # Readiness, log lines signalling that a service is about to accept requests
+    READY_LOG_LINE_TIMEOUT: int = Field(default=60)
+    FLOTILLA_BACKEND_READY_LOG_PATTERN: str = Field(default="Now listening on")
+    SARA_READY_LOG_PATTERN: str = Field(default="Now listening on")
+    AZURITE_READY_LOG_PATTERN: str = Field(
+        default="Azurite Blob service is successfully listening"
+    )
+
     # Flotilla Backend environment
     MQTT_HOST: str = Field(default="broker")
     FLOTILLA_MQTT_PASSWORD: Optional[str] = Field(default="")
@@ -47,6 +110,13 @@ class Settings(BaseSettings):
     FLOTILLA_BROKER_ALIAS: str = Field(default="broker")
     FLOTILLA_BROKER_IMAGE: str = Field(default="ghcr.io/equinor/flotilla-broker:latest")
     FLOTILLA_BROKER_PORT: int = Field(default=1883)
+    FLOTILLA_BROKER_USE_TLS: bool = Field(default=True)
+
+    # Status watcher following the ISAR status topics on the broker
+    STATUS_WATCHER_ENABLED: bool = Field(default=True)
+    STATUS_WATCHER_MQTT_USERNAME: str = Field(default="flotilla")
+    STATUS_WATCHER_FALLBACK_INTERVAL: float = Field(default=2.0)
+    STATUS_WATCHER_PROCESSING_DELAY: float = Field(default=0.2)
 
     # PostgreSQL Flotilla Database environment
     POSTGRESQL_IMAGE: str = Field(default="postgres:16")
@@ -54,6 +124,22 @@ class Settings(BaseSettings):
     DB_PASSWORD: str = Field(default="default_password")
     DB_ALIAS: str = Field(default="flotilla_postgres_database")
 
+    # Commit migrated and seeded databases as images keyed by the migrations runner
+    # image and the seed data, and start later databases from those images instead of
+    # migrating and seeding them again
+    DATABASE_SNAPSHOTS_ENABLED: bool = Field(default=True)
+
+    # Seeding, datasets with at least SEED_BULK_THRESHOLD entities are copied straight
+    # into the database instead of being posted to the backend
+    SEED_MAX_WORKERS: int = Field(default=8)
+    SEED_BULK_THRESHOLD: int = Field(default=500)
+
+    # Seed dataset name in the datasets folder, or a path to a dataset file
+    SEED_DATASET: str = Field(default="minimum")
+
+    # Authenticates the lookup of the latest release when a migrations ref is "latest"
+    GITHUB_TOKEN: str = Field(default="")
+
     GIT_REPOSITORY_FOR_MIGRATIONS: str = Field(default="equinor/flotilla")
     GIT_REPOSITORY_FOR_MIGRATIONS_REF: str = Field(default="v0.14.9")
     BACKEND_PROJECT_FILE_FOLDER: str = Field(default="backend/api")
@@ -92,6 +178,63 @@ class Settings(BaseSettings):
     ISAR_ROBOT_ALIAS: str = Field(default="isar_robot")
     ISAR_ROBOT_IMAGE: str = Field(default="ghcr.io/equinor/isar-robot:latest")
     ISAR_ROBOT_PORT: int = Field(default=3000)
+    # Robots started by the fleet fixture unless it is parametrized with a fleet size,
+    # the fleet tests start a container per robot and are skipped unless enabled
+    ISAR_FLEET_SIZE: int = Field(default=3)
+    ISAR_FLEET_TESTS_ENABLED: bool = Field(default=False)
+
+    # In-process ISAR simulator, robots speaking the ISAR MQTT topics and HTTP API from
+    # one asyncio event loop for fleets too large for robot containers. Flotilla reaches
+    # their APIs on ISAR_SIMULATOR_HOST, which resolves to the Docker host in Flotilla
+    ISAR_SIMULATOR_HOST: str = Field(default="host.docker.internal")
+    ISAR_SIMULATOR_BIND_HOST: str = Field(default="0.0.0.0")
+    ISAR_SIMULATOR_MQTT_USERNAME: str = Field(default="isar")
+    ISAR_SIMULATOR_MQTT_MAX_INFLIGHT: int = Field(default=1000)
+    ISAR_SIMULATOR_FLEET_SIZE: int = Field(default=100)
+    # The simulated fleet tests need Flotilla to reach ephemeral ports on the Docker
+    # host, which depends on its firewall, and are skipped unless enabled
+    ISAR_SIMULATOR_TESTS_ENABLED: bool = Field(default=False)
+    ISAR_SIMULATOR_TIME_TO_START: float = Field(default=2)
+    ISAR_SIMULATOR_TASK_FAILURE_PROBABILITY: float = Field(default=0.0)
+    ISAR_SIMULATOR_MISSION_COMPLETION_DELAY: float = Field(default=5)
+    ISAR_SIMULATOR_RETURN_HOME_DELAY: float = Field(default=1)
+    ISAR_SIMULATOR_UPLOAD_BLOBS: bool = Field(default=True)
+    ISAR_SIMULATOR_HEARTBEAT_INTERVAL: float = Field(default=1)
+    ISAR_SIMULATOR_ROBOT_INFO_INTERVAL: float = Field(default=5)
+
+    # Mission load test, schedules MISSION_LOAD_RATE missions per second over a fleet
+    # for MISSION_LOAD_DURATION seconds and writes a JSON report, skipped unless enabled
+    MISSION_LOAD_ENABLED: bool = Field(default=False)
+    MISSION_LOAD_RATE: float = Field(default=1.0)
+    MISSION_LOAD_DURATION: float = Field(default=60)
+    MISSION_LOAD_FLEET_SIZE: int = Field(default=3)
+    # Fleet of simulated robots for the load test against a fleet at scale, 0 skips it
+    MISSION_LOAD_SIMULATED_FLEET_SIZE: int = Field(default=500)
+    MISSION_LOAD_MISSION_ID: str = Field(default="986")
+    MISSION_LOAD_COMPLETION_TIMEOUT: float = Field(default=300)
+    MISSION_LOAD_STATUS_INTERVAL: float = Field(default=1.0)
+    MISSION_LOAD_REPORT_PATH: str = Field(default=".armada/reports/mission_load.json")
+
+    # Benchmarks, skipped unless enabled. A benchmark fails when a median exceeds its
+    # baseline by more than BENCHMARK_REGRESSION_THRESHOLD or has no baseline, the
+    # baselines default to benchmarks/baselines.json in the package
+    BENCHMARK_ENABLED: bool = Field(default=False)
+    BENCHMARK_REPETITIONS: int = Field(default=3)
+    BENCHMARK_REGRESSION_THRESHOLD: float = Field(default=0.25)
+    BENCHMARK_UPDATE_BASELINES: bool = Field(default=False)
+    BENCHMARK_BASELINES_PATH: str = Field(default="")
+    BENCHMARK_RESULTS_PATH: str = Field(default=".armada/reports/benchmarks.json")
+
+    # Docker stats of the armada containers sampled every RESOURCE_TELEMETRY_INTERVAL
+    # seconds during a test and written per test to RESOURCE_TELEMETRY_DIRECTORY
+    RESOURCE_TELEMETRY_ENABLED: bool = Field(default=False)
+    RESOURCE_TELEMETRY_INTERVAL: float = Field(default=2.0)
+    RESOURCE_TELEMETRY_DIRECTORY: str = Field(default=".armada/telemetry")
+
+    # When enabled, status transitions of mission runs, tasks and robots seen by a test
+    # are written as a JSON and CSV timeline per test that observed a mission run
+    MISSION_TIMELINE_ENABLED: bool = Field(default=False)
+    MISSION_TIMELINE_DIRECTORY: str = Field(default=".armada/timelines")
 
     # SARA environment and configuration
     SARA_RAW_STORAGE_CONTAINER: str = Field(default="sara-raw")
@@ -119,6 +262,11 @@ class Settings(BaseSettings):
             self.SARA_VIS_STORAGE_CONTAINER,
         ]
 
+    BLOB_CONTAINERS: List[str] = Field(default=["hua", "kaa", "nls", "test"])
+    # Upload waits list this many blobs per page and pages per poll
+    BLOB_LIST_PAGE_SIZE: int = Field(default=500)
+    BLOB_LIST_MAX_PAGES_PER_REFRESH: int = Field(default=10)
+
     AZURITE_ACCOUNT: str = Field(default="devstoreaccount1")
     AZURITE_KEY: str = Field(
         default="Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw=="
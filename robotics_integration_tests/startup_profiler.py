@@ -0,0 +1,90 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Tuple
+
+import pytest
+
+from robotics_integration_tests.settings.settings import settings
+from robotics_integration_tests.utilities.profiling import (
+    PhaseTiming,
+    record_phase,
+    recorded_phases,
+)
+
+
+class StartupProfiler:
+    """Pytest plugin reporting where the time of fixture setup goes.
+
+    The setup of every fixture is timed, next to the container lifecycle phases
+    recorded with profile_phase, such as image pulls, container starts, port
+    mappings, migrations, warm-up and seeding. At the end of the session a breakdown
+    sorted by total time is printed and written as JSON to STARTUP_PROFILE_PATH, one
+    file per pytest-xdist worker.
+    """
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(
+        self, fixturedef: pytest.FixtureDef, request: pytest.FixtureRequest
+    ) -> Generator[None, Any, None]:
+        # Fixtures the fixture depends on are set up before this hook is called, so the
+        # time is the setup of the fixture itself
+        started_at: float = time.monotonic()
+        yield
+        record_phase(
+            component=f"fixture ({fixturedef.scope})",
+            phase=fixturedef.argname,
+            started_at=started_at,
+            duration=time.monotonic() - started_at,
+        )
+
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        breakdown: List[Dict[str, Any]] = _breakdown(recorded_phases())
+        if not breakdown:
+            return
+        terminalreporter.write_sep("-", "startup profile")
+        for entry in breakdown:
+            terminalreporter.write_line(
+                f"{entry['total']:9.2f}s {entry['count']:4d}x  "
+                f"{entry['component']}: {entry['phase']}"
+            )
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        phases: List[PhaseTiming] = recorded_phases()
+        if not phases:
+            return
+        path: Path = Path(settings.STARTUP_PROFILE_PATH)
+        worker: str = os.environ.get("PYTEST_XDIST_WORKER", "")
+        if worker:
+            path = path.with_name(f"{path.stem}-{worker}{path.suffix}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(
+                {
+                    "breakdown": _breakdown(phases),
+                    "phases": [vars(phase) for phase in phases],
+                },
+                indent=2,
+            )
+        )
+
+
+def _breakdown(phases: List[PhaseTiming]) -> List[Dict[str, Any]]:
+    totals: Dict[Tuple[str, str], List[float]] = {}
+    for phase in phases:
+        totals.setdefault((phase.component, phase.phase), []).append(phase.duration)
+    return sorted(
+        (
+            {
+                "component": component,
+                "phase": phase,
+                "count": len(durations),
+                "total": sum(durations),
+                "max": max(durations),
+            }
+            for (component, phase), durations in totals.items()
+        ),
+        key=lambda entry: entry["total"],
+        reverse=True,
+    )
@@ -0,0 +1,162 @@
+from contextlib import ExitStack
+from typing import Dict, List
+
+import pytest
+from testcontainers.core.network import Network
+
+from robotics_integration_tests.armada import Armada
+from robotics_integration_tests.deployment import deploy_armada_without_robots
+from robotics_integration_tests.settings.settings import settings
+from robotics_integration_tests.utilities.benchmarking import (
+    BenchmarkRecorder,
+    BenchmarkSuite,
+)
+from robotics_integration_tests.utilities.flotilla_backend_api import (
+    pause_mission,
+    resume_mission,
+    schedule_echo_mission,
+    wait_for_mission_run_status,
+    wait_for_robot_status,
+    wait_for_second_task_status_of_mission_run,
+)
+from robotics_integration_tests.utilities.keyvault import Keyvault
+
+pytestmark = pytest.mark.skipif(
+    not settings.BENCHMARK_ENABLED,
+    reason="Set BENCHMARK_ENABLED to run the benchmarks",
+)
+
+echo_mission_id: str = "986"
+
+
+def _assert_no_regressions(
+    benchmark_suite: BenchmarkSuite, recorder: BenchmarkRecorder
+) -> None:
+    regressions: List[str] = benchmark_suite.record(recorder.metrics())
+    assert not regressions, "\n".join(regressions)
+
+
+def test_bring_up_benchmark(
+    keyvault: Keyvault, network: Network, benchmark_suite: BenchmarkSuite
+) -> None:
+    if settings.ARMADA_SCOPE == "session":
+        pytest.skip("The session armada would clash with the armadas deployed here")
+    recorder: BenchmarkRecorder = BenchmarkRecorder(
+        "bring-up", repetitions=settings.BENCHMARK_REPETITIONS
+    )
+    for _ in recorder.runs():
+        with ExitStack() as stack:
+            with recorder.timed():
+                stack.enter_context(
+                    deploy_armada_without_robots(network=network, keyvault=keyvault)
+                )
+
+    _assert_no_regressions(benchmark_suite, recorder)
+
+
+def test_seeding_benchmark(
+    clean_armada: Armada, benchmark_suite: BenchmarkSuite
+) -> None:
+    recorder: BenchmarkRecorder = BenchmarkRecorder(
+        "seeding", repetitions=settings.BENCHMARK_REPETITIONS
+    )
+    for _ in recorder.runs():
+        clean_armada.reset_databases()
+        with recorder.timed():
+            clean_armada.seed()
+
+    _assert_no_regressions(benchmark_suite, recorder)
+
+
+def test_single_mission_benchmark(
+    armada_with_single_successful_robot: Armada, benchmark_suite: BenchmarkSuite
+) -> None:
+    armada: Armada = armada_with_single_successful_robot
+    robot_name, robot = next(iter(armada.robots.items()))
+    recorder: BenchmarkRecorder = BenchmarkRecorder(
+        "single mission round trip", repetitions=settings.BENCHMARK_REPETITIONS
+    )
+    for _ in recorder.runs():
+        with recorder.timed():
+            mission_run: Dict = schedule_echo_mission(
+                backend_url=armada.flotilla_backend.backend_url,
+                robot_id=robot.robot_id,
+                mission_id=echo_mission_id,
+                installation_code=robot.installation_code,
+            )
+            wait_for_mission_run_status(
+                backend_url=armada.flotilla_backend.backend_url,
+                mission_run_id=mission_run.get("id"),
+                expected_status="Successful",
+                status_watcher=armada.status_watcher,
+            )
+            wait_for_robot_status(
+                backend_url=armada.flotilla_backend.backend_url,
+                robot_name=robot_name,
+                expected_status="Home",
+                status_watcher=armada.status_watcher,
+            )
+
+    _assert_no_regressions(benchmark_suite, recorder)
+
+
+def test_pause_resume_benchmark(
+    armada_with_single_successful_robot: Armada, benchmark_suite: BenchmarkSuite
+) -> None:
+    armada: Armada = armada_with_single_successful_robot
+    robot_name, robot = next(iter(armada.robots.items()))
+    recorder: BenchmarkRecorder = BenchmarkRecorder(
+        "pause resume round trip", repetitions=settings.BENCHMARK_REPETITIONS
+    )
+    for _ in recorder.runs():
+        mission_run: Dict = schedule_echo_mission(
+            backend_url=armada.flotilla_backend.backend_url,
+            robot_id=robot.robot_id,
+            mission_id=echo_mission_id,
+            installation_code=robot.installation_code,
+        )
+        mission_run_id: str = mission_run.get("id")
+        wait_for_second_task_status_of_mission_run(
+            backend_url=armada.flotilla_backend.backend_url,
+            mission_run_id=mission_run_id,
+            expected_status="InProgress",
+            status_watcher=armada.status_watcher,
+        )
+
+        # From the pause request until the resumed mission run is Ongoing again
+        with recorder.timed():
+            pause_mission(
+                backend_url=armada.flotilla_backend.backend_url,
+                robot_id=robot.robot_id,
+            )
+            wait_for_mission_run_status(
+                backend_url=armada.flotilla_backend.backend_url,
+                mission_run_id=mission_run_id,
+                expected_status="Paused",
+                status_watcher=armada.status_watcher,
+            )
+            resume_mission(
+                backend_url=armada.flotilla_backend.backend_url,
+                robot_id=robot.robot_id,
+            )
+            wait_for_mission_run_status(
+                backend_url=armada.flotilla_backend.backend_url,
+                mission_run_id=mission_run_id,
+                expected_status="Ongoing",
+                status_watcher=armada.status_watcher,
+            )
+
+        wait_for_mission_run_status(
+            backend_url=armada.flotilla_backend.backend_url,
+            mission_run_id=mission_run_id,
+            expected_status="Successful",
+            status_watcher=armada.status_watcher,
+        )
+        wait_for_robot_status(
+            backend_url=armada.flotilla_backend.backend_url,
+            robot_name=robot_name,
+            expected_status="Home",
+            status_watcher=armada.status_watcher,
+        )
+
+    _assert_no_regressions(benchmark_suite, recorder)
@@ -0,0 +1,99 @@
+from typing import Iterator, List, Optional
+
+from robotics_integration_tests.utilities.blob_storage import BlobUploadWatcher
+
+connection_string: str = (
+    "DefaultEndpointsProtocol=http;AccountName=devstoreaccount1;AccountKey=a2V5;"
+    "BlobEndpoint=http://127.0.0.1:10000/devstoreaccount1;"
+)
+
+
+class FakePages:
+    def __init__(self, pages: List[List[str]], start: int) -> None:
+        self._pages: Iterator[List[str]] = iter(pages[start:])
+        self._index: int = start
+        self._page_count: int = len(pages)
+        self.continuation_token: Optional[str] = None
+
+    def __iter__(self) -> "FakePages":
+        return self
+
+    def __next__(self) -> List[str]:
+        page: List[str] = next(self._pages)
+        self._index += 1
+        self.continuation_token = (
+            str(self._index) if self._index < self._page_count else None
+        )
+        return page
+
+
+class FakeContainerClient:
+    """Lists the names under a prefix in pages, like the Azure container client."""
+
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self.listed_from: List[Optional[str]] = []
+
+    def list_blob_names(self, name_starts_with: Optional[str], results_per_page: int):
+        names: List[str] = sorted(
+            name for name in self.names if name.startswith(name_starts_with or "")
+        )
+        pages: List[List[str]] = [
+            names[index : index + results_per_page]
+            for index in range(0, len(names), results_per_page)
+        ]
+        client: FakeContainerClient = self
+
+        class Listing:
+            def by_page(self, continuation_token: Optional[str]) -> FakePages:
+                client.listed_from.append(continuation_token)
+                return FakePages(pages, int(continuation_token or 0))
+
+        return Listing()
+
+
+def _watcher(container_client: FakeContainerClient, prefix: str) -> BlobUploadWatcher:
+    watcher: BlobUploadWatcher = BlobUploadWatcher(
+        connection_string=connection_string,
+        container_name="hua",
+        prefix=prefix,
+        page_size=2,
+        max_pages_per_refresh=2,
+    )
+    watcher.container_client = container_client
+    return watcher
+
+
+def _blob_name(date: str, mission_id: str, tag: str) -> str:
+    # The folder and file layout of ISAR uploads
+    return f"{date}__HUA__echo__{mission_id}/{tag}__Image__description__120000.jpg"
+
+
+def test_watcher_resumes_listing_and_reports_missing_missions() -> None:
+    container_client: FakeContainerClient = FakeContainerClient()
+    container_client.names = [
+        _blob_name("2026-10-17", "mission-a", "old"),
+        *[_blob_name("2026-10-18", "mission-a", f"tag-{index}") for index in range(3)],
+        *[_blob_name("2026-10-18", "mission-b", f"tag-{index}") for index in range(2)],
+    ]
+    watcher: BlobUploadWatcher = _watcher(container_client, prefix="2026-10-18__")
+
+    assert watcher.refresh() == [
+        *[_blob_name("2026-10-18", "mission-a", f"tag-{index}") for index in range(3)],
+        _blob_name("2026-10-18", "mission-b", "tag-0"),
+    ]
+    assert watcher.missing(["mission-a", "mission-b", "mission-c"]) == ["mission-c"]
+    assert watcher.count_with_keys(["mission-b"]) == 1
+
+    # The next refresh resumes from the third page instead of listing the prefix again
+    assert watcher.refresh() == [_blob_name("2026-10-18", "mission-b", "tag-1")]
+    assert container_client.listed_from == [None, "2"]
+
+    # A finished pass starts over and only returns names that were not seen before
+    container_client.names.append(_blob_name("2026-10-18", "mission-c", "tag-0"))
+    assert watcher.refresh() == []
+    assert watcher.refresh() == [_blob_name("2026-10-18", "mission-c", "tag-0")]
+    assert container_client.listed_from[2:] == [None, "2"]
+    assert watcher.count == 6
+    assert watcher.missing(["mission-a", "mission-b", "mission-c"]) == []
+    assert watcher.count_with_keys(["mission-a", "mission-b"]) == 5
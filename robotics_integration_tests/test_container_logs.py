@@ -0,0 +1,138 @@
+import os
+import time
+from pathlib import Path
+from threading import Thread
+from typing import List
+
+import pytest
+from loguru import logger
+
+from robotics_integration_tests.custom_containers.log_collector import (
+    _LogSource,
+    _RateLimiter,
+)
+from robotics_integration_tests.custom_containers.log_store import (
+    ContainerLogStore,
+    LogMatch,
+    prune_log_directories,
+)
+from robotics_integration_tests.settings.settings import settings
+
+
+class FakeContainer:
+    """Receives the lines of a log source like StreamLoggingDockerContainer."""
+
+    def __init__(self, log_level: str = "INFO") -> None:
+        self._name: str = "container"
+        self.log_level: str = log_level
+        self.lines: List[str] = []
+
+    def append_log_line(self, line: str) -> None:
+        self.lines.append(line)
+
+
+def _frame(payload: bytes, stream: int = 1) -> bytes:
+    return bytes([stream, 0, 0, 0]) + len(payload).to_bytes(4, "big") + payload
+
+
+def test_log_store_finds_lines_by_pattern_and_time(tmp_path: Path) -> None:
+    store: ContainerLogStore = ContainerLogStore(directory=tmp_path, name="backend")
+    assert store.first_match("ready") is None
+
+    store.append("starting", timestamp=10)
+    store.append("listening on\nport 8000", timestamp=20)
+    store.append("ready", timestamp=30)
+
+    match: LogMatch = store.first_match(r"port \d+")
+    assert (match.line_number, match.timestamp) == (1, 20)
+    assert match.text == "listening on port 8000"
+    assert store.first_match("starting", after=15) is None
+    assert store.wait_for_log("ready", timeout=0).line_number == 2
+    assert store.lines(1) == ["listening on port 8000", "ready"]
+    assert (tmp_path / "backend.log").read_text().count("\n") == 3
+
+
+def test_log_store_waiters_see_appended_lines_and_closing(tmp_path: Path) -> None:
+    store: ContainerLogStore = ContainerLogStore(directory=tmp_path, name="backend")
+    store.append("ready")
+    started_at: float = time.time()
+
+    def append_lines() -> None:
+        time.sleep(0.1)
+        for index in range(1000):
+            store.append(f"line {index}")
+        store.append("ready again")
+
+    appender: Thread = Thread(target=append_lines)
+    appender.start()
+    match: LogMatch = store.wait_for_log("ready", timeout=5, after=started_at)
+    appender.join()
+    assert (match.line_number, match.text) == (1001, "ready again")
+
+    with pytest.raises(TimeoutError):
+        store.wait_for_log("never", timeout=0.1)
+    store.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        store.wait_for_log("never", timeout=5)
+    assert store.first_match("line 999").line_number == 1000
+
+
+def test_old_log_directories_are_pruned(tmp_path: Path) -> None:
+    for index in range(4):
+        run_directory: Path = tmp_path / f"run-{index}"
+        run_directory.mkdir()
+        os.utime(run_directory, (index, index))
+
+    prune_log_directories(directory=tmp_path, keep=2)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["run-2", "run-3"]
+    prune_log_directories(directory=tmp_path / "missing", keep=2)
+
+
+def test_log_source_splits_frames_into_lines() -> None:
+    container: FakeContainer = FakeContainer()
+    source: _LogSource = _LogSource(container, sock=None, multiplexed=True)
+    data: bytes = _frame(b"first line\nsecond ") + _frame(b"line\nthird", stream=2)
+
+    # Frames and lines are split over arbitrary reads
+    for index in range(0, len(data), 5):
+        source.feed(data[index : index + 5])
+    assert container.lines == ["first line", "second line"]
+    source.flush()
+    assert container.lines == ["first line", "second line", "third"]
+
+
+def test_log_source_bounds_lines_without_newline(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "CONTAINER_LOG_MAX_LINE_BYTES", 8)
+    container: FakeContainer = FakeContainer()
+    source: _LogSource = _LogSource(container, sock=None, multiplexed=False)
+    source.feed(b"0123456789")
+    source.feed(b"ab\n")
+    assert container.lines == ["0123456789", "ab"]
+
+
+def test_log_source_rate_limits_forwarded_lines() -> None:
+    container: FakeContainer = FakeContainer(log_level="INFO")
+    source: _LogSource = _LogSource(container, sock=None, multiplexed=False)
+    source.rate_limiter = _RateLimiter(rate=2)
+    messages: List[str] = []
+    handler_id: int = logger.add(lambda message: messages.append(message.strip()))
+    try:
+        source.feed(b"DEBUG hidden\n")
+        source.feed(b"".join(f"INFO line {index}\n".encode() for index in range(5)))
+        source.rate_limiter.tokens = 1
+        source.feed(b"INFO after the burst\n")
+    finally:
+        logger.remove(handler_id)
+
+    # Every line is stored, only lines at or above the level and within the rate limit
+    # are forwarded
+    assert len(container.lines) == 7
+    forwarded: List[str] = [message.split(" - ", 1)[1] for message in messages]
+    assert forwarded == [
+        "container: INFO line 0",
+        "container: INFO line 1",
+        "container: 3 log lines suppressed by the rate limit",
+        "container: INFO after the burst",
+    ]
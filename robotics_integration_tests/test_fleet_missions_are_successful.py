@@ -0,0 +1,70 @@
+import asyncio
+from typing import Dict, List
+
+import pytest
+from loguru import logger
+
+from robotics_integration_tests.armada import Armada
+from robotics_integration_tests.settings.settings import settings
+from robotics_integration_tests.utilities.flotilla_backend_async_api import (
+    AsyncFlotillaBackendClient,
+    schedule_missions,
+    wait_for_mission_runs_status,
+    wait_for_robots_status,
+)
+
+
+async def _run_echo_mission_on_every_robot(armada: Armada) -> None:
+    echo_mission_id: str = "986"
+    async with AsyncFlotillaBackendClient(
+        armada.flotilla_backend.backend_url
+    ) as client:
+        mission_runs: List[Dict] = await schedule_missions(
+            client,
+            [
+                {
+                    "robot_id": robot.robot_id,
+                    "mission_id": echo_mission_id,
+                    "installation_code": robot.installation_code,
+                }
+                for robot in armada.robots.values()
+            ],
+        )
+        logger.info(
+            f"Scheduled echo mission {echo_mission_id} on {len(mission_runs)} robots"
+        )
+
+        await wait_for_mission_runs_status(
+            client,
+            mission_run_ids=[mission_run.get("id") for mission_run in mission_runs],
+            expected_status="Successful",
+            timeout=120,
+        )
+        await wait_for_robots_status(
+            client,
+            robot_ids=[robot.robot_id for robot in armada.robots.values()],
+            expected_status="Home",
+        )
+
+
+@pytest.mark.skipif(
+    not settings.ISAR_FLEET_TESTS_ENABLED,
+    reason="Set ISAR_FLEET_TESTS_ENABLED to run the fleet tests",
+)
+@pytest.mark.parametrize("armada_with_fleet", [6], indirect=True)
+def test_echo_missions_on_a_fleet_are_successful(armada_with_fleet: Armada) -> None:
+    armada: Armada = armada_with_fleet
+    assert len({robot.installation_code for robot in armada.robots.values()}) > 1
+
+    asyncio.run(_run_echo_mission_on_every_robot(armada))
+
+
+@pytest.mark.skipif(
+    not settings.ISAR_SIMULATOR_TESTS_ENABLED,
+    reason="Set ISAR_SIMULATOR_TESTS_ENABLED to run the simulated fleet tests",
+)
+@pytest.mark.parametrize("armada_with_simulated_fleet", [200], indirect=True)
+def test_echo_missions_on_a_simulated_fleet_are_successful(
+    armada_with_simulated_fleet: Armada,
+) -> None:
+    asyncio.run(_run_echo_mission_on_every_robot(armada_with_simulated_fleet))
@@ -0,0 +1,167 @@
+import time
+from threading import Condition
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+from robotics_integration_tests.utilities.isar_simulator import (
+    IsarSimulator,
+    SimulatedIsarRobot,
+    SimulationParameters,
+)
+
+
+class RecordingPublisher:
+    """Stand-in for the broker that records every published status."""
+
+    def __init__(self) -> None:
+        self.messages: List[Tuple[str, Dict[str, Any]]] = []
+        self._condition: Condition = Condition()
+
+    def publish(self, topic: str, payload: Dict[str, Any], qos: int = 1) -> None:
+        with self._condition:
+            self.messages.append((topic, payload))
+            self._condition.notify_all()
+
+    def statuses(self, topic: str) -> List[str]:
+        with self._condition:
+            return [
+                payload["status"] for name, payload in self.messages if name == topic
+            ]
+
+    def wait_for_status(self, topic: str, status: str, timeout: float = 5) -> None:
+        with self._condition:
+            assert self._condition.wait_for(
+                lambda: status in self.statuses(topic), timeout=timeout
+            ), f"No {status} status on {topic}"
+
+    def count(self, *topics: str) -> int:
+        with self._condition:
+            return sum(1 for name, _ in self.messages if name in topics)
+
+
+def _parameters(
+    task_failure_probability: float = 0.0, mission_completion_delay: float = 0.3
+) -> SimulationParameters:
+    return SimulationParameters(
+        time_to_start=0.1,
+        task_failure_probability=task_failure_probability,
+        mission_completion_delay=mission_completion_delay,
+        return_home_delay=0.1,
+        upload_blobs=False,
+        heartbeat_interval=60,
+        robot_info_interval=60,
+    )
+
+
+def _wait_for_status(robot: SimulatedIsarRobot, status: str, timeout: float) -> None:
+    deadline: float = time.monotonic() + timeout
+    while robot.status != status:
+        assert time.monotonic() < deadline, f"Robot is still {robot.status}"
+        time.sleep(0.02)
+
+
+def _start_mission(robot: SimulatedIsarRobot, task_count: int) -> Dict:
+    response: httpx.Response = httpx.post(
+        f"http://127.0.0.1:{robot.port}/schedule/start-mission",
+        json={
+            "mission_definition": {
+                "id": "mission-1",
+                "tasks": [{"id": f"task-{index}"} for index in range(task_count)],
+            }
+        },
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def test_simulated_fleet_runs_missions_and_returns_home() -> None:
+    publisher: RecordingPublisher = RecordingPublisher()
+    with IsarSimulator(
+        publisher=publisher,
+        parameters=_parameters(task_failure_probability=1.0),
+        bind_host="127.0.0.1",
+    ) as simulator:
+        robots: Dict[str, SimulatedIsarRobot] = simulator.add_robots(
+            [(f"robot-{index}", f"isar-{index}", "HUA") for index in range(50)]
+        )
+        assert len({robot.port for robot in robots.values()}) == 50
+
+        robot: SimulatedIsarRobot = robots["robot-7"]
+        started: Dict = _start_mission(robot, task_count=3)
+        assert [task["id"] for task in started["tasks"]] == [
+            "task-0",
+            "task-1",
+            "task-2",
+        ]
+        # A busy robot rejects another mission like ISAR does
+        assert (
+            httpx.post(
+                f"http://127.0.0.1:{robot.port}/schedule/start-mission", json={}
+            ).status_code
+            == 409
+        )
+
+        _wait_for_status(robot, "home", timeout=5)
+
+    assert publisher.statuses("isar/isar-7/mission") == [
+        "not_started",
+        "in_progress",
+        "failed",
+    ]
+    assert publisher.statuses("isar/isar-7/task").count("failed") == 3
+    assert publisher.statuses("isar/isar-7/status") == [
+        "home",
+        "busy",
+        "returning_home",
+        "home",
+        "offline",
+    ]
+
+
+def test_paused_simulated_mission_does_not_progress_until_resumed() -> None:
+    publisher: RecordingPublisher = RecordingPublisher()
+    with IsarSimulator(
+        publisher=publisher,
+        parameters=_parameters(mission_completion_delay=2),
+        bind_host="127.0.0.1",
+    ) as simulator:
+        robot: SimulatedIsarRobot = simulator.add_robots([("robot", "isar", "HUA")])[
+            "robot"
+        ]
+        _start_mission(robot, task_count=1)
+        # The only task runs for 2 seconds, pausing right after it started leaves
+        # ample time for the pause request to arrive
+        publisher.wait_for_status("isar/isar/task", "in_progress")
+        task_started_at: float = time.monotonic()
+
+        with httpx.Client(base_url=f"http://127.0.0.1:{robot.port}") as client:
+            paused: httpx.Response = client.post("/schedule/pause-mission")
+            assert paused.status_code == 200, paused.text
+            assert paused.json()["mission_status"] == "paused"
+
+            progress_messages: int = publisher.count(
+                "isar/isar/task", "isar/isar/mission"
+            )
+            time.sleep(2.5)
+            assert (
+                publisher.count("isar/isar/task", "isar/isar/mission")
+                == progress_messages
+            )
+            assert robot.status == "paused"
+
+            resumed: httpx.Response = client.post("/schedule/resume-mission")
+            assert resumed.status_code == 200, resumed.text
+            assert resumed.json()["mission_status"] == "in_progress"
+
+        publisher.wait_for_status("isar/isar/mission", "successful")
+        # Time spent paused does not count towards the 2 seconds of the task
+        assert time.monotonic() - task_started_at >= 2 + 2.5 - 0.1
+
+    assert publisher.statuses("isar/isar/mission") == [
+        "not_started",
+        "in_progress",
+        "paused",
+        "in_progress",
+        "successful",
+    ]
@@ -0,0 +1,74 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+from loguru import logger
+
+from robotics_integration_tests.armada import Armada
+from robotics_integration_tests.settings.settings import settings
+from robotics_integration_tests.utilities.flotilla_backend_async_api import (
+    AsyncFlotillaBackendClient,
+)
+from robotics_integration_tests.utilities.mission_load import (
+    MissionLoadReport,
+    run_mission_load,
+)
+
+
+async def _run_mission_load(armada: Armada) -> MissionLoadReport:
+    async with AsyncFlotillaBackendClient(
+        armada.flotilla_backend.backend_url
+    ) as client:
+        return await run_mission_load(
+            client=client,
+            robots=list(armada.robots.values()),
+            rate=settings.MISSION_LOAD_RATE,
+            duration=settings.MISSION_LOAD_DURATION,
+            mission_id=settings.MISSION_LOAD_MISSION_ID,
+            completion_timeout=settings.MISSION_LOAD_COMPLETION_TIMEOUT,
+            status_interval=settings.MISSION_LOAD_STATUS_INTERVAL,
+        )
+
+
+@pytest.mark.skipif(
+    not settings.MISSION_LOAD_ENABLED,
+    reason="Set MISSION_LOAD_ENABLED to run the mission load test",
+)
+@pytest.mark.parametrize(
+    "armada_with_fleet", [settings.MISSION_LOAD_FLEET_SIZE], indirect=True
+)
+def test_mission_load(armada_with_fleet: Armada) -> None:
+    report: MissionLoadReport = asyncio.run(_run_mission_load(armada_with_fleet))
+    report.write(settings.MISSION_LOAD_REPORT_PATH)
+    logger.info(f"Mission load report:\n{json.dumps(report.to_dict(), indent=2)}")
+
+    assert report.rejected == 0, f"{report.rejected} missions were rejected"
+    assert report.unfinished == 0, f"{report.unfinished} missions did not finish"
+    assert report.count("Failed") == 0, f"{report.count('Failed')} missions failed"
+
+
+@pytest.mark.skipif(
+    not settings.MISSION_LOAD_ENABLED
+    or not settings.ISAR_SIMULATOR_TESTS_ENABLED
+    or not settings.MISSION_LOAD_SIMULATED_FLEET_SIZE,
+    reason="Set MISSION_LOAD_ENABLED, ISAR_SIMULATOR_TESTS_ENABLED and MISSION_LOAD_SIMULATED_FLEET_SIZE to run the mission load test on a simulated fleet",
+)
+@pytest.mark.parametrize(
+    "armada_with_simulated_fleet",
+    [settings.MISSION_LOAD_SIMULATED_FLEET_SIZE],
+    indirect=True,
+)
+def test_mission_load_on_simulated_fleet(armada_with_simulated_fleet: Armada) -> None:
+    report: MissionLoadReport = asyncio.run(
+        _run_mission_load(armada_with_simulated_fleet)
+    )
+    report.write(
+        str(Path(settings.MISSION_LOAD_REPORT_PATH).with_suffix(".simulated.json"))
+    )
+    logger.info(
+        f"Mission load report on a simulated fleet:\n{json.dumps(report.to_dict(), indent=2)}"
+    )
+
+    assert report.rejected == 0, f"{report.rejected} missions were rejected"
+    assert report.unfinished == 0, f"{report.unfinished} missions did not finish"
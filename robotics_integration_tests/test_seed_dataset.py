@@ -0,0 +1,51 @@
+from robotics_integration_tests.utilities.seed_dataset import (
+    SeedData,
+    generate_seed_data,
+    load_seed_dataset,
+)
+
+
+def test_minimum_seed_dataset_matches_blob_containers() -> None:
+    seed_data: SeedData = load_seed_dataset("minimum")
+
+    assert seed_data.entity_counts() == {
+        "installations": 3,
+        "plants": 3,
+        "inspectionAreas": 3,
+        "access-roles": 3,
+    }
+    assert [code for code, _ in seed_data.installations] == ["HUA", "KAA", "NLS"]
+
+
+def test_generated_seed_data_is_deterministic_and_consistent() -> None:
+    seed_data: SeedData = generate_seed_data(
+        installations=50,
+        plants_per_installation=2,
+        inspection_areas_per_plant=3,
+        access_levels=["READ_ONLY", "USER"],
+        seed=7,
+    )
+    same_seed_data: SeedData = generate_seed_data(
+        installations=50,
+        plants_per_installation=2,
+        inspection_areas_per_plant=3,
+        access_levels=["READ_ONLY", "USER"],
+        seed=7,
+    )
+
+    assert seed_data.inspection_areas == same_seed_data.inspection_areas
+    assert seed_data.entity_counts() == {
+        "installations": 50,
+        "plants": 100,
+        "inspectionAreas": 300,
+        "access-roles": 100,
+    }
+
+    installation_codes = {code for code, _ in seed_data.installations}
+    plant_codes = {plant_code for plant_code, _, _ in seed_data.plants}
+    assert len(installation_codes) == 50
+    assert all(code in installation_codes for _, code, _ in seed_data.plants)
+    assert all(
+        code in installation_codes and plant_code in plant_codes
+        for code, plant_code, _, _ in seed_data.inspection_areas
+    )
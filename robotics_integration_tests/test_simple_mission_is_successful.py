@@ -37,6 +37,7 @@ def test_simple_mission_with_three_tags_is_successful(
         backend_url=armada.flotilla_backend.backend_url,
         mission_run_id=mission_run_id,
         expected_status="Successful",
+        status_watcher=armada.status_watcher,
     )
 
     wait_until_all_expected_files_uploaded(
@@ -45,10 +46,13 @@ def test_simple_mission_with_three_tags_is_successful(
             settings.SARA_RAW_STORAGE_CONTAINER
         ).host_connection_string,
         expected_file_count=len(mission_run.get("tasks")),
+        # ISAR uploads into a folder ending in the id of the mission run
+        expected_keys=[mission_run_id],
     )
 
     _ = wait_for_robot_status(
         backend_url=armada.flotilla_backend.backend_url,
         robot_name=robot_name,
         expected_status="Home",
+        status_watcher=armada.status_watcher,
     )
@@ -33,10 +33,12 @@ def test_simple_mission_with_three_tags_is_unsuccessful(
         backend_url=armada.flotilla_backend.backend_url,
         mission_run_id=mission_run_id,
         expected_status="Failed",
+        status_watcher=armada.status_watcher,
     )
 
     _ = wait_for_robot_status(
         backend_url=armada.flotilla_backend.backend_url,
         robot_name=robot_name,
         expected_status="Home",
+        status_watcher=armada.status_watcher,
     )
@@ -40,6 +40,7 @@ def test_simple_mission_pausing_and_resuming_successfully(
         backend_url=armada.flotilla_backend.backend_url,
         mission_run_id=mission_run_id,
         expected_status="InProgress",
+        status_watcher=armada.status_watcher,
     )
 
     pause_mission(
@@ -51,6 +52,7 @@ def test_simple_mission_pausing_and_resuming_successfully(
         backend_url=armada.flotilla_backend.backend_url,
         mission_run_id=mission_run_id,
         expected_status="Paused",
+        status_watcher=armada.status_watcher,
     )
 
     resume_mission(
@@ -62,12 +64,14 @@ def test_simple_mission_pausing_and_resuming_successfully(
         backend_url=armada.flotilla_backend.backend_url,
         mission_run_id=mission_run_id,
         expected_status="Ongoing",
+        status_watcher=armada.status_watcher,
     )
 
     _ = wait_for_mission_run_status(
         backend_url=armada.flotilla_backend.backend_url,
         mission_run_id=mission_run_id,
         expected_status="Successful",
+        status_watcher=armada.status_watcher,
     )
 
     wait_until_all_expected_files_uploaded(
@@ -76,10 +80,13 @@ def test_simple_mission_pausing_and_resuming_successfully(
             settings.SARA_RAW_STORAGE_CONTAINER
         ).host_connection_string,
         expected_file_count=len(mission_run.get("tasks")),
+        # ISAR uploads into a folder ending in the id of the mission run
+        expected_keys=[mission_run_id],
     )
 
     _ = wait_for_robot_status(
         backend_url=armada.flotilla_backend.backend_url,
         robot_name=robot_name,
         expected_status="Home",
+        status_watcher=armada.status_watcher,
     )
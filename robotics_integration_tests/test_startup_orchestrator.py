@@ -0,0 +1,143 @@
+from contextlib import ExitStack
+from threading import Event, Lock
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from robotics_integration_tests.utilities.startup_orchestrator import (
+    StartupOrchestrator,
+)
+
+
+class FakeComponent:
+    """Context manager standing in for a deployed component, records the order in
+    which components are entered and exited."""
+
+    def __init__(
+        self,
+        name: str,
+        events: List[str],
+        lock: Lock,
+        error: Optional[Exception] = None,
+        entered: Optional[Event] = None,
+        wait_for: Optional[Event] = None,
+    ) -> None:
+        self.name: str = name
+        self.events: List[str] = events
+        self.lock: Lock = lock
+        self.error: Optional[Exception] = error
+        self.entered: Optional[Event] = entered
+        self.wait_for: Optional[Event] = wait_for
+
+    def __enter__(self) -> str:
+        if self.wait_for is not None:
+            assert self.wait_for.wait(timeout=5)
+        if self.error is not None:
+            raise self.error
+        with self.lock:
+            self.events.append(f"enter {self.name}")
+        if self.entered is not None:
+            self.entered.set()
+        return self.name
+
+    def __exit__(self, *exc_info: Any) -> None:
+        with self.lock:
+            self.events.append(f"exit {self.name}")
+
+
+class FakeArmada:
+    def __init__(self) -> None:
+        self.events: List[str] = []
+        self.lock: Lock = Lock()
+        self.dependency_values: Dict[str, Dict[str, Any]] = {}
+
+    def component(self, name: str, **kwargs: Any):
+        def start(started: Dict[str, Any]) -> FakeComponent:
+            self.dependency_values[name] = dict(started)
+            return FakeComponent(name, self.events, self.lock, **kwargs)
+
+        return start
+
+
+def test_components_start_after_their_dependencies_and_stop_in_reverse() -> None:
+    armada: FakeArmada = FakeArmada()
+    orchestrator: StartupOrchestrator = StartupOrchestrator(max_workers=4)
+    orchestrator.add_component("database", armada.component("database"))
+    orchestrator.add_component("broker", armada.component("broker"))
+    orchestrator.add_component(
+        "backend",
+        armada.component("backend"),
+        dependencies=["database", "broker"],
+    )
+
+    with ExitStack() as stack:
+        started: Dict[str, Any] = orchestrator.start(stack)
+        assert started == {
+            "database": "database",
+            "broker": "broker",
+            "backend": "backend",
+        }
+        assert armada.dependency_values["backend"] == {
+            "database": "database",
+            "broker": "broker",
+        }
+        assert armada.events[-1] == "enter backend"
+
+    assert armada.events[3] == "exit backend"
+    assert sorted(armada.events[4:]) == ["exit broker", "exit database"]
+
+
+def test_independent_components_start_concurrently() -> None:
+    armada: FakeArmada = FakeArmada()
+    database_entered: Event = Event()
+    orchestrator: StartupOrchestrator = StartupOrchestrator(max_workers=2)
+    # The broker only enters once the database has entered, which deadlocks unless
+    # both start at the same time
+    orchestrator.add_component(
+        "database", armada.component("database", entered=database_entered)
+    )
+    orchestrator.add_component(
+        "broker", armada.component("broker", wait_for=database_entered)
+    )
+
+    with ExitStack() as stack:
+        assert set(orchestrator.start(stack)) == {"database", "broker"}
+
+
+def test_dependency_cycles_and_unknown_dependencies_are_rejected() -> None:
+    armada: FakeArmada = FakeArmada()
+    orchestrator: StartupOrchestrator = StartupOrchestrator()
+    orchestrator.add_component("a", armada.component("a"), dependencies=["b"])
+    orchestrator.add_component("b", armada.component("b"), dependencies=["a"])
+    with pytest.raises(ValueError, match="cycle"):
+        orchestrator.start(ExitStack())
+
+    orchestrator = StartupOrchestrator()
+    orchestrator.add_component("a", armada.component("a"), dependencies=["missing"])
+    with pytest.raises(ValueError, match="unknown component 'missing'"):
+        orchestrator.start(ExitStack())
+
+    with pytest.raises(ValueError, match="already been added"):
+        orchestrator.add_component("a", armada.component("a"))
+    assert armada.events == []
+
+
+def test_failed_component_is_reraised_and_started_components_are_stopped() -> None:
+    armada: FakeArmada = FakeArmada()
+    orchestrator: StartupOrchestrator = StartupOrchestrator(max_workers=1)
+    orchestrator.add_component("database", armada.component("database"))
+    orchestrator.add_component(
+        "backend",
+        armada.component("backend", error=RuntimeError("backend did not start")),
+        dependencies=["database"],
+    )
+    orchestrator.add_component(
+        "robot", armada.component("robot"), dependencies=["backend"]
+    )
+
+    with pytest.raises(RuntimeError, match="backend did not start"):
+        with ExitStack() as stack:
+            orchestrator.start(stack)
+
+    assert armada.events == ["enter database", "exit database"]
+    assert "robot" not in armada.dependency_values
@@ -0,0 +1,73 @@
+import asyncio
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import List
+
+from robotics_integration_tests.utilities.authentication import (
+    AccessToken,
+    TokenCache,
+)
+
+
+class LocalTokenIssuer:
+    """Stand-in for Entra ID that hands out opaque tokens and records every request."""
+
+    def __init__(self, expires_in: float = 3600, latency: float = 0.05) -> None:
+        self.expires_in: float = expires_in
+        self.latency: float = latency
+        self.requests: List[str] = []
+        self._lock: Lock = Lock()
+
+    def __call__(self, resource_client_id: str) -> AccessToken:
+        # Simulate the round trip to the token endpoint so concurrent callers overlap
+        time.sleep(self.latency)
+        with self._lock:
+            self.requests.append(resource_client_id)
+        return AccessToken(
+            token=f"{resource_client_id}-{uuid.uuid4().hex}",
+            expires_in=self.expires_in,
+        )
+
+
+def test_token_cache_acquires_one_token_per_resource_across_threads() -> None:
+    issuer: LocalTokenIssuer = LocalTokenIssuer()
+    token_cache: TokenCache = TokenCache(issuer=issuer, refresh_margin=60)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        tokens: List[str] = list(
+            executor.map(token_cache.get_token, ["flotilla", "sara"] * 50)
+        )
+
+    assert sorted(issuer.requests) == ["flotilla", "sara"]
+    assert len(set(tokens)) == 2
+
+
+def test_token_cache_refreshes_tokens_ahead_of_expiry() -> None:
+    issuer: LocalTokenIssuer = LocalTokenIssuer(expires_in=0.5, latency=0)
+    token_cache: TokenCache = TokenCache(issuer=issuer, refresh_margin=0.3)
+
+    first_token: str = token_cache.get_token("flotilla")
+    assert token_cache.get_token("flotilla") == first_token
+
+    # Still 0.3 seconds from expiry, but within the refresh margin
+    time.sleep(0.25)
+    assert token_cache.get_token("flotilla") != first_token
+    assert issuer.requests == ["flotilla", "flotilla"]
+
+
+def test_token_cache_is_shared_between_asyncio_tasks() -> None:
+    issuer: LocalTokenIssuer = LocalTokenIssuer()
+    token_cache: TokenCache = TokenCache(issuer=issuer, refresh_margin=60)
+
+    async def get_tokens() -> List[str]:
+        return await asyncio.gather(
+            *(token_cache.get_token_async("flotilla") for _ in range(20))
+        )
+
+    tokens: List[str] = asyncio.run(get_tokens())
+
+    assert issuer.requests == ["flotilla"]
+    assert len(set(tokens)) == 1
+    assert token_cache.get_token("flotilla") == tokens[0]
@@ -1,20 +1,115 @@
+import asyncio
+import time
+from threading import Lock
+from typing import Callable, Dict, Optional
+
 import msal
+from loguru import logger
 
 from robotics_integration_tests.settings.settings import settings
 
 
-def retrieve_access_token_for_integration_tests_app(resource_client_id: str) -> str:
-    app = msal.ConfidentialClientApplication(
-        client_id=settings.INTEGRATION_TESTS_CLIENT_ID,
-        client_credential=settings.INTEGRATION_TESTS_CLIENT_SECRET,
-        authority=f"https://login.microsoftonline.com/{settings.INTEGRATION_TESTS_TENANT_ID}",
-    )
-    result = app.acquire_token_for_client(
+class AccessToken:
+    def __init__(self, token: str, expires_in: float) -> None:
+        self.token: str = token
+        self.expires_at: float = time.monotonic() + expires_in
+
+    def is_valid(self, refresh_margin: float) -> bool:
+        return time.monotonic() < self.expires_at - refresh_margin
+
+
+# A token issuer acquires a token for a resource client id and returns it as an
+# AccessToken, which records when the token expires
+TokenIssuer = Callable[[str], AccessToken]
+
+
+_confidential_client_application: Optional[msal.ConfidentialClientApplication] = None
+_confidential_client_application_lock: Lock = Lock()
+
+
+def _get_confidential_client_application() -> msal.ConfidentialClientApplication:
+    global _confidential_client_application
+    with _confidential_client_application_lock:
+        if _confidential_client_application is None:
+            _confidential_client_application = msal.ConfidentialClientApplication(
+                client_id=settings.INTEGRATION_TESTS_CLIENT_ID,
+                client_credential=settings.INTEGRATION_TESTS_CLIENT_SECRET,
+                authority=f"https://login.microsoftonline.com/{settings.INTEGRATION_TESTS_TENANT_ID}",
+            )
+        return _confidential_client_application
+
+
+def acquire_token_for_integration_tests_app(resource_client_id: str) -> AccessToken:
+    result = _get_confidential_client_application().acquire_token_for_client(
         scopes=[f"api://{resource_client_id}/.default"]
     )
     if "access_token" in result:
-        return result["access_token"]
+        return AccessToken(
+            token=result["access_token"], expires_in=float(result["expires_in"])
+        )
     else:
         raise RuntimeError(
             f"Unable to retrieve access token for integration tests app: {result}"
         )
+
+
+class TokenCache:
+    """Process wide cache of access tokens keyed by resource client id.
+
+    Tokens are refreshed once they are within refresh_margin seconds of expiring, so a
+    request never goes out with a token that expires in flight. Refreshes hold a lock
+    per resource, concurrent callers for the same resource wait for a single refresh
+    while callers for other resources are not blocked.
+    """
+
+    def __init__(
+        self, issuer: TokenIssuer, refresh_margin: Optional[float] = None
+    ) -> None:
+        self.issuer: TokenIssuer = issuer
+        self.refresh_margin: float = (
+            settings.TOKEN_REFRESH_MARGIN if refresh_margin is None else refresh_margin
+        )
+        self.tokens: Dict[str, AccessToken] = {}
+        self._locks: Dict[str, Lock] = {}
+        self._locks_lock: Lock = Lock()
+
+    def get_token(self, resource_client_id: str) -> str:
+        token: Optional[AccessToken] = self.tokens.get(resource_client_id)
+        if token is not None and token.is_valid(self.refresh_margin):
+            return token.token
+
+        with self._lock_for(resource_client_id):
+            token = self.tokens.get(resource_client_id)
+            if token is None or not token.is_valid(self.refresh_margin):
+                token = self.issuer(resource_client_id)
+                self.tokens[resource_client_id] = token
+                logger.debug(f"Acquired access token for resource {resource_client_id}")
+            return token.token
+
+    async def get_token_async(self, resource_client_id: str) -> str:
+        token: Optional[AccessToken] = self.tokens.get(resource_client_id)
+        if token is not None and token.is_valid(self.refresh_margin):
+            return token.token
+        # The issuer blocks on network calls, refresh in a thread to keep the loop free
+        return await asyncio.to_thread(self.get_token, resource_client_id)
+
+    def clear(self) -> None:
+        with self._locks_lock:
+            self.tokens.clear()
+
+    def _lock_for(self, resource_client_id: str) -> Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(resource_client_id, Lock())
+
+
+token_cache: TokenCache = TokenCache(issuer=acquire_token_for_integration_tests_app)
+
+
+def retrieve_access_token_for_integration_tests_app(resource_client_id: str) -> str:
+    return token_cache.get_token(resource_client_id)
+
+
+async def retrieve_access_token_for_integration_tests_app_async(
+    resource_client_id: str,
+) -> str:
+    return await token_cache.get_token_async(resource_client_id)
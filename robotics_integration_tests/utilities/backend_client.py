@@ -0,0 +1,149 @@
+import time
+from threading import Lock
+from typing import Any, Dict, Optional, Type, TypeVar
+
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from robotics_integration_tests.settings.settings import settings
+from robotics_integration_tests.utilities.authentication import (
+    retrieve_access_token_for_integration_tests_app,
+)
+
+C = TypeVar("C", bound="BackendClient")
+
+
+class EndpointStats:
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.errors: int = 0
+        self.total_latency: float = 0.0
+        self.max_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.count if self.count else 0.0
+
+    def record(self, latency: float, failed: bool) -> None:
+        self.count += 1
+        self.errors += int(failed)
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+
+class EndpointLatencies:
+    def __init__(self) -> None:
+        self.stats: Dict[str, EndpointStats] = {}
+        self._lock: Lock = Lock()
+
+    def record(self, endpoint: str, latency: float, failed: bool) -> None:
+        with self._lock:
+            self.stats.setdefault(endpoint, EndpointStats()).record(
+                latency=latency, failed=failed
+            )
+
+    def summary(self) -> str:
+        with self._lock:
+            return "\n".join(
+                f"{endpoint}: {stats.count} requests, {stats.errors} errors, "
+                f"mean {stats.mean_latency * 1000:.1f} ms, max {stats.max_latency * 1000:.1f} ms"
+                for endpoint, stats in sorted(self.stats.items())
+            )
+
+
+class BackendClient:
+    """HTTP client for one backend owning a pooled keep-alive session.
+
+    Every request carries a cached access token for resource_client_id and the connect
+    and read timeouts from the settings. Idempotent requests are retried with backoff
+    on connection errors and 502/503/504, POST and PATCH are sent once. Latency and
+    errors are counted per endpoint, where the endpoint is the path template given by
+    the caller, so that requests for different ids are counted together.
+    """
+
+    _clients: Dict[str, "BackendClient"] = {}
+    _clients_lock: Lock = Lock()
+
+    def __init__(self, base_url: str, resource_client_id: str) -> None:
+        self.base_url: str = base_url.rstrip("/")
+        self.resource_client_id: str = resource_client_id
+        self.timeout: tuple[float, float] = (
+            settings.HTTP_CONNECT_TIMEOUT,
+            settings.HTTP_READ_TIMEOUT,
+        )
+        self.latencies: EndpointLatencies = EndpointLatencies()
+
+        retry: Retry = Retry(
+            total=settings.HTTP_MAX_RETRIES,
+            backoff_factor=settings.HTTP_RETRY_BACKOFF_FACTOR,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            raise_on_status=False,
+        )
+        adapter: HTTPAdapter = HTTPAdapter(
+            pool_maxsize=settings.HTTP_POOL_MAXSIZE, max_retries=retry
+        )
+        self.session: Session = Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @classmethod
+    def for_url(cls: Type[C], base_url: str) -> C:
+        """Return the shared client of this type for the backend at base_url."""
+        key: str = f"{cls.__name__}:{base_url.rstrip('/')}"
+        with BackendClient._clients_lock:
+            client: Optional[BackendClient] = BackendClient._clients.get(key)
+            if client is None:
+                client = cls(base_url=base_url)
+                BackendClient._clients[key] = client
+            return client
+
+    def close(self) -> None:
+        with BackendClient._clients_lock:
+            for key, client in list(BackendClient._clients.items()):
+                if client is self:
+                    del BackendClient._clients[key]
+        self.session.close()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        endpoint: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Response:
+        headers: Dict[str, str] = {
+            "Authorization": f"Bearer {retrieve_access_token_for_integration_tests_app(self.resource_client_id)}",
+            **kwargs.pop("headers", {}),
+        }
+        kwargs.setdefault("timeout", self.timeout)
+
+        start_time: float = time.monotonic()
+        failed: bool = True
+        try:
+            response: Response = self.session.request(
+                method, f"{self.base_url}/{path.lstrip('/')}", headers=headers, **kwargs
+            )
+            failed = not response.ok
+            return response
+        finally:
+            self.latencies.record(
+                f"{method} {endpoint or path}", time.monotonic() - start_time, failed
+            )
+
+    def get(self, path: str, endpoint: Optional[str] = None, **kwargs: Any) -> Response:
+        return self.request("GET", path, endpoint=endpoint, **kwargs)
+
+    def post(
+        self, path: str, endpoint: Optional[str] = None, **kwargs: Any
+    ) -> Response:
+        return self.request("POST", path, endpoint=endpoint, **kwargs)
+
+    def patch(
+        self, path: str, endpoint: Optional[str] = None, **kwargs: Any
+    ) -> Response:
+        return self.request("PATCH", path, endpoint=endpoint, **kwargs)
+
+    def latency_summary(self) -> str:
+        return self.latencies.summary()
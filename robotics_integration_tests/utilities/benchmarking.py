@@ -0,0 +1,156 @@
+import json
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional
+
+from loguru import logger
+
+
+class BenchmarkMetric:
+    def __init__(self, name: str, samples: List[float]) -> None:
+        self.name: str = name
+        self.samples: List[float] = samples
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "median": self.median,
+            "min": min(self.samples),
+            "max": max(self.samples),
+            "samples": self.samples,
+        }
+
+
+class BenchmarkRecorder:
+    """Times a part of cold_runs + repetitions runs of a benchmark.
+
+    Iterate over runs() and wrap the measured part of every run in timed(), setup and
+    cleanup around it are not measured. The first cold_runs runs are reported as
+    '<name>/cold', they pay for empty caches such as image layers, database snapshots,
+    connection pools and JIT compilation in the services. The remaining runs are
+    reported as '<name>/warm'.
+    """
+
+    def __init__(self, name: str, repetitions: int, cold_runs: int = 1) -> None:
+        self.name: str = name
+        self.repetitions: int = repetitions
+        self.cold_runs: int = cold_runs
+        self.durations: List[float] = []
+
+    def runs(self) -> Iterator[int]:
+        for index in range(self.cold_runs + self.repetitions):
+            yield index
+            if len(self.durations) != index + 1:
+                raise RuntimeError(
+                    f"Benchmark {self.name} run {index + 1} did not time anything"
+                )
+            logger.info(
+                f"Benchmark {self.name} run {index + 1}: {self.durations[-1]:.2f} seconds"
+            )
+
+    @contextmanager
+    def timed(self) -> Iterator[None]:
+        start_time: float = time.perf_counter()
+        yield
+        self.durations.append(time.perf_counter() - start_time)
+
+    def metrics(self) -> List[BenchmarkMetric]:
+        metrics: List[BenchmarkMetric] = []
+        if self.durations[: self.cold_runs]:
+            metrics.append(
+                BenchmarkMetric(f"{self.name}/cold", self.durations[: self.cold_runs])
+            )
+        if self.durations[self.cold_runs :]:
+            metrics.append(
+                BenchmarkMetric(f"{self.name}/warm", self.durations[self.cold_runs :])
+            )
+        return metrics
+
+
+class BenchmarkSuite:
+    """Benchmark results of a session compared against the baselines in the repo.
+
+    A metric regresses when its median is more than threshold, as a fraction, above
+    the median stored as its baseline. A metric without a baseline fails as well,
+    unless update_baselines is set to store the results of the session as new
+    baselines.
+    """
+
+    def __init__(
+        self, baselines_path: Path, threshold: float, update_baselines: bool
+    ) -> None:
+        self.baselines_path: Path = baselines_path
+        self.threshold: float = threshold
+        self.update_baselines: bool = update_baselines
+        self.baselines: Dict[str, Dict[str, Any]] = (
+            json.loads(baselines_path.read_text()) if baselines_path.exists() else {}
+        )
+        self.metrics: Dict[str, BenchmarkMetric] = {}
+        self._lock: Lock = Lock()
+
+    def record(self, metrics: List[BenchmarkMetric]) -> List[str]:
+        """Record metrics and return a description of every regression and missing
+        baseline among them."""
+        regressions: List[str] = []
+        with self._lock:
+            for metric in metrics:
+                self.metrics[metric.name] = metric
+                regression: Optional[str] = self._regression(metric)
+                if regression is not None:
+                    regressions.append(regression)
+        return regressions
+
+    def _regression(self, metric: BenchmarkMetric) -> Optional[str]:
+        baseline: Optional[Dict[str, Any]] = self.baselines.get(metric.name)
+        if baseline is None:
+            if self.update_baselines:
+                logger.info(f"Benchmark {metric.name} has no baseline yet")
+                return None
+            message: str = (
+                f"{metric.name} has no baseline in {self.baselines_path}, run with "
+                f"BENCHMARK_UPDATE_BASELINES=true and commit the baselines file"
+            )
+            logger.error(message)
+            return message
+        limit: float = baseline["median"] * (1 + self.threshold)
+        logger.info(
+            f"Benchmark {metric.name}: median {metric.median:.2f} seconds, "
+            f"baseline {baseline['median']:.2f} seconds"
+        )
+        if metric.median <= limit:
+            return None
+        return (
+            f"{metric.name} regressed: median {metric.median:.2f} seconds exceeds the "
+            f"baseline {baseline['median']:.2f} seconds by more than {self.threshold:.0%}"
+        )
+
+    def write_results(self, path: Path) -> None:
+        with self._lock:
+            results: Dict[str, Dict[str, Any]] = {
+                name: metric.to_dict() for name, metric in sorted(self.metrics.items())
+            }
+        if not results:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=2))
+        logger.info(f"Benchmark results written to {path}")
+
+        if self.update_baselines:
+            recorded_at: str = datetime.now(timezone.utc).isoformat(timespec="seconds")
+            for name, result in results.items():
+                self.baselines[name] = {
+                    "median": result["median"],
+                    "samples": len(result["samples"]),
+                    "recorded_at": recorded_at,
+                }
+            self.baselines_path.write_text(
+                json.dumps(dict(sorted(self.baselines.items())), indent=2) + "\n"
+            )
+            logger.info(f"Benchmark baselines updated in {self.baselines_path}")
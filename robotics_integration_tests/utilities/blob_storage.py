@@ -1,7 +1,104 @@
-import time
-from datetime import datetime, timedelta
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Sequence, Set
 
-from azure.storage.blob import BlobServiceClient
+from azure.core.exceptions import AzureError
+from azure.storage.blob import BlobServiceClient, ContainerClient
+from loguru import logger
+
+from robotics_integration_tests.settings.settings import settings
+from robotics_integration_tests.utilities.polling import poll_until
+
+_blob_service_clients: Dict[str, BlobServiceClient] = {}
+_blob_service_clients_lock: Lock = Lock()
+
+
+def get_blob_service_client(connection_string: str) -> BlobServiceClient:
+    """Return the shared client of the storage account behind connection_string."""
+    with _blob_service_clients_lock:
+        if connection_string not in _blob_service_clients:
+            _blob_service_clients[connection_string] = (
+                BlobServiceClient.from_connection_string(connection_string)
+            )
+        return _blob_service_clients[connection_string]
+
+
+def mission_id_of_blob_name(blob_name: str) -> str:
+    """Mission id of an inspection blob uploaded by ISAR.
+
+    ISAR uploads into the folder <utc date>__<plant>__<mission name>__<mission id> and
+    names the files <tag>__<inspection type>__<description>__<utc time>.<extension>.
+    """
+    return blob_name.split("/", 1)[0].rsplit("__", 1)[-1]
+
+
+class BlobUploadWatcher:
+    """Follows the blobs uploaded under a prefix of a container.
+
+    Every refresh lists at most max_pages_per_refresh pages and remembers the
+    continuation marker, the next refresh resumes from there. Once a listing pass is
+    complete the next refresh starts a new pass from the beginning of the prefix, since
+    blobs are listed by name and new uploads may sort before the marker. Only blob
+    names that have not been seen before are processed, and they are indexed by the
+    key that key_of_blob_name returns for them, the mission id by default.
+    """
+
+    def __init__(
+        self,
+        connection_string: str,
+        container_name: str,
+        prefix: str = "",
+        page_size: Optional[int] = None,
+        max_pages_per_refresh: Optional[int] = None,
+        key_of_blob_name: Callable[[str], str] = mission_id_of_blob_name,
+    ) -> None:
+        self.container_name: str = container_name
+        self.prefix: str = prefix
+        self.page_size: int = page_size or settings.BLOB_LIST_PAGE_SIZE
+        self.max_pages_per_refresh: int = (
+            max_pages_per_refresh or settings.BLOB_LIST_MAX_PAGES_PER_REFRESH
+        )
+        self.container_client: ContainerClient = get_blob_service_client(
+            connection_string
+        ).get_container_client(container_name)
+        self.key_of_blob_name: Callable[[str], str] = key_of_blob_name
+        self.blob_names: Set[str] = set()
+        self.blob_names_by_key: Dict[str, List[str]] = {}
+        self._continuation_token: Optional[str] = None
+
+    @property
+    def count(self) -> int:
+        return len(self.blob_names)
+
+    def refresh(self) -> List[str]:
+        """List the next pages and return the names of blobs not seen before."""
+        pages = self.container_client.list_blob_names(
+            name_starts_with=self.prefix or None, results_per_page=self.page_size
+        ).by_page(continuation_token=self._continuation_token)
+
+        new_blob_names: List[str] = []
+        for _ in range(self.max_pages_per_refresh):
+            page = next(pages, None)
+            if page is None:
+                self._continuation_token = None
+                break
+            for blob_name in page:
+                if blob_name not in self.blob_names:
+                    self.blob_names.add(blob_name)
+                    self.blob_names_by_key.setdefault(
+                        self.key_of_blob_name(blob_name), []
+                    ).append(blob_name)
+                    new_blob_names.append(blob_name)
+            self._continuation_token = pages.continuation_token
+            if self._continuation_token is None:
+                break
+        return new_blob_names
+
+    def count_with_keys(self, keys: Sequence[str]) -> int:
+        return sum(len(self.blob_names_by_key.get(key, [])) for key in keys)
+
+    def missing(self, expected_keys: Sequence[str]) -> List[str]:
+        """Return the expected keys, e.g. mission ids, that no uploaded blob has."""
+        return [key for key in expected_keys if key not in self.blob_names_by_key]
 
 
 def wait_until_all_expected_files_uploaded(
@@ -9,30 +106,62 @@ def wait_until_all_expected_files_uploaded(
     connection_string: str,
     expected_file_count: int,
     timeout: int = 60,
-) -> None:
-
-    start_time = datetime.now()
-    while True:
-        current_count: int = count_files_in_container(container_name, connection_string)
-        if current_count >= expected_file_count:
-            return
-        if datetime.now() - start_time > timedelta(seconds=timeout):
-            raise TimeoutError(
-                f"Timeout waiting for {expected_file_count} files in container '{container_name}'. "
-                f"Only {current_count} files found."
-            )
-        time.sleep(1)
+    prefix: str = "",
+    expected_keys: Sequence[str] = (),
+) -> float:
+    """Wait for expected_file_count blobs under prefix.
+
+    With expected_keys, e.g. the id of the mission run, only blobs with one of those
+    keys are counted and each key must have at least one blob.
+    """
+    watcher: BlobUploadWatcher = BlobUploadWatcher(
+        connection_string=connection_string,
+        container_name=container_name,
+        prefix=prefix,
+    )
+
+    def uploaded_count() -> int:
+        if expected_keys:
+            return watcher.count_with_keys(expected_keys)
+        return watcher.count
+
+    def all_files_uploaded() -> Optional[int]:
+        watcher.refresh()
+        if uploaded_count() < expected_file_count or watcher.missing(expected_keys):
+            return None
+        return uploaded_count()
+
+    try:
+        result = poll_until(
+            condition=all_files_uploaded,
+            description=f"Waiting for {expected_file_count} files in container '{container_name}'",
+            timeout=timeout,
+            retry_exceptions=(AzureError,),
+        )
+    except TimeoutError:
+        missing_keys: List[str] = watcher.missing(expected_keys)
+        raise TimeoutError(
+            f"Timeout waiting for {expected_file_count} files in container '{container_name}'. "
+            f"Only {uploaded_count()} files found."
+            + (f" No uploads found for {missing_keys}." if missing_keys else "")
+        ) from None
+    logger.info(
+        f"{result.value} files found in container '{container_name}' after {result.metrics.elapsed:.2f} seconds"
+    )
+    return result.metrics.elapsed
 
 
 def count_files_in_container(
     container_name: str,
     connection_string: str,
+    prefix: str = "",
 ) -> int:
-    service_client = BlobServiceClient.from_connection_string(connection_string)
-    container_client = service_client.get_container_client(container_name)
+    container_client: ContainerClient = get_blob_service_client(
+        connection_string
+    ).get_container_client(container_name)
 
     count = 0
-    for _ in container_client.list_blobs():
+    for _ in container_client.list_blob_names(name_starts_with=prefix or None):
         count += 1
 
     return count
@@ -1,39 +1,43 @@
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
-import requests
 from loguru import logger
-from requests import Response
+from requests import RequestException, Response
 
 from robotics_integration_tests.settings.settings import settings
-from robotics_integration_tests.utilities.authentication import (
-    retrieve_access_token_for_integration_tests_app,
+from robotics_integration_tests.utilities.backend_client import BackendClient
+from robotics_integration_tests.utilities.mission_timeline import (
+    record_mission_run,
+    record_robot,
 )
+from robotics_integration_tests.utilities.polling import TRANSPORT_ERRORS, poll_until
+from robotics_integration_tests.utilities.status_watcher import FlotillaStatusWatcher
 
 
-def _add_headers() -> Dict[str, str]:
-    access_token: str = retrieve_access_token_for_integration_tests_app(
-        settings.FLOTILLA_AZURE_CLIENT_ID
-    )
-    headers = {"Authorization": f"Bearer {access_token}"}
-    return headers
+class FlotillaBackendClient(BackendClient):
+    def __init__(self, base_url: str) -> None:
+        super().__init__(
+            base_url=base_url, resource_client_id=settings.FLOTILLA_AZURE_CLIENT_ID
+        )
+
+
+def _client(backend_url: str) -> FlotillaBackendClient:
+    return FlotillaBackendClient.for_url(backend_url)
 
 
-def _list_database_entries(backend_url: str, request_path: str) -> List[Dict]:
+def list_database_entries(backend_url: str, request_path: str) -> List[Dict]:
     logger.info(f"Listing database entries for path: {backend_url}/{request_path}")
-    response: Response = requests.get(
-        f"{backend_url}/{request_path}", headers=_add_headers()
-    )
+    response: Response = _client(backend_url).get(request_path)
     response.raise_for_status()
     return response.json()
 
 
 def get_inspection_area_id_for_installation(backend_url: str, installation_code: str):
-    response: Response = requests.get(
-        f"{backend_url}/inspectionAreas/installation/{installation_code}",
-        headers=_add_headers(),
+    response: Response = _client(backend_url).get(
+        f"inspectionAreas/installation/{installation_code}",
+        endpoint="inspectionAreas/installation/{installationCode}",
     )
+    response.raise_for_status()
     inspection_areas_for_installation: List[Dict] = response.json()
     inspection_area_id: str = inspection_areas_for_installation[0]["id"]
     return inspection_area_id
@@ -42,10 +46,11 @@ def get_inspection_area_id_for_installation(backend_url: str, installation_code:
 def set_current_inspection_area_for_robot(
     backend_url: str, inspection_area_id: str, robot_id: str
 ):
-    response: Response = requests.patch(
-        f"{backend_url}/robots/{robot_id}/currentInspectionArea/{inspection_area_id}",
-        headers=_add_headers(),
+    response: Response = _client(backend_url).patch(
+        f"robots/{robot_id}/currentInspectionArea/{inspection_area_id}",
+        endpoint="robots/{id}/currentInspectionArea/{inspectionAreaId}",
     )
+    response.raise_for_status()
 
 
 def schedule_echo_mission(
@@ -73,11 +78,7 @@ def schedule_mission(
         "installationCode": installation_code,
     }
     url: str = f"{backend_url}/missions"
-    response: Response = requests.post(
-        url,
-        json=payload,
-        headers=_add_headers(),
-    )
+    response: Response = _client(backend_url).post("missions", json=payload)
     if not response.ok:
         body = response.text
         try:
@@ -92,17 +93,18 @@ def schedule_mission(
             f"Parsed JSON (if any):\n{problem}"
         )
     response.raise_for_status()
-    return response.json()
+    mission_run: Dict = response.json()
+    record_mission_run(mission_run)
+    return mission_run
 
 
 def get_robot_by_name(backend_url: str, name: str) -> Dict:
-    response: Response = requests.get(
-        f"{backend_url}/robots",
-        headers=_add_headers(),
-    )
+    response: Response = _client(backend_url).get("robots")
     response.raise_for_status()
 
     robots: List[Dict] = response.json()
+    for robot in robots:
+        record_robot(robot)
 
     for robot in robots:
         if robot.get("name") == name:
@@ -110,6 +112,16 @@ def get_robot_by_name(backend_url: str, name: str) -> Dict:
     raise RuntimeError(f"Robot with name '{name}' not found")
 
 
+def get_robot_by_id(backend_url: str, robot_id: str) -> Dict:
+    response: Response = _client(backend_url).get(
+        f"robots/{robot_id}", endpoint="robots/{id}"
+    )
+    response.raise_for_status()
+    robot: Dict = response.json()
+    record_robot(robot)
+    return robot
+
+
 def is_robot_status(backend_url: str, robot_name: str, expected_status: str) -> bool:
     robot: Dict = get_robot_by_name(backend_url=backend_url, name=robot_name)
     current_status: str = robot.get("status")
@@ -119,12 +131,13 @@ def is_robot_status(backend_url: str, robot_name: str, expected_status: str) ->
 
 
 def get_mission_run_by_id(backend_url: str, mission_run_id: str) -> Dict:
-    response: Response = requests.get(
-        f"{backend_url}/missions/runs/{mission_run_id}",
-        headers=_add_headers(),
+    response: Response = _client(backend_url).get(
+        f"missions/runs/{mission_run_id}", endpoint="missions/runs/{id}"
     )
     response.raise_for_status()
-    return response.json()
+    mission_run: Dict = response.json()
+    record_mission_run(mission_run)
+    return mission_run
 
 
 def is_mission_run_status(
@@ -142,14 +155,13 @@ def is_mission_run_status(
 def add_access_role_to_database(
     backend_url: str, access_level: str, installation_code: str, role_name: str
 ):
-    response: Response = requests.post(
-        f"{backend_url}/access-roles",
+    response: Response = _client(backend_url).post(
+        "access-roles",
         json={
             "installationCode": installation_code,
             "roleName": role_name,
             "accessLevel": access_level,
         },
-        headers=_add_headers(),
     )
     response.raise_for_status()
 
@@ -157,14 +169,13 @@ def add_access_role_to_database(
 def add_plant_to_database(
     backend_url: str, installation_code: str, name: str, plant_code: str
 ):
-    response: Response = requests.post(
-        f"{backend_url}/plants",
+    response: Response = _client(backend_url).post(
+        "plants",
         json={
             "installationCode": installation_code,
             "plantCode": plant_code,
             "name": name,
         },
-        headers=_add_headers(),
     )
     response.raise_for_status()
 
@@ -172,15 +183,14 @@ def add_plant_to_database(
 def add_inspection_area_to_database(
     backend_url: str, installation_code: str, name: str, plant_code: str, polygon: Dict
 ):
-    response: Response = requests.post(
-        f"{backend_url}/inspectionAreas",
+    response: Response = _client(backend_url).post(
+        "inspectionAreas",
         json={
             "installationCode": installation_code,
             "plantCode": plant_code,
             "name": name,
             "areaPolygon": polygon,
         },
-        headers=_add_headers(),
     )
     response.raise_for_status()
 
@@ -188,158 +198,27 @@ def add_inspection_area_to_database(
 def add_installation_to_database(
     backend_url: str, installation_code: str, name: str
 ) -> None:
-    response: Response = requests.post(
-        f"{backend_url}/installations",
+    response: Response = _client(backend_url).post(
+        "installations",
         json={"installationCode": installation_code, "name": name},
-        headers=_add_headers(),
     )
     response.raise_for_status()
 
 
-def wait_for_backend_to_be_responsive(backend_url: str, timeout: int = 60) -> None:
-    start_time: datetime = datetime.now()
-    while True:
-        if datetime.now() - start_time > timedelta(seconds=timeout):
-            raise RuntimeError(
-                f"Backend was not responsive within the given timeout {timeout} seconds"
-            )
-
-        try:
-            installations: List[Dict] = _list_database_entries(
-                backend_url=backend_url, request_path="installations"
-            )
-        except Exception:
-            logger.warning("Backend is not responsive yet, will retry until timeout...")
-            time.sleep(1)
-            continue
-
-        if len(installations) >= 0:
-            logger.info("Backend is responsive")
-            return
-
-
-# Populate default installations
-default_installations: List[Tuple[str, str]] = [
-    ("HUA", "Huldra"),
-    ("KAA", "Kårstø"),
-    ("NLS", "Northern Lights"),
-]
-
-# Populate default plants
-default_plants: List[Tuple[str, str, str]] = [
-    ("HUA", "HUA", "Huldra"),
-    ("KAA", "KAA", "Kårstø"),
-    ("NLS", "NLS", "Northern Lights"),
-]
-
-default_area_polygon = {
-    "zmin": 0,
-    "zmax": 10000000,
-    "positions": [
-        {
-            "x": 0,
-            "y": 0,
-        },
-        {
-            "x": 0,
-            "y": 10000000,
-        },
-        {
-            "x": 10000000,
-            "y": 0,
-        },
-        {
-            "x": 10000000,
-            "y": 10000000,
-        },
-    ],
-}
-
-# Populate default inspection areas
-default_inspection_areas: List[Tuple[str, str, str, Dict]] = [
-    ("HUA", "HUA", "Huldra Area", default_area_polygon),
-    ("KAA", "KAA", "Kårstø Area", default_area_polygon),
-    ("NLS", "NLS", "Northern Lights Area", default_area_polygon),
-]
-
-# Populate default access roles
-default_access_roles: List[Tuple[str, str, str]] = [
-    ("HUA", "Role.User.HUA", "USER"),
-    ("KAA", "Role.User.KAA", "USER"),
-    ("NLS", "Role.User.NLS", "USER"),
-]
-
-
-def populate_database_with_minimum_models(backend_url: str) -> None:
-    for installation_code, name in default_installations:
-        add_installation_to_database(
-            backend_url=backend_url, installation_code=installation_code, name=name
-        )
-
-    for plant_code, installation_code, name in default_plants:
-        add_plant_to_database(
-            backend_url=backend_url,
-            installation_code=installation_code,
-            name=name,
-            plant_code=plant_code,
-        )
-
-    for installation_code, plant_code, name, polygon in default_inspection_areas:
-        add_inspection_area_to_database(
-            backend_url=backend_url,
-            installation_code=installation_code,
-            name=name,
-            plant_code=plant_code,
-            polygon=polygon,
-        )
-
-    for installation_code, role_name, access_level in default_access_roles:
-        add_access_role_to_database(
-            backend_url=backend_url,
-            access_level=access_level,
-            installation_code=installation_code,
-            role_name=role_name,
-        )
-
-
-def wait_for_database_to_be_populated(backend_url: str, timeout: int = 60) -> None:
-    start_time: datetime = datetime.now()
-    while True:
-        if datetime.now() - start_time > timedelta(seconds=timeout):
-            raise RuntimeError(
-                f"Database is not populated within the given timeout {timeout} seconds"
-            )
+def wait_for_backend_to_be_responsive(backend_url: str, timeout: int = 60) -> float:
+    def installations_are_listed() -> Optional[bool]:
+        list_database_entries(backend_url=backend_url, request_path="installations")
+        return True
 
-        try:
-            installations: List[Dict] = _list_database_entries(
-                backend_url=backend_url, request_path="installations"
-            )
-            plants: List[Dict] = _list_database_entries(
-                backend_url=backend_url, request_path="plants"
-            )
-            inspection_areas: List[Dict] = _list_database_entries(
-                backend_url=backend_url, request_path="inspectionAreas"
-            )
-            access_roles: List[Dict] = _list_database_entries(
-                backend_url=backend_url, request_path="access-roles"
-            )
-        except Exception:
-            logger.warning(
-                "Database has not been populated yet, will retry until timeout..."
-            )
-            time.sleep(1)
-            continue
-
-        if (
-            len(installations) == len(default_installations)
-            and len(plants) == len(default_plants)
-            and len(inspection_areas) == len(default_inspection_areas)
-            and len(access_roles) == len(default_access_roles)
-        ):
-            logger.info(
-                "Database has been populated with default installations, plants, inspection areas and access roles"
-            )
-            return
+    return poll_until(
+        condition=installations_are_listed,
+        description="Waiting for backend to be responsive",
+        timeout=timeout,
+        timeout_message=f"Backend was not responsive within the given timeout {timeout} seconds",
+        timeout_exception=RuntimeError,
+        # The backend answers with errors while it is still starting
+        retry_exceptions=(RequestException,),
+    ).metrics.elapsed
 
 
 def setup_robot_in_flotilla(backend_url: str, robot_name: str) -> Tuple[str, str]:
@@ -376,181 +255,223 @@ def setup_robot_in_flotilla(backend_url: str, robot_name: str) -> Tuple[str, str
 def wait_for_inspection_area_to_be_updated_on_robot(
     backend_url: str, robot_id: str, timeout: int = 60
 ) -> None:
-    start_time: datetime = datetime.now()
-    while True:
-        if datetime.now() - start_time > timedelta(seconds=timeout):
-            raise RuntimeError(
-                f"Inspection area on robot {robot_id} is not updated within the given timeout {timeout} seconds"
-            )
-
-        try:
-            robot: Dict = requests.get(
-                f"{backend_url}/robots/{robot_id}",
-                headers=_add_headers(),
-            ).json()
-        except Exception:
-            logger.warning(
-                f"Failed to retrieve robot with ID {robot_id}, will retry until timeout..."
-            )
-            time.sleep(1)
-            continue
-
-        if robot.get("currentInspectionAreaId") is not None:
-            logger.info(
-                f"Inspection area on robot {robot_id} has been updated to {robot.get('currentInspectionArea')}"
-            )
-            return
-        else:
+    def inspection_area_is_updated() -> Optional[Dict]:
+        robot: Dict = get_robot_by_id(backend_url=backend_url, robot_id=robot_id)
+        if robot.get("currentInspectionAreaId") is None:
             logger.info(f"Inspection area on robot {robot_id} is not updated yet")
-            time.sleep(1)
-            continue
+            return None
+        return robot
+
+    robot: Dict = poll_until(
+        condition=inspection_area_is_updated,
+        description=f"Waiting for inspection area on robot {robot_id}",
+        timeout=timeout,
+        timeout_message=f"Inspection area on robot {robot_id} is not updated within the given timeout {timeout} seconds",
+        timeout_exception=RuntimeError,
+    ).value
+    logger.info(
+        f"Inspection area on robot {robot_id} has been updated to {robot.get('currentInspectionArea')}"
+    )
 
 
 def wait_for_robot_to_be_populated_in_database(
     backend_url: str, robot_name: str, timeout: int = 60
 ) -> None:
-    start_time: datetime = datetime.now()
-    while True:
-        if datetime.now() - start_time > timedelta(seconds=timeout):
-            raise RuntimeError(
-                f"Robot '{robot_name}' was not populated in the database within the given timeout {timeout} seconds"
-            )
-
-        try:
-            robot: Dict = get_robot_by_name(backend_url=backend_url, name=robot_name)
-        except Exception:
-            logger.warning(f"Failed to retrieve robot {robot_name} from the database")
-            time.sleep(1)
-            continue
-
-        if robot.get("name") == robot_name:
-            logger.info(
-                f"Robot with name '{robot_name}' has been populated in the database"
-            )
-            return
-
-        logger.info(
-            f"Robot with name '{robot_name}' is not populated in the database yet"
-        )
-        time.sleep(1)
-        continue
+    poll_until(
+        condition=lambda: get_robot_by_name(backend_url=backend_url, name=robot_name),
+        description=f"Waiting for robot '{robot_name}' to be populated in the database",
+        timeout=timeout,
+        timeout_message=f"Robot '{robot_name}' was not populated in the database within the given timeout {timeout} seconds",
+        timeout_exception=RuntimeError,
+        # get_robot_by_name raises until the robot has registered
+        retry_exceptions=TRANSPORT_ERRORS + (RuntimeError,),
+    )
+    logger.info(f"Robot with name '{robot_name}' has been populated in the database")
 
 
 def wait_for_mission_run_status(
-    backend_url: str, mission_run_id: str, expected_status: str, timeout: int = 60
+    backend_url: str,
+    mission_run_id: str,
+    expected_status: str,
+    timeout: int = 60,
+    status_watcher: Optional[FlotillaStatusWatcher] = None,
 ) -> Dict:
-    start_time: datetime = datetime.now()
-    while True:
-        if datetime.now() - start_time > timedelta(seconds=timeout):
-            raise RuntimeError(
-                f"Mission run '{mission_run_id}' did not reach status '{expected_status}' within the given timeout "
-                f"{timeout} seconds"
-            )
-
-        try:
-            mission_run: Dict = get_mission_run_by_id(
-                backend_url=backend_url, mission_run_id=mission_run_id
-            )
-        except Exception:
-            logger.warning(
-                f"Failed to retrieve mission run with ID {mission_run_id}, most likely because it has not been written "
-                f"to the database yet, will retry..."
-            )
-            time.sleep(1)
-            continue
+    status_event_waiter: _StatusEventWaiter = _StatusEventWaiter(
+        status_watcher=status_watcher, kind="mission", timeout=timeout
+    )
 
+    def has_expected_status() -> Optional[Dict]:
+        status_event_waiter.mark_seen()
+        mission_run: Dict = get_mission_run_by_id(
+            backend_url=backend_url, mission_run_id=mission_run_id
+        )
         current_status: str = mission_run.get("status")
-        if current_status == expected_status:
-            logger.info(
-                f"Mission run with ID '{mission_run_id}' has reached expected status '{expected_status}'"
-            )
-            return mission_run
-        else:
+        if current_status != expected_status:
             logger.info(
                 f"Mission run with ID '{mission_run_id}' is in status '{current_status}', "
                 f"waiting for status '{expected_status}'"
             )
-            time.sleep(1)
-            continue
+            return None
+        return mission_run
+
+    mission_run: Dict = poll_until(
+        condition=has_expected_status,
+        description=f"Waiting for mission run '{mission_run_id}' to reach status '{expected_status}'",
+        timeout=timeout,
+        timeout_message=(
+            f"Mission run '{mission_run_id}' did not reach status '{expected_status}' within the given timeout "
+            f"{timeout} seconds"
+        ),
+        timeout_exception=RuntimeError,
+        sleep=status_event_waiter.sleep,
+    ).value
+    logger.info(
+        f"Mission run with ID '{mission_run_id}' has reached expected status '{expected_status}'"
+    )
+    return mission_run
 
 
 def wait_for_second_task_status_of_mission_run(
-    backend_url: str, mission_run_id: str, expected_status: str, timeout: int = 60
+    backend_url: str,
+    mission_run_id: str,
+    expected_status: str,
+    timeout: int = 60,
+    status_watcher: Optional[FlotillaStatusWatcher] = None,
 ) -> Dict:
-    start_time: datetime = datetime.now()
-    while True:
-        if datetime.now() - start_time > timedelta(seconds=timeout):
-            raise RuntimeError(
-                f"Second task in mission with ID '{mission_run_id}' did not reach status '{expected_status}' within the given timeout "
-                f"{timeout} seconds"
-            )
-
-        try:
-            mission_run: Dict = get_mission_run_by_id(
-                backend_url=backend_url, mission_run_id=mission_run_id
-            )
-        except Exception:
-            logger.warning(
-                f"Failed to retrieve mission run with ID {mission_run_id}, most likely because it has not been written "
-                f"to the database yet, will retry..."
-            )
-            time.sleep(1)
-            continue
+    status_event_waiter: _StatusEventWaiter = _StatusEventWaiter(
+        status_watcher=status_watcher, kind="task", timeout=timeout
+    )
 
-        tasks: List = mission_run.get("tasks")
-        first_task_status: str = tasks[1].get("status")
-        if first_task_status == expected_status:
-            logger.info(
-                f"Second task in mission with ID '{mission_run_id}' has reached expected status '{expected_status}'"
-            )
-            return tasks[1]
-        else:
+    def has_expected_status() -> Optional[Dict]:
+        status_event_waiter.mark_seen()
+        mission_run: Dict = get_mission_run_by_id(
+            backend_url=backend_url, mission_run_id=mission_run_id
+        )
+        second_task: Dict = mission_run.get("tasks")[1]
+        second_task_status: str = second_task.get("status")
+        if second_task_status != expected_status:
             logger.info(
-                f"Second task in mission run with ID '{mission_run_id}' is in status '{first_task_status}', "
+                f"Second task in mission run with ID '{mission_run_id}' is in status '{second_task_status}', "
                 f"waiting for status '{expected_status}'"
             )
-            time.sleep(1)
-            continue
+            return None
+        return second_task
+
+    second_task: Dict = poll_until(
+        condition=has_expected_status,
+        description=f"Waiting for second task in mission run '{mission_run_id}' to reach status '{expected_status}'",
+        timeout=timeout,
+        timeout_message=(
+            f"Second task in mission with ID '{mission_run_id}' did not reach status '{expected_status}' within the given timeout "
+            f"{timeout} seconds"
+        ),
+        timeout_exception=RuntimeError,
+        sleep=status_event_waiter.sleep,
+    ).value
+    logger.info(
+        f"Second task in mission with ID '{mission_run_id}' has reached expected status '{expected_status}'"
+    )
+    return second_task
 
 
 def wait_for_robot_status(
-    backend_url: str, robot_name: str, expected_status: str, timeout: int = 60
+    backend_url: str,
+    robot_name: str,
+    expected_status: str,
+    timeout: int = 60,
+    status_watcher: Optional[FlotillaStatusWatcher] = None,
 ) -> Dict:
-    start_time: datetime = datetime.now()
-    while True:
-        if datetime.now() - start_time > timedelta(seconds=timeout):
-            raise RuntimeError(
-                f"Robot '{robot_name}' did not reach status '{expected_status}' within the given timeout {timeout} seconds"
-            )
+    status_event_waiter: _StatusEventWaiter = _StatusEventWaiter(
+        status_watcher=status_watcher,
+        kind="robot",
+        timeout=timeout,
+        robot_name=robot_name,
+    )
+    robot_ids: Dict[str, str] = {}
 
-        try:
+    def has_expected_status() -> Optional[Dict]:
+        status_event_waiter.mark_seen()
+        # Only the first lookup lists every robot, later lookups fetch the robot by ID
+        if robot_name not in robot_ids:
             robot: Dict = get_robot_by_name(backend_url=backend_url, name=robot_name)
-        except Exception:
-            logger.warning(
-                f"Failed to retrieve robot with name {robot_name}, will retry until timeout..."
+            robot_ids[robot_name] = robot.get("id")
+        else:
+            robot = get_robot_by_id(
+                backend_url=backend_url, robot_id=robot_ids[robot_name]
             )
-            time.sleep(1)
-            continue
-
         current_status: str = robot.get("status")
-        if current_status == expected_status:
-            logger.info(
-                f"Robot with name '{robot_name}' has reached expected status '{expected_status}'"
-            )
-            return robot
-        else:
+        if current_status != expected_status:
             logger.info(
                 f"Robot with name '{robot_name}' is in status '{current_status}', waiting for status '{expected_status}'"
             )
-            time.sleep(1)
-            continue
+            return None
+        return robot
+
+    robot: Dict = poll_until(
+        condition=has_expected_status,
+        description=f"Waiting for robot '{robot_name}' to reach status '{expected_status}'",
+        timeout=timeout,
+        timeout_message=f"Robot '{robot_name}' did not reach status '{expected_status}' within the given timeout {timeout} seconds",
+        timeout_exception=RuntimeError,
+        sleep=status_event_waiter.sleep,
+    ).value
+    logger.info(
+        f"Robot with name '{robot_name}' has reached expected status '{expected_status}'"
+    )
+    return robot
+
+
+class _StatusEventWaiter:
+    """Sleeps between status polls until the status watcher sees a relevant event.
+
+    The event count is marked right before the backend is queried, so an event that
+    arrives while the query is in flight still wakes the next sleep. Without a status
+    watcher this is a plain sleep of the polling interval. A sleep never extends past
+    the deadline of the wait, timeout seconds after the waiter was created.
+    """
+
+    def __init__(
+        self,
+        status_watcher: Optional[FlotillaStatusWatcher],
+        kind: str,
+        timeout: float,
+        robot_name: Optional[str] = None,
+    ) -> None:
+        self.status_watcher: Optional[FlotillaStatusWatcher] = status_watcher
+        self.kind: str = kind
+        self.robot_name: Optional[str] = robot_name
+        self.deadline: float = time.monotonic() + timeout
+        self.seen_event_count: int = 0
+
+    def mark_seen(self) -> None:
+        if self.status_watcher is not None:
+            self.seen_event_count = self.status_watcher.event_count(
+                kind=self.kind, robot_name=self.robot_name
+            )
+
+    def sleep(self, interval: float) -> None:
+        if self.status_watcher is None:
+            time.sleep(interval)
+            return
+        # The backend may process an event after the status was read, so the fallback
+        # interval bounds how long a status change can go unnoticed
+        if self.status_watcher.wait_for_next_event(
+            kind=self.kind,
+            seen_count=self.seen_event_count,
+            timeout=min(settings.STATUS_WATCHER_FALLBACK_INTERVAL, self._remaining()),
+            robot_name=self.robot_name,
+        ):
+            # Give the backend a moment to process the event before reading the status
+            time.sleep(min(settings.STATUS_WATCHER_PROCESSING_DELAY, self._remaining()))
+
+    def _remaining(self) -> float:
+        return max(self.deadline - time.monotonic(), 0)
 
 
 def pause_mission(backend_url: str, robot_id: str) -> None:
     url: str = f"{backend_url}/robots/{robot_id}/pause"
-    response: Response = requests.post(
-        url,
-        headers=_add_headers(),
+    response: Response = _client(backend_url).post(
+        f"robots/{robot_id}/pause", endpoint="robots/{id}/pause"
     )
     if not response.ok:
         body = response.text
@@ -569,9 +490,8 @@ def pause_mission(backend_url: str, robot_id: str) -> None:
 
 def resume_mission(backend_url: str, robot_id: str) -> None:
     url = str(f"{backend_url}/robots/{robot_id}/resume")
-    response: Response = requests.post(
-        url,
-        headers=_add_headers(),
+    response: Response = _client(backend_url).post(
+        f"robots/{robot_id}/resume", endpoint="robots/{id}/resume"
     )
     if not response.ok:
         body = response.text
@@ -0,0 +1,367 @@
+import asyncio
+import time
+from types import TracebackType
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Type
+
+import httpx
+from loguru import logger
+
+from robotics_integration_tests.settings.settings import settings
+from robotics_integration_tests.utilities.authentication import (
+    retrieve_access_token_for_integration_tests_app_async,
+)
+from robotics_integration_tests.utilities.backend_client import EndpointLatencies
+from robotics_integration_tests.utilities.mission_timeline import (
+    record_mission_run,
+    record_robot,
+)
+from robotics_integration_tests.utilities.polling import poll_until_async
+
+
+class AsyncFlotillaBackendClient:
+    """Asyncio client for the Flotilla backend, use it as an async context manager.
+
+    Requests share one connection pool, so many robots and missions can be scheduled
+    and watched from a single event loop with asyncio.gather. Connection failures are
+    retried by the transport, status codes are left to the callers like in the
+    synchronous API.
+    """
+
+    def __init__(self, backend_url: str) -> None:
+        self.backend_url: str = backend_url.rstrip("/")
+        self.latencies: EndpointLatencies = EndpointLatencies()
+        self.client: httpx.AsyncClient = httpx.AsyncClient(
+            base_url=self.backend_url,
+            timeout=httpx.Timeout(
+                settings.HTTP_READ_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT
+            ),
+            limits=httpx.Limits(max_connections=settings.HTTP_POOL_MAXSIZE),
+            transport=httpx.AsyncHTTPTransport(retries=settings.HTTP_MAX_RETRIES),
+        )
+
+    async def __aenter__(self) -> "AsyncFlotillaBackendClient":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        summary: str = self.latencies.summary()
+        if summary:
+            logger.info(f"Request latencies for {self.backend_url}:\n{summary}")
+        await self.client.aclose()
+
+    async def request(
+        self, method: str, path: str, endpoint: Optional[str] = None, **kwargs: Any
+    ) -> httpx.Response:
+        access_token: str = await retrieve_access_token_for_integration_tests_app_async(
+            settings.FLOTILLA_AZURE_CLIENT_ID
+        )
+        start_time: float = time.monotonic()
+        failed: bool = True
+        try:
+            response: httpx.Response = await self.client.request(
+                method,
+                f"/{path.lstrip('/')}",
+                headers={"Authorization": f"Bearer {access_token}"},
+                **kwargs,
+            )
+            failed = response.is_error
+            return response
+        finally:
+            self.latencies.record(
+                f"{method} {endpoint or path}", time.monotonic() - start_time, failed
+            )
+
+
+def _raise_for_unexpected_response(
+    response: httpx.Response, payload: Optional[Dict] = None
+) -> None:
+    if response.is_success:
+        return
+    try:
+        problem = response.json()
+    except ValueError:
+        problem = None
+    raise AssertionError(
+        f"{response.request.method} {response.request.url} returned {response.status_code}\n"
+        f"Request payload:\n{payload}\n"
+        f"Response headers: {dict(response.headers)}\n"
+        f"Response body:\n{response.text}\n"
+        f"Parsed JSON (if any):\n{problem}"
+    )
+
+
+async def list_database_entries(
+    client: AsyncFlotillaBackendClient, request_path: str
+) -> List[Dict]:
+    response: httpx.Response = await client.request("GET", request_path)
+    response.raise_for_status()
+    return response.json()
+
+
+async def schedule_mission(
+    client: AsyncFlotillaBackendClient,
+    robot_id: str,
+    mission_id: str,
+    installation_code: str,
+) -> Dict:
+    payload: Dict = {
+        "robotId": robot_id,
+        "missionSourceId": mission_id,
+        "installationCode": installation_code,
+    }
+    response: httpx.Response = await client.request("POST", "missions", json=payload)
+    _raise_for_unexpected_response(response, payload=payload)
+    mission_run: Dict = response.json()
+    record_mission_run(mission_run)
+    return mission_run
+
+
+async def schedule_missions(
+    client: AsyncFlotillaBackendClient, missions: Sequence[Dict[str, str]]
+) -> List[Dict]:
+    """Schedule missions concurrently, each given as the schedule_mission arguments."""
+    return list(
+        await asyncio.gather(
+            *(schedule_mission(client=client, **mission) for mission in missions)
+        )
+    )
+
+
+async def pause_mission(client: AsyncFlotillaBackendClient, robot_id: str) -> None:
+    response: httpx.Response = await client.request(
+        "POST", f"robots/{robot_id}/pause", endpoint="robots/{id}/pause"
+    )
+    _raise_for_unexpected_response(response)
+
+
+async def resume_mission(client: AsyncFlotillaBackendClient, robot_id: str) -> None:
+    response: httpx.Response = await client.request(
+        "POST", f"robots/{robot_id}/resume", endpoint="robots/{id}/resume"
+    )
+    _raise_for_unexpected_response(response)
+
+
+async def get_mission_run_by_id(
+    client: AsyncFlotillaBackendClient, mission_run_id: str
+) -> Dict:
+    response: httpx.Response = await client.request(
+        "GET", f"missions/runs/{mission_run_id}", endpoint="missions/runs/{id}"
+    )
+    response.raise_for_status()
+    mission_run: Dict = response.json()
+    record_mission_run(mission_run)
+    return mission_run
+
+
+async def get_robot_by_id(client: AsyncFlotillaBackendClient, robot_id: str) -> Dict:
+    response: httpx.Response = await client.request(
+        "GET", f"robots/{robot_id}", endpoint="robots/{id}"
+    )
+    response.raise_for_status()
+    robot: Dict = response.json()
+    record_robot(robot)
+    return robot
+
+
+async def get_robot_by_name(client: AsyncFlotillaBackendClient, name: str) -> Dict:
+    robots: List[Dict] = await list_database_entries(client, "robots")
+    for robot in robots:
+        record_robot(robot)
+
+    for robot in robots:
+        if robot.get("name") == name:
+            return robot
+    raise RuntimeError(f"Robot with name '{name}' not found")
+
+
+async def wait_for_mission_run_status(
+    client: AsyncFlotillaBackendClient,
+    mission_run_id: str,
+    expected_status: str,
+    timeout: int = 60,
+) -> Dict:
+    async def has_expected_status() -> Optional[Dict]:
+        mission_run: Dict = await get_mission_run_by_id(client, mission_run_id)
+        if mission_run.get("status") != expected_status:
+            return None
+        return mission_run
+
+    return (
+        await poll_until_async(
+            condition=has_expected_status,
+            description=f"Waiting for mission run '{mission_run_id}' to reach status '{expected_status}'",
+            timeout=timeout,
+            timeout_message=(
+                f"Mission run '{mission_run_id}' did not reach status '{expected_status}' within the given timeout "
+                f"{timeout} seconds"
+            ),
+            timeout_exception=RuntimeError,
+        )
+    ).value
+
+
+async def wait_for_mission_runs_status(
+    client: AsyncFlotillaBackendClient,
+    mission_run_ids: Sequence[str],
+    expected_status: str,
+    timeout: int = 60,
+) -> List[Dict]:
+    return list(
+        await asyncio.gather(
+            *(
+                wait_for_mission_run_status(
+                    client=client,
+                    mission_run_id=mission_run_id,
+                    expected_status=expected_status,
+                    timeout=timeout,
+                )
+                for mission_run_id in mission_run_ids
+            )
+        )
+    )
+
+
+async def wait_for_robot_status(
+    client: AsyncFlotillaBackendClient,
+    robot_id: str,
+    expected_status: str,
+    timeout: int = 60,
+) -> Dict:
+    async def has_expected_status() -> Optional[Dict]:
+        robot: Dict = await get_robot_by_id(client, robot_id)
+        if robot.get("status") != expected_status:
+            return None
+        return robot
+
+    return (
+        await poll_until_async(
+            condition=has_expected_status,
+            description=f"Waiting for robot '{robot_id}' to reach status '{expected_status}'",
+            timeout=timeout,
+            timeout_message=f"Robot '{robot_id}' did not reach status '{expected_status}' within the given timeout {timeout} seconds",
+            timeout_exception=RuntimeError,
+        )
+    ).value
+
+
+async def wait_for_robots_status(
+    client: AsyncFlotillaBackendClient,
+    robot_ids: Sequence[str],
+    expected_status: str,
+    timeout: int = 60,
+) -> List[Dict]:
+    return list(
+        await asyncio.gather(
+            *(
+                wait_for_robot_status(
+                    client=client,
+                    robot_id=robot_id,
+                    expected_status=expected_status,
+                    timeout=timeout,
+                )
+                for robot_id in robot_ids
+            )
+        )
+    )
+
+
+async def get_inspection_area_id_for_installation(
+    client: AsyncFlotillaBackendClient, installation_code: str
+) -> str:
+    response: httpx.Response = await client.request(
+        "GET",
+        f"inspectionAreas/installation/{installation_code}",
+        endpoint="inspectionAreas/installation/{installationCode}",
+    )
+    response.raise_for_status()
+    return response.json()[0]["id"]
+
+
+async def set_current_inspection_area_for_robot(
+    client: AsyncFlotillaBackendClient, inspection_area_id: str, robot_id: str
+) -> None:
+    response: httpx.Response = await client.request(
+        "PATCH",
+        f"robots/{robot_id}/currentInspectionArea/{inspection_area_id}",
+        endpoint="robots/{id}/currentInspectionArea/{inspectionAreaId}",
+    )
+    response.raise_for_status()
+
+
+async def setup_robots_in_flotilla(
+    client: AsyncFlotillaBackendClient, robot_names: Sequence[str], timeout: int = 120
+) -> Dict[str, Tuple[str, str]]:
+    """Asynchronous counterpart of setup_robot_in_flotilla for a whole fleet.
+
+    Every poll lists the robots once for the fleet instead of once per robot. Returns
+    the robot id and installation code of every robot by name.
+    """
+    names: Set[str] = set(robot_names)
+
+    async def robots_with(
+        condition: Callable[[Dict], bool],
+    ) -> Optional[Dict[str, Dict]]:
+        robots: Dict[str, Dict] = {
+            robot.get("name"): robot
+            for robot in await list_database_entries(client, "robots")
+            if robot.get("name") in names and condition(robot)
+        }
+        return robots if len(robots) == len(names) else None
+
+    robots: Dict[str, Dict] = (
+        await poll_until_async(
+            condition=lambda: robots_with(lambda robot: True),
+            description=f"Waiting for {len(names)} robots to be populated in the database",
+            timeout=timeout,
+            timeout_message=f"{len(names)} robots were not populated in the database within the given timeout {timeout} seconds",
+            timeout_exception=RuntimeError,
+        )
+    ).value
+
+    installation_codes: Set[str] = {
+        robot["currentInstallation"]["installationCode"] for robot in robots.values()
+    }
+    inspection_area_ids: Dict[str, str] = dict(
+        zip(
+            installation_codes,
+            await asyncio.gather(
+                *(
+                    get_inspection_area_id_for_installation(client, installation_code)
+                    for installation_code in installation_codes
+                )
+            ),
+        )
+    )
+    await asyncio.gather(
+        *(
+            set_current_inspection_area_for_robot(
+                client,
+                inspection_area_id=inspection_area_ids[
+                    robot["currentInstallation"]["installationCode"]
+                ],
+                robot_id=robot["id"],
+            )
+            for robot in robots.values()
+        )
+    )
+    await poll_until_async(
+        condition=lambda: robots_with(
+            lambda robot: robot.get("currentInspectionAreaId") is not None
+        ),
+        description=f"Waiting for inspection areas on {len(names)} robots",
+        timeout=timeout,
+        timeout_message=f"Inspection areas on {len(names)} robots were not updated within the given timeout {timeout} seconds",
+        timeout_exception=RuntimeError,
+    )
+    logger.info(f"{len(names)} robots are set up in Flotilla")
+    return {
+        name: (robot["id"], robot["currentInstallation"]["installationCode"])
+        for name, robot in robots.items()
+    }
@@ -0,0 +1,790 @@
+import asyncio
+import json
+import random
+import ssl
+import uuid
+from datetime import datetime, timezone
+from http import HTTPStatus
+from threading import Event, Thread
+from types import TracebackType
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Set,
+    Tuple,
+    Type,
+)
+
+import paho.mqtt.client as mqtt
+from loguru import logger
+
+from robotics_integration_tests.settings.settings import settings
+from robotics_integration_tests.utilities.blob_storage import get_blob_service_client
+
+# Capabilities the simulated robots report in their robot info, like isar-robot
+_capabilities: Tuple[str, ...] = (
+    "take_image",
+    "take_thermal_image",
+    "take_video",
+    "take_thermal_video",
+    "record_audio",
+    "return_to_home",
+)
+
+# Robot statuses in which ISAR accepts a new mission
+_idle_robot_statuses: frozenset = frozenset(("home", "available"))
+
+
+def _timestamp() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class SimulationParameters:
+    """Behaviour of simulated robots, the knobs of the isar-robot container env.
+
+    A mission starts time_to_start seconds after it is received
+    (MISSION_SIMULATION_TIME_TO_START), and its tasks then run one after the other for
+    mission_completion_delay seconds in total
+    (ROBOT_MISSION_SIMULATION_MISSION_COMPLETION_DELAY). Every task fails with
+    task_failure_probability (ROBOT_MISSION_SIMULATION_TASK_FAILURE_PROBABILITY) and
+    successful tasks upload their inspection to blob storage when upload_blobs is set.
+    """
+
+    def __init__(
+        self,
+        time_to_start: float,
+        task_failure_probability: float,
+        mission_completion_delay: float,
+        return_home_delay: float,
+        upload_blobs: bool,
+        heartbeat_interval: float,
+        robot_info_interval: float,
+    ) -> None:
+        self.time_to_start: float = time_to_start
+        self.task_failure_probability: float = task_failure_probability
+        self.mission_completion_delay: float = mission_completion_delay
+        self.return_home_delay: float = return_home_delay
+        self.upload_blobs: bool = upload_blobs
+        self.heartbeat_interval: float = heartbeat_interval
+        self.robot_info_interval: float = robot_info_interval
+
+    @classmethod
+    def from_settings(
+        cls, should_fail_normal_task: bool = False
+    ) -> "SimulationParameters":
+        return cls(
+            time_to_start=settings.ISAR_SIMULATOR_TIME_TO_START,
+            task_failure_probability=(
+                1.0
+                if should_fail_normal_task
+                else settings.ISAR_SIMULATOR_TASK_FAILURE_PROBABILITY
+            ),
+            mission_completion_delay=settings.ISAR_SIMULATOR_MISSION_COMPLETION_DELAY,
+            return_home_delay=settings.ISAR_SIMULATOR_RETURN_HOME_DELAY,
+            upload_blobs=settings.ISAR_SIMULATOR_UPLOAD_BLOBS,
+            heartbeat_interval=settings.ISAR_SIMULATOR_HEARTBEAT_INTERVAL,
+            robot_info_interval=settings.ISAR_SIMULATOR_ROBOT_INFO_INTERVAL,
+        )
+
+
+class Publisher(Protocol):
+    def publish(self, topic: str, payload: Dict[str, Any], qos: int = 1) -> None: ...
+
+
+class MqttPublisher:
+    """One MQTT connection publishing for every simulated robot.
+
+    The broker does not care which client publishes on a topic, so a single paho
+    client with a large in-flight window replaces one connection and network thread per
+    robot. publish() only queues the message and can be called from any thread.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        use_tls: bool = True,
+    ) -> None:
+        self.host: str = host
+        self.port: int = port
+        self._connected: Event = Event()
+
+        self.client: mqtt.Client = mqtt.Client(
+            mqtt.CallbackAPIVersion.VERSION2,
+            client_id=f"armada-isar-simulator-{uuid.uuid4().hex[:8]}",
+        )
+        self.client.username_pw_set(username=username, password=password)
+        if use_tls:
+            # The broker certificate is issued for the "broker" network alias, not localhost
+            self.client.tls_set(cert_reqs=ssl.CERT_NONE)
+            self.client.tls_insecure_set(True)
+        self.client.max_inflight_messages_set(settings.ISAR_SIMULATOR_MQTT_MAX_INFLIGHT)
+        self.client.on_connect = self._on_connect
+
+    def start(self, timeout: float = 10) -> None:
+        self.client.connect(host=self.host, port=self.port)
+        self.client.loop_start()
+        if not self._connected.wait(timeout=timeout):
+            self.stop()
+            raise ConnectionError(
+                f"ISAR simulator could not connect to broker {self.host}:{self.port} within {timeout} seconds"
+            )
+        logger.info(f"ISAR simulator connected to broker {self.host}:{self.port}")
+
+    def stop(self) -> None:
+        self.client.disconnect()
+        self.client.loop_stop()
+
+    def publish(self, topic: str, payload: Dict[str, Any], qos: int = 1) -> None:
+        self.client.publish(topic, json.dumps(payload), qos=qos)
+
+    def _on_connect(
+        self,
+        client: mqtt.Client,
+        userdata: Any,
+        flags: mqtt.ConnectFlags,
+        reason_code: mqtt.ReasonCode,
+        properties: mqtt.Properties,
+    ) -> None:
+        if reason_code.is_failure:
+            logger.warning(f"ISAR simulator failed to connect to broker: {reason_code}")
+            return
+        self._connected.set()
+
+
+class BlobUploader:
+    """Uploads the inspection data and metadata of simulated tasks, like ISAR does to
+    its data and metadata storage accounts."""
+
+    def __init__(
+        self,
+        connection_string_data: str,
+        connection_string_metadata: str,
+        storage_account: str,
+    ) -> None:
+        self.connection_string_data: str = connection_string_data
+        self.connection_string_metadata: str = connection_string_metadata
+        self.storage_account: str = storage_account
+
+    def upload(
+        self, container_name: str, blob_name: str, metadata: Dict[str, Any]
+    ) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Upload a placeholder image and its metadata, returns their blob paths."""
+        data_path: Dict[str, str] = self._upload(
+            self.connection_string_data,
+            container_name,
+            f"{blob_name}.jpg",
+            uuid.uuid4().bytes,
+        )
+        metadata_path: Dict[str, str] = self._upload(
+            self.connection_string_metadata,
+            container_name,
+            f"{blob_name}.json",
+            json.dumps(metadata).encode(),
+        )
+        return data_path, metadata_path
+
+    def _upload(
+        self, connection_string: str, container_name: str, blob_name: str, data: bytes
+    ) -> Dict[str, str]:
+        get_blob_service_client(connection_string).get_blob_client(
+            container=container_name, blob=blob_name
+        ).upload_blob(data, overwrite=True)
+        return {
+            "storage_account": self.storage_account,
+            "blob_container": container_name,
+            "blob_name": blob_name,
+        }
+
+
+class SimulatedMission:
+    def __init__(self, mission_id: str, name: str, tasks: List[Dict[str, Any]]) -> None:
+        self.mission_id: str = mission_id
+        self.name: str = name
+        self.started_at: datetime = datetime.now(timezone.utc)
+        self.tasks: List[Dict[str, Any]] = tasks
+        self.status: str = "not_started"
+        self.current_task: Optional[Dict[str, Any]] = None
+        self.runner: Optional[asyncio.Task] = None
+
+
+class SimulatedIsarRobot:
+    """A robot that behaves like an isar-robot container towards Flotilla.
+
+    The robot publishes its robot info, heartbeat and status on the isar/<isar id>
+    topics and serves the ISAR mission control API on its own port, which Flotilla
+    learns from the robot info. It has the attributes of IsarRobot except for a
+    container, so it can be used wherever the tests use armada.robots.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        isar_id: str,
+        installation_code: str,
+        parameters: SimulationParameters,
+        publisher: Publisher,
+        uploader: Optional[BlobUploader] = None,
+    ) -> None:
+        self.container: None = None
+        self.name: str = name
+        self.isar_id: str = isar_id
+        self.robot_id: str = ""
+        self.port: int = 0
+        self.alias: str = ""
+        self.installation_code: str = installation_code
+        self.parameters: SimulationParameters = parameters
+        self.publisher: Publisher = publisher
+        self.uploader: Optional[BlobUploader] = uploader
+        self.status: str = "home"
+        self.mission: Optional[SimulatedMission] = None
+        self.missions_received: int = 0
+        self._server: Optional[asyncio.Server] = None
+        self._connections: Set[asyncio.StreamWriter] = set()
+        self._background: List[asyncio.Task] = []
+        self._return_home: Optional[asyncio.Task] = None
+        # Set while the current mission may run, cleared while it is paused
+        self._running: asyncio.Event = asyncio.Event()
+        self._paused: asyncio.Event = asyncio.Event()
+
+    async def start(self, bind_host: str, advertised_host: str) -> None:
+        """Listen on a free port and announce the robot on the broker."""
+        self._server = await asyncio.start_server(
+            self._handle_connection, host=bind_host, port=0
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.alias = advertised_host
+        self._publish_robot_info()
+        self._set_status(self.status)
+        self._background = [
+            asyncio.create_task(
+                self._publish_periodically(
+                    self._publish_robot_info, self.parameters.robot_info_interval
+                )
+            ),
+            asyncio.create_task(
+                self._publish_periodically(
+                    self._publish_heartbeat, self.parameters.heartbeat_interval
+                )
+            ),
+        ]
+
+    async def stop(self) -> None:
+        tasks: List[asyncio.Task] = [*self._background]
+        if self._return_home is not None:
+            tasks.append(self._return_home)
+        if self.mission is not None and self.mission.runner is not None:
+            tasks.append(self.mission.runner)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+        # Keep-alive connections from Flotilla would keep the server open otherwise
+        for writer in list(self._connections):
+            writer.close()
+        if self._server is not None:
+            await self._server.wait_closed()
+        self._set_status("offline")
+
+    def _topic(self, topic: str) -> str:
+        return f"isar/{self.isar_id}/{topic}"
+
+    def _publish(self, topic: str, payload: Dict[str, Any], qos: int = 1) -> None:
+        self.publisher.publish(
+            self._topic(topic),
+            {
+                "isar_id": self.isar_id,
+                "robot_name": self.name,
+                **payload,
+                "timestamp": _timestamp(),
+            },
+            qos=qos,
+        )
+
+    def _publish_robot_info(self) -> None:
+        self._publish(
+            "robot_info",
+            {
+                "robot_model": "Robot",
+                "robot_serial_number": self.isar_id,
+                "robot_asset": self.installation_code,
+                "documentation": [],
+                "host": self.alias,
+                "port": self.port,
+                "capabilities": list(_capabilities),
+            },
+        )
+
+    def _publish_heartbeat(self) -> None:
+        self._publish("robot_heartbeat", {}, qos=0)
+
+    async def _publish_periodically(
+        self, publish: Callable[[], None], interval: float
+    ) -> None:
+        # Spread the robots over the interval so a fleet does not publish in bursts
+        await asyncio.sleep(random.uniform(0, interval))
+        while True:
+            publish()
+            await asyncio.sleep(interval)
+
+    def _set_status(self, status: str) -> None:
+        self.status = status
+        self._publish("status", {"status": status})
+
+    def _publish_mission_status(self, mission: SimulatedMission, status: str) -> None:
+        mission.status = status
+        self._publish(
+            "mission",
+            {
+                "mission_id": mission.mission_id,
+                "status": status,
+                "error_reason": None,
+                "error_description": None,
+            },
+        )
+
+    def _publish_task_status(
+        self,
+        mission: SimulatedMission,
+        task: Dict[str, Any],
+        status: str,
+        error_description: Optional[str] = None,
+    ) -> None:
+        task["status"] = status
+        self._publish(
+            "task",
+            {
+                "mission_id": mission.mission_id,
+                "task_id": task["id"],
+                "task_type": task["type"],
+                "status": status,
+                "error_reason": None,
+                "error_description": error_description,
+            },
+        )
+
+    async def handle_request(
+        self, method: str, path: str, body: Dict[str, Any]
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Serve a request to the ISAR API, returns the status code and JSON body."""
+        handlers: Dict[
+            Tuple[str, str],
+            Callable[[Dict[str, Any]], Awaitable[Tuple[int, Dict[str, Any]]]],
+        ] = {
+            ("POST", "/schedule/start-mission"): self._start_mission,
+            ("POST", "/schedule/stop-mission"): self._stop_mission,
+            ("POST", "/schedule/pause-mission"): self._pause_mission,
+            ("POST", "/schedule/resume-mission"): self._resume_mission,
+            ("POST", "/schedule/return-home"): self._request_return_home,
+        }
+        handler = handlers.get((method, path.rstrip("/")))
+        if handler is None:
+            return HTTPStatus.NOT_FOUND, {"detail": f"{method} {path} is not simulated"}
+        return await handler(body)
+
+    async def _start_mission(self, body: Dict[str, Any]) -> Tuple[int, Dict]:
+        if self.status not in _idle_robot_statuses and self.status != "returning_home":
+            return HTTPStatus.CONFLICT, {
+                "detail": f"Robot is {self.status} and cannot start a mission"
+            }
+        self._cancel_return_home()
+
+        definition: Dict[str, Any] = body.get("mission_definition") or body
+        tasks: List[Dict[str, Any]] = [
+            {
+                "id": task.get("id") or str(uuid.uuid4()),
+                "type": task.get("type") or "inspection",
+                "tag_id": task.get("tag") or task.get("tag_id"),
+                "inspection_id": str(uuid.uuid4()),
+                "inspection_type": (task.get("inspection") or {}).get("type"),
+                "description": (task.get("inspection") or {}).get(
+                    "inspection_description"
+                )
+                or task.get("description")
+                or "",
+            }
+            for task in definition.get("tasks") or []
+        ]
+        mission: SimulatedMission = SimulatedMission(
+            mission_id=definition.get("id") or str(uuid.uuid4()),
+            name=definition.get("name") or "",
+            tasks=tasks,
+        )
+        self.mission = mission
+        self.missions_received += 1
+        self._running.set()
+        self._paused.clear()
+        self._set_status("busy")
+        self._publish_mission_status(mission, "not_started")
+        mission.runner = asyncio.create_task(self._run_mission(mission))
+
+        return HTTPStatus.OK, {
+            "id": mission.mission_id,
+            "tasks": [
+                {
+                    "id": task["id"],
+                    "tag_id": task["tag_id"],
+                    "inspection_id": task["inspection_id"],
+                    "type": task["type"],
+                }
+                for task in tasks
+            ],
+        }
+
+    async def _stop_mission(self, body: Dict[str, Any]) -> Tuple[int, Dict]:
+        mission: Optional[SimulatedMission] = self.mission
+        if mission is None or mission.runner is None or mission.runner.done():
+            return HTTPStatus.CONFLICT, {"detail": "No active mission to stop"}
+        mission.runner.cancel()
+        await asyncio.gather(mission.runner, return_exceptions=True)
+        if mission.current_task is not None:
+            self._publish_task_status(mission, mission.current_task, "cancelled")
+        self._publish_mission_status(mission, "cancelled")
+        self.mission = None
+        self._start_return_home()
+        return HTTPStatus.OK, self._control_response(mission)
+
+    async def _pause_mission(self, body: Dict[str, Any]) -> Tuple[int, Dict]:
+        mission: Optional[SimulatedMission] = self.mission
+        if mission is None or mission.status != "in_progress":
+            return HTTPStatus.CONFLICT, {"detail": "No mission in progress to pause"}
+        self._running.clear()
+        self._paused.set()
+        if mission.current_task is not None:
+            self._publish_task_status(mission, mission.current_task, "paused")
+        self._publish_mission_status(mission, "paused")
+        self._set_status("paused")
+        return HTTPStatus.OK, self._control_response(mission)
+
+    async def _resume_mission(self, body: Dict[str, Any]) -> Tuple[int, Dict]:
+        mission: Optional[SimulatedMission] = self.mission
+        if mission is None or mission.status != "paused":
+            return HTTPStatus.CONFLICT, {"detail": "No paused mission to resume"}
+        self._paused.clear()
+        self._running.set()
+        self._publish_mission_status(mission, "in_progress")
+        if mission.current_task is not None:
+            self._publish_task_status(mission, mission.current_task, "in_progress")
+        self._set_status("busy")
+        return HTTPStatus.OK, self._control_response(mission)
+
+    async def _request_return_home(self, body: Dict[str, Any]) -> Tuple[int, Dict]:
+        if self.status not in _idle_robot_statuses and self.status != "returning_home":
+            return HTTPStatus.CONFLICT, {
+                "detail": f"Robot is {self.status} and cannot return home"
+            }
+        if self.status == "available":
+            self._start_return_home()
+        return HTTPStatus.OK, {}
+
+    @staticmethod
+    def _control_response(mission: SimulatedMission) -> Dict[str, Any]:
+        task: Dict[str, Any] = mission.current_task or {}
+        return {
+            "mission_id": mission.mission_id,
+            "mission_status": mission.status,
+            "task_id": task.get("id"),
+            "task_status": task.get("status"),
+        }
+
+    async def _run_mission(self, mission: SimulatedMission) -> None:
+        await self._sleep(self.parameters.time_to_start)
+        self._publish_mission_status(mission, "in_progress")
+
+        task_duration: float = self.parameters.mission_completion_delay / max(
+            len(mission.tasks), 1
+        )
+        failed_tasks: int = 0
+        for task in mission.tasks:
+            mission.current_task = task
+            self._publish_task_status(mission, task, "in_progress")
+            await self._sleep(task_duration)
+            if random.random() < self.parameters.task_failure_probability:
+                failed_tasks += 1
+                self._publish_task_status(
+                    mission, task, "failed", error_description="Simulated task failure"
+                )
+                continue
+            self._publish_task_status(mission, task, "successful")
+            if self.parameters.upload_blobs and self.uploader is not None:
+                await self._upload_inspection(mission, task)
+        mission.current_task = None
+
+        if failed_tasks == 0:
+            self._publish_mission_status(mission, "successful")
+        elif failed_tasks == len(mission.tasks):
+            self._publish_mission_status(mission, "failed")
+        else:
+            self._publish_mission_status(mission, "partially_successful")
+        self.mission = None
+        self._start_return_home()
+
+    async def _sleep(self, duration: float) -> None:
+        """Sleep for duration seconds of mission time, time paused does not count."""
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        remaining: float = duration
+        while remaining > 0:
+            await self._running.wait()
+            started_at: float = loop.time()
+            try:
+                await asyncio.wait_for(self._paused.wait(), timeout=remaining)
+            except TimeoutError:
+                return
+            remaining -= loop.time() - started_at
+
+    async def _upload_inspection(
+        self, mission: SimulatedMission, task: Dict[str, Any]
+    ) -> None:
+        container_name: str = self.installation_code.lower()
+        metadata: Dict[str, Any] = {
+            "mission_id": mission.mission_id,
+            "task_id": task["id"],
+            "tag_id": task["tag_id"],
+            "inspection_id": task["inspection_id"],
+            "robot_name": self.name,
+            "installation_code": self.installation_code,
+        }
+        # The folder and file names of ISAR, see get_foldername and get_filename in
+        # isar/storage/utilities.py
+        folder: str = (
+            f"{mission.started_at.date()}__{self.installation_code}__"
+            f"{mission.name}__{mission.mission_id}"
+        )
+        file_name: str = (
+            f"{task['tag_id'] or 'no-tag'}__{task['inspection_type']}__"
+            f"{task['description']}__{datetime.now(timezone.utc).strftime('%H%M%S')}"
+        )
+        try:
+            data_path, metadata_path = await asyncio.to_thread(
+                self.uploader.upload, container_name, f"{folder}/{file_name}", metadata
+            )
+        except Exception as e:
+            logger.warning(f"{self.name} failed to upload inspection {task['id']}: {e}")
+            return
+        self._publish(
+            "inspection_result",
+            {
+                "inspection_id": task["inspection_id"],
+                "blob_storage_data_path": data_path,
+                "blob_storage_metadata_path": metadata_path,
+                "installation_code": self.installation_code,
+                "tag_id": task["tag_id"],
+                "inspection_type": task["inspection_type"],
+                "inspection_description": None,
+            },
+        )
+
+    def _start_return_home(self) -> None:
+        self._cancel_return_home()
+        self._return_home = asyncio.create_task(self._run_return_home())
+
+    def _cancel_return_home(self) -> None:
+        if self._return_home is not None:
+            self._return_home.cancel()
+            self._return_home = None
+
+    async def _run_return_home(self) -> None:
+        self._set_status("returning_home")
+        await asyncio.sleep(self.parameters.return_home_delay)
+        self._set_status("home")
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._connections.add(writer)
+        try:
+            while True:
+                request_line: bytes = await reader.readline()
+                if not request_line.strip():
+                    return
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: Dict[str, str] = await _read_headers(reader)
+                body: bytes = await _read_body(reader, headers)
+                try:
+                    payload: Dict[str, Any] = json.loads(body) if body else {}
+                except ValueError:
+                    status, response = HTTPStatus.BAD_REQUEST, {
+                        "detail": "Invalid JSON"
+                    }
+                else:
+                    status, response = await self.handle_request(
+                        method, target.split("?", 1)[0], payload
+                    )
+                _write_response(writer, status, response)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            return
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    while True:
+        line: bytes = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: Dict[str, str]) -> bytes:
+    if headers.get("transfer-encoding", "").lower() != "chunked":
+        return await reader.readexactly(int(headers.get("content-length") or 0))
+
+    # .NET sends JSON content without a length as chunked transfer encoding
+    chunks: List[bytes] = []
+    while True:
+        size: int = int((await reader.readline()).split(b";", 1)[0], 16)
+        if size == 0:
+            await _read_headers(reader)
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readline()
+
+
+def _write_response(
+    writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any]
+) -> None:
+    body: bytes = json.dumps(payload).encode()
+    writer.write(
+        (
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        ).encode("latin-1")
+        + body
+    )
+
+
+def _raise_open_file_limit(required: int) -> None:
+    """Raise the soft limit on open files, every robot needs a listening socket and
+    the connections Flotilla keeps open to it."""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY or soft >= required:
+        return
+    limit: int = required if hard == resource.RLIM_INFINITY else min(required, hard)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (limit, hard))
+    logger.info(f"Raised the open file limit from {soft} to {limit}")
+
+
+class IsarSimulator:
+    """Runs simulated ISAR robots on one asyncio event loop in a background thread.
+
+    Use it as a context manager: the event loop and the publisher are started on enter,
+    robots are added with add_robots() and every robot is stopped on exit. A robot costs
+    a listening socket and a few timers, so a single process runs thousands of them.
+    """
+
+    def __init__(
+        self,
+        publisher: Publisher,
+        parameters: SimulationParameters,
+        uploader: Optional[BlobUploader] = None,
+        bind_host: str = "0.0.0.0",
+        advertised_host: str = "localhost",
+    ) -> None:
+        self.publisher: Publisher = publisher
+        self.parameters: SimulationParameters = parameters
+        self.uploader: Optional[BlobUploader] = uploader
+        self.bind_host: str = bind_host
+        self.advertised_host: str = advertised_host
+        self.robots: Dict[str, SimulatedIsarRobot] = {}
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self._thread: Thread = Thread(
+            target=self.loop.run_forever, name="isar-simulator", daemon=True
+        )
+
+    def __enter__(self) -> "IsarSimulator":
+        self._thread.start()
+        start = getattr(self.publisher, "start", None)
+        if start is not None:
+            try:
+                start()
+            except BaseException:
+                self._stop_loop()
+                raise
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        try:
+            self.run(self._stop_robots())
+        finally:
+            stop = getattr(self.publisher, "stop", None)
+            if stop is not None:
+                stop()
+            self._stop_loop()
+
+    def run(self, coroutine: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the simulator event loop and return its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+
+    def add_robots(
+        self, robots: List[Tuple[str, str, str]]
+    ) -> Dict[str, SimulatedIsarRobot]:
+        """Start robots given as (name, isar id, installation code)."""
+        _raise_open_file_limit(4 * (len(self.robots) + len(robots)) + 256)
+        return self.run(self._start_robots(robots))
+
+    async def _start_robots(
+        self, robots: List[Tuple[str, str, str]]
+    ) -> Dict[str, SimulatedIsarRobot]:
+        started: Dict[str, SimulatedIsarRobot] = {}
+        for name, isar_id, installation_code in robots:
+            # Robots are created on the loop, their events belong to it
+            robot: SimulatedIsarRobot = SimulatedIsarRobot(
+                name=name,
+                isar_id=isar_id,
+                installation_code=installation_code,
+                parameters=self.parameters,
+                publisher=self.publisher,
+                uploader=self.uploader,
+            )
+            await robot.start(
+                bind_host=self.bind_host, advertised_host=self.advertised_host
+            )
+            started[name] = robot
+            self.robots[name] = robot
+        logger.info(f"Started {len(started)} simulated ISAR robots")
+        return started
+
+    async def _stop_robots(self) -> None:
+        results: List[Any] = await asyncio.gather(
+            *(robot.stop() for robot in self.robots.values()), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to stop a simulated ISAR robot: {result}")
+        self.robots.clear()
+
+        # Connection handlers and uploads still running would be destroyed pending
+        # when the loop stops
+        pending: Set[asyncio.Task] = asyncio.all_tasks() - {asyncio.current_task()}
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    def _stop_loop(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
@@ -1,4 +1,11 @@
-from typing import Union
+import fcntl
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional, Tuple, Union
 
 from azure.core.exceptions import (
     ClientAuthenticationError,
@@ -9,8 +16,30 @@ from azure.identity import ClientSecretCredential, DefaultAzureCredential
 from azure.keyvault.secrets import KeyVaultSecret, SecretClient
 from loguru import logger
 
+from robotics_integration_tests.settings.settings import settings
 
-class Keyvault:
+
+class Secret:
+    def __init__(self, name: str, value: str) -> None:
+        self.name: str = name
+        self.value: str = value
+
+
+class SecretBackend(ABC):
+    """Storage behind Keyvault, get_secret raises ResourceNotFoundError when missing.
+
+    The backend only holds the secrets of the test harness. Flotilla and Sara read
+    their own secrets from the Azure vault at KEYVAULT_URI whatever the backend is.
+    """
+
+    @abstractmethod
+    def get_secret(self, secret_name: str) -> str: ...
+
+    @abstractmethod
+    def set_secret(self, secret_name: str, secret_value: str) -> None: ...
+
+
+class AzureSecretBackend(SecretBackend):
     def __init__(
         self,
         keyvault_name: str,
@@ -25,7 +54,7 @@ class Keyvault:
         self.tenant_id = tenant_id
         self.client: SecretClient = None
 
-    def get_secret(self, secret_name: str) -> KeyVaultSecret:
+    def get_secret(self, secret_name: str) -> str:
         secret_client: SecretClient = self.get_secret_client()
         try:
             secret: KeyVaultSecret = secret_client.get_secret(name=secret_name)
@@ -43,9 +72,9 @@ class Keyvault:
             )
             raise
 
-        return secret
+        return secret.value
 
-    def set_secret(self, secret_name: str, secret_value) -> None:
+    def set_secret(self, secret_name: str, secret_value: str) -> None:
         secret_client: SecretClient = self.get_secret_client()
         try:
             secret_client.set_secret(name=secret_name, value=secret_value)
@@ -77,3 +106,123 @@ class Keyvault:
 
             self.client = SecretClient(vault_url=self.url, credential=credential)
         return self.client
+
+
+class MemorySecretBackend(SecretBackend):
+    def __init__(self) -> None:
+        self.secrets: Dict[str, str] = {}
+
+    def get_secret(self, secret_name: str) -> str:
+        if secret_name not in self.secrets:
+            raise ResourceNotFoundError(f"Secret {secret_name} was not found")
+        return self.secrets[secret_name]
+
+    def set_secret(self, secret_name: str, secret_value: str) -> None:
+        self.secrets[secret_name] = secret_value
+
+
+class FileSecretBackend(SecretBackend):
+    """Secrets in a local JSON file, shared by every process on the machine.
+
+    Writes hold an exclusive lock on the file and replace it atomically, so parallel
+    pytest-xdist workers can use the same file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: Path = Path(path)
+        self.lock_path: Path = self.path.with_name(self.path.name + ".lock")
+
+    def get_secret(self, secret_name: str) -> str:
+        secrets: Dict[str, str] = self._read()
+        if secret_name not in secrets:
+            raise ResourceNotFoundError(
+                f"Secret {secret_name} was not found in {self.path}"
+            )
+        return secrets[secret_name]
+
+    def set_secret(self, secret_name: str, secret_value: str) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            secrets: Dict[str, str] = self._read()
+            secrets[secret_name] = secret_value
+            temporary_path: Path = self.path.with_name(
+                f"{self.path.name}.{os.getpid()}.tmp"
+            )
+            temporary_path.write_text(json.dumps(secrets, indent=2))
+            os.replace(temporary_path, self.path)
+        logger.info(f"Secret {secret_name} was set in {self.path}")
+
+    def _read(self) -> Dict[str, str]:
+        if not self.path.exists():
+            return {}
+        return json.loads(self.path.read_text())
+
+
+class Keyvault:
+    """Secrets of an armada, read and written through a cache in front of a backend.
+
+    Writes go to the backend and the cache, reads are served from the cache until the
+    entry is older than cache_ttl seconds.
+    """
+
+    def __init__(
+        self,
+        keyvault_name: str,
+        client_id: str = None,
+        client_secret: str = None,
+        tenant_id: str = None,
+        backend: Optional[SecretBackend] = None,
+        cache_ttl: Optional[float] = None,
+    ):
+        self.name = keyvault_name
+        self.backend: SecretBackend = backend or AzureSecretBackend(
+            keyvault_name=keyvault_name,
+            client_id=client_id,
+            client_secret=client_secret,
+            tenant_id=tenant_id,
+        )
+        self.cache_ttl: float = (
+            settings.KEYVAULT_CACHE_TTL if cache_ttl is None else cache_ttl
+        )
+        self._cache: Dict[str, Tuple[str, float]] = {}
+        self._cache_lock: Lock = Lock()
+
+    def get_secret(self, secret_name: str) -> Secret:
+        with self._cache_lock:
+            cached: Optional[Tuple[str, float]] = self._cache.get(secret_name)
+        if cached is not None and time.monotonic() < cached[1]:
+            return Secret(name=secret_name, value=cached[0])
+
+        value: str = self.backend.get_secret(secret_name)
+        self._cache_secret(secret_name, value)
+        return Secret(name=secret_name, value=value)
+
+    def set_secret(self, secret_name: str, secret_value) -> None:
+        self.backend.set_secret(secret_name, secret_value)
+        self._cache_secret(secret_name, secret_value)
+
+    def _cache_secret(self, name: str, value: str) -> None:
+        with self._cache_lock:
+            self._cache[name] = (value, time.monotonic() + self.cache_ttl)
+
+
+def create_keyvault() -> Keyvault:
+    backend: SecretBackend
+    if settings.KEYVAULT_BACKEND == "azure":
+        backend = AzureSecretBackend(
+            keyvault_name=settings.KEYVAULT_NAME,
+            client_secret=settings.FLOTILLA_AZURE_CLIENT_SECRET,
+            client_id=settings.FLOTILLA_AZURE_CLIENT_ID,
+            tenant_id=settings.AZURE_TENANT_ID,
+        )
+    elif settings.KEYVAULT_BACKEND == "memory":
+        backend = MemorySecretBackend()
+    elif settings.KEYVAULT_BACKEND == "file":
+        backend = FileSecretBackend(path=settings.KEYVAULT_FILE_PATH)
+    else:
+        raise ValueError(
+            f"KEYVAULT_BACKEND must be 'azure', 'memory' or 'file', got '{settings.KEYVAULT_BACKEND}'"
+        )
+
+    return Keyvault(keyvault_name=settings.KEYVAULT_NAME, backend=backend)
@@ -0,0 +1,24 @@
+import math
+from typing import Dict, Optional, Sequence
+
+
+def percentile(values: Sequence[float], fraction: float) -> Optional[float]:
+    """Percentile of values with linear interpolation between the closest ranks,
+    fraction 0.95 gives the 95th percentile. Returns None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank: float = fraction * (len(ordered) - 1)
+    lower: int = math.floor(rank)
+    upper: int = math.ceil(rank)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def latency_percentiles(values: Sequence[float]) -> Dict[str, Optional[float]]:
+    return {
+        "count": len(values),
+        "p50": percentile(values, 0.50),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "max": max(values) if values else None,
+    }
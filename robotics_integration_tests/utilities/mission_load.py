@@ -0,0 +1,241 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from loguru import logger
+
+from robotics_integration_tests.custom_containers.isar import IsarRobot
+from robotics_integration_tests.utilities.isar_simulator import SimulatedIsarRobot
+from robotics_integration_tests.utilities.flotilla_backend_async_api import (
+    AsyncFlotillaBackendClient,
+    get_mission_run_by_id,
+    schedule_mission,
+)
+from robotics_integration_tests.utilities.latency_statistics import (
+    latency_percentiles,
+)
+
+_final_mission_run_statuses: frozenset = frozenset(
+    ("Successful", "PartiallySuccessful", "Failed", "Aborted", "Cancelled")
+)
+
+
+class MissionLoadSample:
+    """Timings of one scheduled mission, all times are time.monotonic() values."""
+
+    def __init__(
+        self, robot: IsarRobot | SimulatedIsarRobot, scheduled_at: float
+    ) -> None:
+        self.robot: IsarRobot | SimulatedIsarRobot = robot
+        self.scheduled_at: float = scheduled_at
+        self.accepted_at: Optional[float] = None
+        self.mission_run_id: Optional[str] = None
+        self.error: Optional[str] = None
+        self.ongoing_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.final_status: Optional[str] = None
+
+    @property
+    def accepted(self) -> bool:
+        return self.mission_run_id is not None
+
+    @property
+    def finished(self) -> bool:
+        return self.final_status is not None
+
+
+class MissionLoadReport:
+    def __init__(
+        self,
+        rate: float,
+        duration: float,
+        samples: List[MissionLoadSample],
+        scheduling_time: float,
+        total_time: float,
+    ) -> None:
+        self.rate: float = rate
+        self.duration: float = duration
+        self.samples: List[MissionLoadSample] = samples
+        self.scheduling_time: float = scheduling_time
+        self.total_time: float = total_time
+
+    def count(self, status: str) -> int:
+        return sum(1 for sample in self.samples if sample.final_status == status)
+
+    @property
+    def accepted(self) -> int:
+        return sum(1 for sample in self.samples if sample.accepted)
+
+    @property
+    def rejected(self) -> int:
+        return len(self.samples) - self.accepted
+
+    @property
+    def unfinished(self) -> int:
+        return sum(
+            1 for sample in self.samples if sample.accepted and not sample.finished
+        )
+
+    @property
+    def accepted_per_second(self) -> float:
+        return self.accepted / self.scheduling_time if self.scheduling_time else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        successful: List[MissionLoadSample] = [
+            sample for sample in self.samples if sample.final_status == "Successful"
+        ]
+        return {
+            "offered_rate": self.rate,
+            "duration": self.duration,
+            "scheduling_time": self.scheduling_time,
+            "total_time": self.total_time,
+            "scheduled": len(self.samples),
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "successful": len(successful),
+            "failed": self.count("Failed"),
+            "unfinished": self.unfinished,
+            "accepted_per_second": self.accepted_per_second,
+            "latencies": {
+                "schedule_request": latency_percentiles(
+                    [
+                        sample.accepted_at - sample.scheduled_at
+                        for sample in self.samples
+                        if sample.accepted
+                    ]
+                ),
+                "schedule_to_ongoing": latency_percentiles(
+                    [
+                        sample.ongoing_at - sample.scheduled_at
+                        for sample in self.samples
+                        if sample.ongoing_at is not None
+                    ]
+                ),
+                "ongoing_to_successful": latency_percentiles(
+                    [
+                        sample.finished_at - sample.ongoing_at
+                        for sample in successful
+                        if sample.ongoing_at is not None
+                    ]
+                ),
+                "schedule_to_successful": latency_percentiles(
+                    [sample.finished_at - sample.scheduled_at for sample in successful]
+                ),
+            },
+            "errors": sorted(
+                {sample.error for sample in self.samples if sample.error is not None}
+            ),
+        }
+
+    def write(self, path: str) -> None:
+        report_path: Path = Path(path)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(json.dumps(self.to_dict(), indent=2))
+        logger.info(f"Mission load report written to {report_path}")
+
+
+async def _schedule(
+    client: AsyncFlotillaBackendClient, sample: MissionLoadSample, mission_id: str
+) -> None:
+    try:
+        mission_run: Dict = await schedule_mission(
+            client=client,
+            robot_id=sample.robot.robot_id,
+            mission_id=mission_id,
+            installation_code=sample.robot.installation_code,
+        )
+    except Exception as e:
+        sample.error = f"{type(e).__name__}: {(str(e).splitlines() or [''])[0]}"
+        return
+    sample.accepted_at = time.monotonic()
+    sample.mission_run_id = mission_run.get("id")
+
+
+async def _update_status(
+    client: AsyncFlotillaBackendClient, sample: MissionLoadSample
+) -> None:
+    mission_run: Dict = await get_mission_run_by_id(client, sample.mission_run_id)
+    status: str = mission_run.get("status")
+    observed_at: float = time.monotonic()
+    if status == "Ongoing" and sample.ongoing_at is None:
+        sample.ongoing_at = observed_at
+    elif status in _final_mission_run_statuses:
+        sample.final_status = status
+        sample.finished_at = observed_at
+
+
+async def run_mission_load(
+    client: AsyncFlotillaBackendClient,
+    robots: Sequence[IsarRobot | SimulatedIsarRobot],
+    rate: float,
+    duration: float,
+    mission_id: str,
+    completion_timeout: float,
+    status_interval: float,
+) -> MissionLoadReport:
+    """Schedule missions at rate per second round robin over robots for duration
+    seconds, and follow every accepted mission run until it has finished.
+
+    Scheduling is open loop: a mission is scheduled at its planned time regardless of
+    how long earlier requests take, so a slow backend shows up as latency rather than
+    as a lower offered rate. Status transitions are observed by polling every mission
+    run that has not finished every status_interval seconds, latencies are therefore
+    accurate to about status_interval.
+    """
+    samples: List[MissionLoadSample] = []
+    start_time: float = time.monotonic()
+
+    async def schedule_missions() -> None:
+        requests: List[asyncio.Task] = []
+        index: int = 0
+        while index / rate < duration:
+            await asyncio.sleep(max(0.0, start_time + index / rate - time.monotonic()))
+            sample: MissionLoadSample = MissionLoadSample(
+                robot=robots[index % len(robots)], scheduled_at=time.monotonic()
+            )
+            samples.append(sample)
+            requests.append(asyncio.create_task(_schedule(client, sample, mission_id)))
+            index += 1
+        await asyncio.gather(*requests)
+
+    scheduler: asyncio.Task = asyncio.create_task(schedule_missions())
+    while not scheduler.done():
+        await _poll_statuses(client, samples)
+        await asyncio.wait((scheduler,), timeout=status_interval)
+    await scheduler
+    scheduling_time: float = time.monotonic() - start_time
+    logger.info(
+        f"Scheduled {len(samples)} missions in {scheduling_time:.1f} seconds, "
+        f"waiting up to {completion_timeout} seconds for them to finish"
+    )
+
+    deadline: float = time.monotonic() + completion_timeout
+    while time.monotonic() < deadline and await _poll_statuses(client, samples):
+        await asyncio.sleep(status_interval)
+
+    return MissionLoadReport(
+        rate=rate,
+        duration=duration,
+        samples=samples,
+        scheduling_time=scheduling_time,
+        total_time=time.monotonic() - start_time,
+    )
+
+
+async def _poll_statuses(
+    client: AsyncFlotillaBackendClient, samples: List[MissionLoadSample]
+) -> int:
+    """Update the status of every unfinished mission run, returns how many remain."""
+    pending: List[MissionLoadSample] = [
+        sample for sample in samples if sample.accepted and not sample.finished
+    ]
+    results: List[Any] = await asyncio.gather(
+        *(_update_status(client, sample) for sample in pending),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"Failed to get the status of a mission run: {result}")
+    return sum(1 for sample in pending if not sample.finished)
@@ -0,0 +1,186 @@
+import csv
+import json
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from robotics_integration_tests.utilities.latency_statistics import (
+    latency_percentiles,
+)
+
+# Upper bounds in seconds of the phase latency histogram buckets
+_histogram_buckets: Tuple[float, ...] = (0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300)
+
+
+class TimelineEvent:
+    def __init__(
+        self,
+        timestamp: float,
+        elapsed: float,
+        kind: str,
+        entity_id: str,
+        status: str,
+        previous_status: Optional[str],
+        previous_elapsed: Optional[float],
+    ) -> None:
+        self.timestamp: float = timestamp
+        self.elapsed: float = elapsed
+        self.kind: str = kind
+        self.entity_id: str = entity_id
+        self.status: str = status
+        self.previous_status: Optional[str] = previous_status
+        self.previous_elapsed: Optional[float] = previous_elapsed
+
+    @property
+    def phase(self) -> Optional[str]:
+        if self.previous_status is None:
+            return None
+        return f"{self.kind} {self.previous_status} -> {self.status}"
+
+    @property
+    def phase_duration(self) -> Optional[float]:
+        if self.previous_elapsed is None:
+            return None
+        return self.elapsed - self.previous_elapsed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timestamp": self.timestamp,
+            "elapsed": self.elapsed,
+            "kind": self.kind,
+            "id": self.entity_id,
+            "status": self.status,
+            "previous_status": self.previous_status,
+            "phase_duration": self.phase_duration,
+        }
+
+
+class MissionTimeline:
+    """Status transitions of mission runs, their tasks and robots seen during a test.
+
+    The timeline does not poll anything itself, it is fed with the mission runs and
+    robots the Flotilla API functions fetch anyway. A transition is therefore recorded
+    when it is first observed, and phase durations are accurate to the interval the
+    test polls or gets status events at.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.events: List[TimelineEvent] = []
+        self._started_at: float = time.monotonic()
+        self._last_seen: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._lock: Lock = Lock()
+
+    def observe_mission_run(self, mission_run: Dict) -> None:
+        self._observe("mission_run", mission_run.get("id"), mission_run.get("status"))
+        for task in mission_run.get("tasks") or []:
+            self._observe("task", task.get("id"), task.get("status"))
+
+    def observe_robot(self, robot: Dict) -> None:
+        self._observe("robot", robot.get("name"), robot.get("status"))
+
+    def _observe(
+        self, kind: str, entity_id: Optional[str], status: Optional[str]
+    ) -> None:
+        if entity_id is None or status is None:
+            return
+        elapsed: float = time.monotonic() - self._started_at
+        with self._lock:
+            previous: Optional[Tuple[str, float]] = self._last_seen.get(
+                (kind, entity_id)
+            )
+            if previous is not None and previous[0] == status:
+                return
+            self._last_seen[(kind, entity_id)] = (status, elapsed)
+            self.events.append(
+                TimelineEvent(
+                    timestamp=time.time(),
+                    elapsed=elapsed,
+                    kind=kind,
+                    entity_id=entity_id,
+                    status=status,
+                    previous_status=previous[0] if previous else None,
+                    previous_elapsed=previous[1] if previous else None,
+                )
+            )
+
+    def phase_latencies(self) -> Dict[str, Dict[str, Any]]:
+        """Latency percentiles and histogram of every observed phase, e.g.
+        'mission_run Pending -> Ongoing'."""
+        durations: Dict[str, List[float]] = {}
+        with self._lock:
+            for event in self.events:
+                if event.phase is not None:
+                    durations.setdefault(event.phase, []).append(event.phase_duration)
+
+        phases: Dict[str, Dict[str, Any]] = {}
+        for phase, values in sorted(durations.items()):
+            histogram: Dict[str, int] = {
+                f"<={bound}": sum(1 for value in values if value <= bound)
+                for bound in _histogram_buckets
+            }
+            histogram["+Inf"] = len(values)
+            phases[phase] = {**latency_percentiles(values), "histogram": histogram}
+        return phases
+
+    def write(self, directory: Path) -> None:
+        """Write <name>.json with the events and phase latencies and <name>.csv with
+        the events. Nothing is written unless a mission run was observed."""
+        with self._lock:
+            events: List[TimelineEvent] = list(self.events)
+        if not any(event.kind == "mission_run" for event in events):
+            return
+
+        directory.mkdir(parents=True, exist_ok=True)
+        json_path: Path = directory / f"{self.name}.json"
+        json_path.write_text(
+            json.dumps(
+                {
+                    "events": [event.to_dict() for event in events],
+                    "phases": self.phase_latencies(),
+                },
+                indent=2,
+            )
+        )
+        with open(directory / f"{self.name}.csv", "w", newline="") as csv_file:
+            writer = csv.DictWriter(
+                csv_file, fieldnames=list(events[0].to_dict().keys())
+            )
+            writer.writeheader()
+            writer.writerows(event.to_dict() for event in events)
+        logger.info(
+            f"Mission timeline with {len(events)} events written to {json_path}"
+        )
+
+
+_active_timelines: List[MissionTimeline] = []
+_active_timelines_lock: Lock = Lock()
+
+
+def start_recording(timeline: MissionTimeline) -> None:
+    with _active_timelines_lock:
+        _active_timelines.append(timeline)
+
+
+def stop_recording(timeline: MissionTimeline) -> None:
+    with _active_timelines_lock:
+        _active_timelines.remove(timeline)
+
+
+def record_mission_run(mission_run: Dict) -> None:
+    """Feed a mission run fetched from Flotilla to the timelines being recorded."""
+    with _active_timelines_lock:
+        timelines: List[MissionTimeline] = list(_active_timelines)
+    for timeline in timelines:
+        timeline.observe_mission_run(mission_run)
+
+
+def record_robot(robot: Dict) -> None:
+    """Feed a robot fetched from Flotilla to the timelines being recorded."""
+    with _active_timelines_lock:
+        timelines: List[MissionTimeline] = list(_active_timelines)
+    for timeline in timelines:
+        timeline.observe_robot(robot)
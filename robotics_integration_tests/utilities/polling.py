@@ -0,0 +1,287 @@
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+import httpx
+import requests
+from loguru import logger
+
+from robotics_integration_tests.settings.settings import settings
+
+T = TypeVar("T")
+
+# Transport errors of the HTTP clients are retried by default, callers whose condition
+# raises anything else while waiting opt in to retrying it
+TRANSPORT_ERRORS: Tuple[Type[BaseException], ...] = (
+    requests.ConnectionError,
+    requests.Timeout,
+    httpx.TransportError,
+)
+
+
+class PollMetrics:
+    def __init__(
+        self, description: str, attempts: int, elapsed: float, succeeded: bool
+    ) -> None:
+        self.description: str = description
+        self.attempts: int = attempts
+        self.elapsed: float = elapsed
+        self.succeeded: bool = succeeded
+
+
+class PollResult(Generic[T]):
+    def __init__(self, value: T, metrics: PollMetrics) -> None:
+        self.value: T = value
+        self.metrics: PollMetrics = metrics
+
+
+class PollStatistics:
+    """Metrics of all polls with the same description."""
+
+    def __init__(self, description: str) -> None:
+        self.description: str = description
+        self.polls: int = 0
+        self.timeouts: int = 0
+        self.attempts: int = 0
+        self.total_elapsed: float = 0.0
+        self.max_elapsed: float = 0.0
+
+    def add(self, metrics: PollMetrics) -> None:
+        self.polls += 1
+        self.timeouts += 0 if metrics.succeeded else 1
+        self.attempts += metrics.attempts
+        self.total_elapsed += metrics.elapsed
+        self.max_elapsed = max(self.max_elapsed, metrics.elapsed)
+
+
+_recorded_statistics: Dict[str, PollStatistics] = {}
+_recorded_statistics_lock: Lock = Lock()
+
+
+def recorded_poll_metrics() -> List[PollStatistics]:
+    with _recorded_statistics_lock:
+        return list(_recorded_statistics.values())
+
+
+def _record(metrics: PollMetrics) -> None:
+    with _recorded_statistics_lock:
+        if metrics.description not in _recorded_statistics:
+            _recorded_statistics[metrics.description] = PollStatistics(
+                metrics.description
+            )
+        _recorded_statistics[metrics.description].add(metrics)
+
+
+class Backoff:
+    """Exponential backoff with jitter, bounded by a minimum and a maximum interval."""
+
+    def __init__(
+        self,
+        min_interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+        factor: Optional[float] = None,
+        jitter: Optional[float] = None,
+    ) -> None:
+        self.min_interval: float = (
+            settings.POLL_MIN_INTERVAL if min_interval is None else min_interval
+        )
+        self.max_interval: float = (
+            settings.POLL_MAX_INTERVAL if max_interval is None else max_interval
+        )
+        self.factor: float = settings.POLL_BACKOFF_FACTOR if factor is None else factor
+        self.jitter: float = settings.POLL_JITTER if jitter is None else jitter
+        self._interval: float = self.min_interval
+
+    def next_interval(self) -> float:
+        interval: float = self._interval
+        self._interval = min(self._interval * self.factor, self.max_interval)
+        jittered: float = interval * (1 + random.uniform(-self.jitter, self.jitter))
+        return max(self.min_interval, min(jittered, self.max_interval))
+
+
+class _Poll:
+    """Attempt bookkeeping shared by the synchronous and the asynchronous poller."""
+
+    def __init__(
+        self,
+        description: str,
+        timeout: float,
+        timeout_message: Optional[str],
+        timeout_exception: Type[Exception],
+    ) -> None:
+        self.description: str = description
+        self.timeout: float = timeout
+        self.timeout_message: Optional[str] = timeout_message
+        self.timeout_exception: Type[Exception] = timeout_exception
+        self.start_time: float = time.monotonic()
+        self.deadline: float = self.start_time + timeout
+        self.attempts: int = 0
+        self.last_exception: Optional[BaseException] = None
+
+    def failed(self, exception: BaseException) -> None:
+        self.last_exception = exception
+        logger.warning(
+            f"{self.description}: attempt {self.attempts} failed with {exception!r}"
+        )
+
+    def succeeded(self, value: T) -> PollResult[T]:
+        metrics: PollMetrics = self._metrics(succeeded=True)
+        logger.info(
+            f"{self.description}: done after {self.attempts} attempts in {metrics.elapsed:.2f} seconds"
+        )
+        return PollResult(value=value, metrics=metrics)
+
+    def remaining(self) -> float:
+        """Return the time left before the deadline, or raise the timeout exception."""
+        remaining: float = self.deadline - time.monotonic()
+        if remaining > 0:
+            return remaining
+        self._metrics(succeeded=False)
+        message: str = (
+            self.timeout_message
+            or f"{self.description}: not done within the given timeout {self.timeout} seconds"
+        )
+        if self.last_exception is not None:
+            message += f" (last error: {self.last_exception!r})"
+        raise self.timeout_exception(message)
+
+    def _metrics(self, succeeded: bool) -> PollMetrics:
+        metrics: PollMetrics = PollMetrics(
+            description=self.description,
+            attempts=self.attempts,
+            elapsed=time.monotonic() - self.start_time,
+            succeeded=succeeded,
+        )
+        _record(metrics)
+        return metrics
+
+
+def poll_until(
+    condition: Callable[[], Optional[T]],
+    description: str,
+    timeout: float = 60,
+    timeout_message: Optional[str] = None,
+    timeout_exception: Type[Exception] = TimeoutError,
+    retry_exceptions: Tuple[Type[BaseException], ...] = TRANSPORT_ERRORS,
+    backoff: Optional[Backoff] = None,
+    sleep: Optional[Callable[[float], None]] = None,
+) -> PollResult[T]:
+    """Call condition until it returns something other than None and return that.
+
+    The deadline is taken from the monotonic clock. Between attempts the poller sleeps
+    with exponential backoff and jitter, or calls sleep with the next interval if given,
+    e.g. to wait for an event instead. Exceptions in retry_exceptions count as a failed
+    attempt, anything else propagates. On timeout, timeout_exception is raised with
+    timeout_message. Metrics of every poll are aggregated per description, see
+    recorded_poll_metrics().
+    """
+    backoff = backoff or Backoff()
+    sleep = sleep or time.sleep
+    poll: _Poll = _Poll(description, timeout, timeout_message, timeout_exception)
+
+    while True:
+        poll.attempts += 1
+        try:
+            value: Optional[T] = condition()
+        except retry_exceptions as e:
+            poll.failed(e)
+            value = None
+
+        if value is not None:
+            return poll.succeeded(value)
+        sleep(min(backoff.next_interval(), poll.remaining()))
+
+
+async def poll_until_async(
+    condition: Callable[[], Awaitable[Optional[T]]],
+    description: str,
+    timeout: float = 60,
+    timeout_message: Optional[str] = None,
+    timeout_exception: Type[Exception] = TimeoutError,
+    retry_exceptions: Tuple[Type[BaseException], ...] = TRANSPORT_ERRORS,
+    backoff: Optional[Backoff] = None,
+) -> PollResult[T]:
+    """Asynchronous counterpart of poll_until, condition is a coroutine function.
+
+    Polls run as tasks on the event loop, so many of them can be awaited together with
+    asyncio.gather without a thread per poll.
+    """
+    backoff = backoff or Backoff()
+    poll: _Poll = _Poll(description, timeout, timeout_message, timeout_exception)
+
+    while True:
+        poll.attempts += 1
+        try:
+            value: Optional[T] = await condition()
+        except retry_exceptions as e:
+            poll.failed(e)
+            value = None
+
+        if value is not None:
+            return poll.succeeded(value)
+        await asyncio.sleep(min(backoff.next_interval(), poll.remaining()))
+
+
+def poll_until_all(
+    conditions: Dict[str, Callable[[], Optional[T]]],
+    description: str,
+    timeout: float = 60,
+    timeout_exception: Type[Exception] = TimeoutError,
+    retry_exceptions: Tuple[Type[BaseException], ...] = TRANSPORT_ERRORS,
+    backoff: Optional[Backoff] = None,
+    max_workers: int = 8,
+) -> Dict[str, T]:
+    """Poll several conditions against one deadline.
+
+    Each round evaluates the conditions that are not yet satisfied concurrently, so the
+    cost of a round is the slowest condition rather than the sum of all of them.
+    """
+    pending: Dict[str, Callable[[], Optional[T]]] = dict(conditions)
+    results: Dict[str, T] = {}
+
+    def evaluate(name: str, condition: Callable[[], Optional[T]]) -> Optional[T]:
+        try:
+            return condition()
+        except retry_exceptions as e:
+            logger.warning(f"{description}: '{name}' failed with {e!r}")
+            return None
+
+    def all_done() -> Optional[Dict[str, T]]:
+        names: List[str] = list(pending)
+        values = executor.map(evaluate, names, [pending[name] for name in names])
+        for name, value in zip(names, values):
+            if value is not None:
+                results[name] = value
+                del pending[name]
+        return results if not pending else None
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="poll"
+    ) as executor:
+        try:
+            return poll_until(
+                condition=all_done,
+                description=description,
+                timeout=timeout,
+                timeout_exception=timeout_exception,
+                retry_exceptions=(),
+                backoff=backoff,
+            ).value
+        except timeout_exception:
+            raise timeout_exception(
+                f"{description}: conditions {sorted(pending)} not done within the given "
+                f"timeout {timeout} seconds"
+            ) from None
@@ -0,0 +1,57 @@
+import threading
+import time
+from contextlib import contextmanager
+from threading import Lock
+from typing import Iterator, List
+
+from robotics_integration_tests.settings.settings import settings
+
+
+class PhaseTiming:
+    def __init__(
+        self, component: str, phase: str, started_at: float, duration: float
+    ) -> None:
+        self.component: str = component
+        self.phase: str = phase
+        # Seconds since the module was imported, i.e. since the start of the session
+        self.started_at: float = started_at
+        self.duration: float = duration
+        self.thread: str = threading.current_thread().name
+
+
+_session_start: float = time.monotonic()
+_recorded_phases: List[PhaseTiming] = []
+_recorded_phases_lock: Lock = Lock()
+
+
+def recorded_phases() -> List[PhaseTiming]:
+    with _recorded_phases_lock:
+        return list(_recorded_phases)
+
+
+def record_phase(
+    component: str, phase: str, started_at: float, duration: float
+) -> None:
+    """Record a phase that started at the time.monotonic() value started_at."""
+    if not settings.STARTUP_PROFILE_ENABLED:
+        return
+    with _recorded_phases_lock:
+        _recorded_phases.append(
+            PhaseTiming(
+                component=component,
+                phase=phase,
+                started_at=started_at - _session_start,
+                duration=duration,
+            )
+        )
+
+
+@contextmanager
+def profile_phase(component: str, phase: str) -> Iterator[None]:
+    """Time a lifecycle phase of a component, e.g. profile_phase("flotilla_backend",
+    "seeding"). The phase is recorded also when it fails."""
+    started_at: float = time.monotonic()
+    try:
+        yield
+    finally:
+        record_phase(component, phase, started_at, time.monotonic() - started_at)
@@ -0,0 +1,87 @@
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from loguru import logger
+from testcontainers.core.container import DockerContainer
+
+from robotics_integration_tests.custom_containers.stream_logging_docker_container import (
+    StreamLoggingDockerContainer,
+)
+from robotics_integration_tests.utilities.polling import poll_until
+from robotics_integration_tests.utilities.profiling import profile_phase
+
+
+def wait_for_container_event(
+    container: DockerContainer, event: str, timeout: float = 60
+) -> float:
+    """Block on the Docker event stream until the container emits the given event.
+
+    Events are replayed from the creation of the container, so an event that happened
+    before the call returns immediately. Returns the time spent waiting in seconds.
+    """
+    start_time: float = time.monotonic()
+    wrapped_container = container.get_wrapped_container()
+    created: datetime = datetime.strptime(
+        wrapped_container.attrs["Created"][:19], "%Y-%m-%dT%H:%M:%S"
+    ).replace(tzinfo=timezone.utc)
+
+    for _ in container.get_docker_client().client.events(
+        decode=True,
+        since=int(created.timestamp()) - 1,
+        until=int(time.time() + timeout) + 1,
+        filters={"container": wrapped_container.id, "event": event},
+    ):
+        elapsed: float = time.monotonic() - start_time
+        logger.info(
+            f"Container {wrapped_container.name} emitted '{event}' after {elapsed:.2f} seconds"
+        )
+        return elapsed
+
+    raise TimeoutError(
+        f"Container {wrapped_container.name} did not emit '{event}' within {timeout} seconds"
+    )
+
+
+def wait_for_port_mapping_to_be_available(
+    container: DockerContainer, port: int, timeout: int = 60
+) -> float:
+    with profile_phase(container._name or container.image, "port mapping"):
+        return _wait_for_port_mapping(container=container, port=port, timeout=timeout)
+
+
+def _wait_for_port_mapping(
+    container: DockerContainer, port: int, timeout: int
+) -> float:
+    start_time: float = time.monotonic()
+    wait_for_container_event(container=container, event="start", timeout=timeout)
+
+    def port_is_mapped() -> Optional[str]:
+        return container.get_exposed_port(port)
+
+    poll_until(
+        condition=port_is_mapped,
+        description=f"Waiting for port mapping of container {container.image} on port {port}",
+        timeout=max(timeout - (time.monotonic() - start_time), 0),
+        timeout_message=f"Port mapping for container {container.image} on port {port} not available within timeout",
+        timeout_exception=ConnectionError,
+        retry_exceptions=(ConnectionError,),
+    )
+    elapsed: float = time.monotonic() - start_time
+    logger.info(
+        f"Port mapping for container {container.image} on port {port} available after {elapsed:.2f} seconds"
+    )
+    return elapsed
+
+
+def wait_for_container_log(
+    container: StreamLoggingDockerContainer, pattern: str, timeout: float = 60
+) -> float:
+    start_time: float = time.monotonic()
+    with profile_phase(container._name or container.image, "ready log line"):
+        container.wait_for_log_line(pattern=pattern, timeout=timeout)
+    elapsed: float = time.monotonic() - start_time
+    logger.info(
+        f"Container {container.image} logged '{pattern}' after {elapsed:.2f} seconds"
+    )
+    return elapsed
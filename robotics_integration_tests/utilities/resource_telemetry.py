@@ -0,0 +1,218 @@
+import gzip
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from docker.errors import APIError, NotFound
+from loguru import logger
+from testcontainers.core.container import DockerContainer
+
+_columns: Tuple[str, ...] = (
+    "t",
+    "cpu_percent",
+    "memory_rss",
+    "block_read",
+    "block_write",
+    "network_rx",
+    "network_tx",
+)
+
+
+def _memory_rss(memory_stats: Dict) -> int:
+    stats: Dict = memory_stats.get("stats") or {}
+    # cgroup v1 reports rss, cgroup v2 reports anonymous memory
+    if "rss" in stats:
+        return stats["rss"]
+    if "anon" in stats:
+        return stats["anon"]
+    return memory_stats.get("usage", 0) - stats.get("inactive_file", 0)
+
+
+def _block_io(blkio_stats: Dict) -> Tuple[int, int]:
+    read: int = 0
+    write: int = 0
+    for entry in blkio_stats.get("io_service_bytes_recursive") or []:
+        operation: str = entry.get("op", "").lower()
+        if operation == "read":
+            read += entry.get("value", 0)
+        elif operation == "write":
+            write += entry.get("value", 0)
+    return read, write
+
+
+def _cpu_time(stats: Dict) -> Tuple[int, int, int]:
+    cpu_stats: Dict = stats.get("cpu_stats") or {}
+    return (
+        cpu_stats.get("cpu_usage", {}).get("total_usage", 0),
+        cpu_stats.get("system_cpu_usage", 0),
+        cpu_stats.get("online_cpus", 1),
+    )
+
+
+def slope(times: List[float], values: List[float]) -> Optional[float]:
+    """Least squares slope of values over times, i.e. the growth per second."""
+    if len(times) < 2:
+        return None
+    mean_time: float = sum(times) / len(times)
+    mean_value: float = sum(values) / len(values)
+    variance: float = sum((t - mean_time) ** 2 for t in times)
+    if variance == 0:
+        return None
+    return (
+        sum((t - mean_time) * (v - mean_value) for t, v in zip(times, values))
+        / variance
+    )
+
+
+class ResourceSampler:
+    """Samples Docker stats of containers on a background thread.
+
+    Every interval seconds the containers returned by get_containers are sampled
+    concurrently with one-shot stats requests, so containers that are started while
+    sampling, like robots, are picked up. Samples are stored per container as columns:
+    seconds since the start of sampling, CPU percent of one core, resident memory in
+    bytes and cumulative block and network I/O in bytes.
+    """
+
+    def __init__(
+        self,
+        get_containers: Callable[[], Dict[str, DockerContainer]],
+        interval: float,
+    ) -> None:
+        self.get_containers: Callable[[], Dict[str, DockerContainer]] = get_containers
+        self.interval: float = interval
+        self.columns: Dict[str, Dict[str, List[float]]] = {}
+        self._previous_cpu_time: Dict[str, Tuple[int, int, int]] = {}
+        self._started_at: float = time.monotonic()
+        self._stop: Event = Event()
+        self._lock: Lock = Lock()
+        self._thread: Optional[Thread] = None
+
+    def start(self) -> "ResourceSampler":
+        self._started_at = time.monotonic()
+        self._thread = Thread(target=self._run, name="resource-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        with ThreadPoolExecutor(thread_name_prefix="resource-sampler") as executor:
+            while not self._stop.is_set():
+                tick: float = time.monotonic()
+                try:
+                    containers: Dict[str, DockerContainer] = self.get_containers()
+                    futures = [
+                        executor.submit(self._sample, name, container)
+                        for name, container in containers.items()
+                    ]
+                    for future in futures:
+                        future.result()
+                except Exception:
+                    logger.exception("Failed to sample container resources")
+                self._stop.wait(max(0.0, self.interval - (time.monotonic() - tick)))
+
+    def _sample(self, name: str, container: DockerContainer) -> None:
+        try:
+            stats: Dict = container.get_wrapped_container().stats(
+                stream=False, one_shot=True
+            )
+        except (APIError, NotFound):
+            # The container stopped in between
+            return
+        elapsed: float = time.monotonic() - self._started_at
+
+        cpu_time: Tuple[int, int, int] = _cpu_time(stats)
+        previous: Optional[Tuple[int, int, int]] = self._previous_cpu_time.get(name)
+        self._previous_cpu_time[name] = cpu_time
+        cpu_percent: float = 0.0
+        if previous is not None and cpu_time[1] > previous[1]:
+            cpu_percent = (
+                (cpu_time[0] - previous[0])
+                / (cpu_time[1] - previous[1])
+                * cpu_time[2]
+                * 100
+            )
+
+        block_read, block_write = _block_io(stats.get("blkio_stats") or {})
+        networks: Dict = stats.get("networks") or {}
+        sample: Dict[str, float] = {
+            "t": round(elapsed, 3),
+            "cpu_percent": round(cpu_percent, 2),
+            "memory_rss": _memory_rss(stats.get("memory_stats") or {}),
+            "block_read": block_read,
+            "block_write": block_write,
+            "network_rx": sum(
+                network.get("rx_bytes", 0) for network in networks.values()
+            ),
+            "network_tx": sum(
+                network.get("tx_bytes", 0) for network in networks.values()
+            ),
+        }
+        with self._lock:
+            columns: Dict[str, List[float]] = self.columns.setdefault(
+                name, {column: [] for column in _columns}
+            )
+            for column in _columns:
+                columns[column].append(sample[column])
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Peak of every metric and the growth per second of memory and block I/O."""
+        with self._lock:
+            columns: Dict[str, Dict[str, List[float]]] = {
+                name: {column: list(values) for column, values in container.items()}
+                for name, container in self.columns.items()
+            }
+
+        summary: Dict[str, Dict[str, Any]] = {}
+        for name, container in sorted(columns.items()):
+            summary[name] = {
+                "samples": len(container["t"]),
+                **{f"peak_{column}": max(container[column]) for column in _columns[1:]},
+                "memory_rss_slope": slope(container["t"], container["memory_rss"]),
+                "block_write_slope": slope(container["t"], container["block_write"]),
+            }
+        return summary
+
+    def write(self, path: Path) -> None:
+        """Write the columns and the summary as gzip compressed JSON."""
+        with self._lock:
+            containers: Dict[str, Dict[str, List[float]]] = {
+                name: {column: list(values) for column, values in container.items()}
+                for name, container in self.columns.items()
+            }
+        if not containers:
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "wt") as telemetry_file:
+            json.dump(
+                {
+                    "interval": self.interval,
+                    "columns": list(_columns),
+                    "containers": containers,
+                    "summary": self.summary(),
+                },
+                telemetry_file,
+                separators=(",", ":"),
+            )
+        logger.info(f"Container resource telemetry written to {path}")
+
+    def log_summary(self) -> None:
+        for name, summary in self.summary().items():
+            memory_slope: Optional[float] = summary["memory_rss_slope"]
+            logger.info(
+                f"{name}: peak CPU {summary['peak_cpu_percent']:.0f}%, "
+                f"peak RSS {summary['peak_memory_rss'] / 2**20:.1f} MiB"
+                + (
+                    f", RSS growth {memory_slope / 2**10:.1f} KiB/s"
+                    if memory_slope is not None
+                    else ""
+                )
+            )
@@ -0,0 +1,223 @@
+import hashlib
+import json
+import math
+import random
+import string
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+import yaml
+
+_datasets_directory: Path = Path(__file__).resolve().parent.parent / "datasets"
+
+
+class SeedData:
+    """Entities to seed into Flotilla.
+
+    installations: (installation code, name)
+    plants: (plant code, installation code, name)
+    inspection_areas: (installation code, plant code, name, area polygon)
+    access_roles: (installation code, role name, access level)
+    """
+
+    def __init__(
+        self,
+        installations: List[Tuple[str, str]],
+        plants: List[Tuple[str, str, str]],
+        inspection_areas: List[Tuple[str, str, str, Dict]],
+        access_roles: List[Tuple[str, str, str]],
+    ) -> None:
+        self.installations: List[Tuple[str, str]] = installations
+        self.plants: List[Tuple[str, str, str]] = plants
+        self.inspection_areas: List[Tuple[str, str, str, Dict]] = inspection_areas
+        self.access_roles: List[Tuple[str, str, str]] = access_roles
+
+    def entity_counts(self) -> Dict[str, int]:
+        return {
+            "installations": len(self.installations),
+            "plants": len(self.plants),
+            "inspectionAreas": len(self.inspection_areas),
+            "access-roles": len(self.access_roles),
+        }
+
+    def fingerprint(self) -> str:
+        """Hash of every entity, identifies the seed data in database snapshot keys."""
+        return hashlib.sha256(
+            json.dumps(
+                [
+                    self.installations,
+                    self.plants,
+                    self.inspection_areas,
+                    self.access_roles,
+                ],
+                sort_keys=True,
+            ).encode()
+        ).hexdigest()
+
+    def extend(self, other: "SeedData") -> None:
+        self.installations.extend(other.installations)
+        self.plants.extend(other.plants)
+        self.inspection_areas.extend(other.inspection_areas)
+        self.access_roles.extend(other.access_roles)
+
+
+@lru_cache(maxsize=None)
+def load_seed_dataset(dataset: str) -> SeedData:
+    """Load a seed dataset by name from the datasets folder, or by path.
+
+    A dataset file is YAML or JSON with the optional keys
+      include: other dataset files, relative to this one, that are loaded first
+      polygons: named area polygons that inspection areas refer to
+      installations, plants, inspection_areas, access_roles: explicit entities
+      generators: arguments for generate_seed_data
+    Datasets are only read when first used and cached afterwards, callers must not
+    modify the returned seed data.
+    """
+    return _load_seed_dataset_file(_resolve_dataset_path(dataset))
+
+
+def _resolve_dataset_path(
+    dataset: str, relative_to: Path = _datasets_directory
+) -> Path:
+    path: Path = relative_to / dataset
+    if path.suffix:
+        return path
+    for suffix in (".yaml", ".yml", ".json"):
+        if path.with_suffix(suffix).exists():
+            return path.with_suffix(suffix)
+    raise FileNotFoundError(f"Seed dataset '{dataset}' not found in {relative_to}")
+
+
+def _load_seed_dataset_file(path: Path) -> SeedData:
+    with open(path, encoding="utf-8") as file:
+        definition: Dict[str, Any] = (
+            json.load(file) if path.suffix == ".json" else yaml.safe_load(file)
+        ) or {}
+
+    seed_data: SeedData = SeedData(
+        installations=[], plants=[], inspection_areas=[], access_roles=[]
+    )
+    for included in definition.get("include", []):
+        seed_data.extend(
+            _load_seed_dataset_file(
+                _resolve_dataset_path(included, relative_to=path.parent)
+            )
+        )
+
+    polygons: Dict[str, Dict] = definition.get("polygons", {})
+    seed_data.extend(
+        SeedData(
+            installations=[
+                (installation["code"], installation["name"])
+                for installation in definition.get("installations", [])
+            ],
+            plants=[
+                (plant["code"], plant["installation"], plant["name"])
+                for plant in definition.get("plants", [])
+            ],
+            inspection_areas=[
+                (
+                    inspection_area["installation"],
+                    inspection_area["plant"],
+                    inspection_area["name"],
+                    polygons[inspection_area["polygon"]],
+                )
+                for inspection_area in definition.get("inspection_areas", [])
+            ],
+            access_roles=[
+                (
+                    access_role["installation"],
+                    access_role["role_name"],
+                    access_role["access_level"],
+                )
+                for access_role in definition.get("access_roles", [])
+            ],
+        )
+    )
+    for generator in definition.get("generators", []):
+        seed_data.extend(generate_seed_data(**generator))
+    return seed_data
+
+
+_name_syllables: List[str] = (
+    "al bre dra fj gul hei ka lun mor nor os rin sle stat tro vi yme".split()
+)
+
+
+def generate_seed_data(
+    installations: int,
+    plants_per_installation: int = 1,
+    inspection_areas_per_plant: int = 1,
+    access_levels: Sequence[str] = ("USER",),
+    seed: int = 0,
+) -> SeedData:
+    """Generate synthetic installations with plants, inspection areas and access roles.
+
+    The same arguments always give the same data. Installation codes start with "S" so
+    they never collide with the codes of real installations in the datasets.
+    """
+    rng: random.Random = random.Random(seed)
+    seed_data: SeedData = SeedData(
+        installations=[], plants=[], inspection_areas=[], access_roles=[]
+    )
+
+    for installation_index in range(installations):
+        installation_code: str = (
+            f"S{''.join(rng.choices(string.ascii_uppercase, k=2))}{installation_index:05d}"
+        )
+        installation_name: str = _generate_name(rng)
+        seed_data.installations.append((installation_code, installation_name))
+
+        for access_level in access_levels:
+            seed_data.access_roles.append(
+                (
+                    installation_code,
+                    f"Role.{access_level.title().replace('_', '')}.{installation_code}",
+                    access_level,
+                )
+            )
+
+        for plant_index in range(plants_per_installation):
+            plant_code: str = f"{installation_code}P{plant_index:02d}"
+            seed_data.plants.append(
+                (plant_code, installation_code, f"{installation_name} {plant_index}")
+            )
+
+            for area_index in range(inspection_areas_per_plant):
+                seed_data.inspection_areas.append(
+                    (
+                        installation_code,
+                        plant_code,
+                        f"{installation_name} {plant_index} Area {area_index}",
+                        _generate_area_polygon(rng),
+                    )
+                )
+
+    return seed_data
+
+
+def _generate_name(rng: random.Random) -> str:
+    return "".join(rng.choices(_name_syllables, k=rng.randint(2, 3))).capitalize()
+
+
+def _generate_area_polygon(rng: random.Random) -> Dict:
+    """A convex deck outline of 4 to 8 corners around a random center, in millimetres."""
+    center_x: float = rng.uniform(0, 200000)
+    center_y: float = rng.uniform(0, 200000)
+    radius: float = rng.uniform(5000, 40000)
+    angles: List[float] = sorted(
+        rng.uniform(0, 2 * math.pi) for _ in range(rng.randint(4, 8))
+    )
+    zmin: int = rng.randrange(0, 60000, 500)
+    return {
+        "zmin": zmin,
+        "zmax": zmin + rng.randrange(3000, 12000, 500),
+        "positions": [
+            {
+                "x": round(center_x + radius * math.cos(angle)),
+                "y": round(center_y + radius * math.sin(angle)),
+            }
+            for angle in angles
+        ],
+    }
@@ -0,0 +1,262 @@
+import json
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from robotics_integration_tests.custom_containers.postgres import (
+    FlotillaDatabase,
+    check_table_columns,
+    copy_rows_into_database,
+)
+from robotics_integration_tests.settings.settings import settings
+from robotics_integration_tests.utilities.flotilla_backend_api import (
+    add_access_role_to_database,
+    add_inspection_area_to_database,
+    add_installation_to_database,
+    add_plant_to_database,
+    list_database_entries,
+)
+from robotics_integration_tests.utilities.polling import poll_until_all
+from robotics_integration_tests.utilities.seed_dataset import (
+    SeedData,
+    load_seed_dataset,
+)
+
+# Entity kinds by their Flotilla request path and the kinds they reference
+_entity_dependencies: Dict[str, List[str]] = {
+    "installations": [],
+    "plants": ["installations"],
+    "inspectionAreas": ["installations", "plants"],
+    "access-roles": ["installations"],
+}
+
+# Columns and data types the bulk seed writes per Flotilla table, following the EF Core
+# models of the migrations ref in the settings, where ids are strings and enums are
+# stored by name
+_seed_table_columns: Dict[str, Dict[str, str]] = {
+    "Installations": {"Id": "text", "InstallationCode": "text", "Name": "text"},
+    "Plants": {
+        "Id": "text",
+        "InstallationId": "text",
+        "PlantCode": "text",
+        "Name": "text",
+    },
+    "InspectionAreas": {
+        "Id": "text",
+        "InstallationId": "text",
+        "PlantId": "text",
+        "Name": "text",
+        "AreaPolygonJson": "text",
+    },
+    "AccessRoles": {
+        "Id": "text",
+        "InstallationId": "text",
+        "RoleName": "text",
+        "AccessLevel": "text",
+    },
+}
+
+
+def seeding_tiers() -> List[List[str]]:
+    """Group the entity kinds into tiers that only depend on earlier tiers."""
+    tiers: List[List[str]] = []
+    seeded: set[str] = set()
+    while len(seeded) < len(_entity_dependencies):
+        tier: List[str] = [
+            kind
+            for kind, dependencies in _entity_dependencies.items()
+            if kind not in seeded and set(dependencies) <= seeded
+        ]
+        if not tier:
+            raise ValueError(
+                f"Seed entity dependencies contain a cycle: {_entity_dependencies}"
+            )
+        tiers.append(tier)
+        seeded.update(tier)
+    return tiers
+
+
+def _api_requests(
+    backend_url: str, seed_data: SeedData
+) -> Dict[str, List[Callable[[], None]]]:
+    return {
+        "installations": [
+            partial(
+                add_installation_to_database,
+                backend_url=backend_url,
+                installation_code=installation_code,
+                name=name,
+            )
+            for installation_code, name in seed_data.installations
+        ],
+        "plants": [
+            partial(
+                add_plant_to_database,
+                backend_url=backend_url,
+                installation_code=installation_code,
+                name=name,
+                plant_code=plant_code,
+            )
+            for plant_code, installation_code, name in seed_data.plants
+        ],
+        "inspectionAreas": [
+            partial(
+                add_inspection_area_to_database,
+                backend_url=backend_url,
+                installation_code=installation_code,
+                name=name,
+                plant_code=plant_code,
+                polygon=polygon,
+            )
+            for installation_code, plant_code, name, polygon in seed_data.inspection_areas
+        ],
+        "access-roles": [
+            partial(
+                add_access_role_to_database,
+                backend_url=backend_url,
+                access_level=access_level,
+                installation_code=installation_code,
+                role_name=role_name,
+            )
+            for installation_code, role_name, access_level in seed_data.access_roles
+        ],
+    }
+
+
+def seed_through_api(
+    backend_url: str, seed_data: SeedData, max_workers: Optional[int] = None
+) -> None:
+    """POST the seed data tier by tier, the requests within a tier run concurrently."""
+    requests_by_kind: Dict[str, List[Callable[[], None]]] = _api_requests(
+        backend_url=backend_url, seed_data=seed_data
+    )
+    with ThreadPoolExecutor(
+        max_workers=max_workers or settings.SEED_MAX_WORKERS,
+        thread_name_prefix="seed",
+    ) as executor:
+        for tier in seeding_tiers():
+            futures: List[Future] = [
+                executor.submit(request)
+                for kind in tier
+                for request in requests_by_kind[kind]
+            ]
+            for future in futures:
+                future.result()
+            logger.info(f"Seeded {', '.join(tier)} through the Flotilla API")
+
+
+def seed_through_database(
+    flotilla_database: FlotillaDatabase, seed_data: SeedData
+) -> None:
+    """COPY the seed data straight into the migrated Flotilla schema.
+
+    The columns are checked against the migrated schema first, so a migrations ref
+    whose models differ from _seed_table_columns fails before anything is copied.
+    Ids are generated here and the references between the entities are resolved by
+    installation and plant code.
+    """
+    check_table_columns(
+        database=flotilla_database.database,
+        username=settings.DB_USER,
+        dbname=settings.DB_ALIAS,
+        tables=_seed_table_columns,
+    )
+    installation_ids: Dict[str, str] = {
+        code: str(uuid.uuid4()) for code, _ in seed_data.installations
+    }
+    plant_ids: Dict[str, str] = {
+        plant_code: str(uuid.uuid4()) for plant_code, _, _ in seed_data.plants
+    }
+
+    tables: Dict[str, Tuple[Sequence[str], List[Sequence[str]]]] = {
+        "Installations": (
+            list(_seed_table_columns["Installations"]),
+            [
+                [installation_ids[code], code, name]
+                for code, name in seed_data.installations
+            ],
+        ),
+        "Plants": (
+            list(_seed_table_columns["Plants"]),
+            [
+                [plant_ids[plant_code], installation_ids[code], plant_code, name]
+                for plant_code, code, name in seed_data.plants
+            ],
+        ),
+        "InspectionAreas": (
+            list(_seed_table_columns["InspectionAreas"]),
+            [
+                [
+                    str(uuid.uuid4()),
+                    installation_ids[code],
+                    plant_ids[plant_code],
+                    name,
+                    json.dumps(polygon),
+                ]
+                for code, plant_code, name, polygon in seed_data.inspection_areas
+            ],
+        ),
+        "AccessRoles": (
+            list(_seed_table_columns["AccessRoles"]),
+            [
+                [str(uuid.uuid4()), installation_ids[code], role_name, access_level]
+                for code, role_name, access_level in seed_data.access_roles
+            ],
+        ),
+    }
+    copy_rows_into_database(
+        database=flotilla_database.database,
+        username=settings.DB_USER,
+        dbname=settings.DB_ALIAS,
+        tables=tables,
+    )
+
+
+def seed_flotilla(
+    backend_url: str,
+    flotilla_database: Optional[FlotillaDatabase],
+    seed_data: SeedData,
+) -> None:
+    """Seed through the database when the dataset is large, otherwise through the API."""
+    entity_count: int = sum(seed_data.entity_counts().values())
+    if flotilla_database is not None and entity_count >= settings.SEED_BULK_THRESHOLD:
+        seed_through_database(flotilla_database=flotilla_database, seed_data=seed_data)
+    else:
+        seed_through_api(backend_url=backend_url, seed_data=seed_data)
+
+
+def wait_for_database_to_be_populated(
+    backend_url: str, timeout: int = 60, seed_data: Optional[SeedData] = None
+) -> None:
+    seed_data = seed_data or load_seed_dataset(settings.SEED_DATASET)
+    expected_entry_counts: Dict[str, int] = seed_data.entity_counts()
+
+    def is_populated(request_path: str) -> Callable[[], Optional[bool]]:
+        def condition() -> Optional[bool]:
+            entries: List[Dict] = list_database_entries(
+                backend_url=backend_url, request_path=request_path
+            )
+            if len(entries) != expected_entry_counts[request_path]:
+                logger.info(
+                    f"Database entries for '{request_path}' have not been populated yet, will retry until timeout..."
+                )
+                return None
+            return True
+
+        return condition
+
+    poll_until_all(
+        conditions={
+            request_path: is_populated(request_path)
+            for request_path in expected_entry_counts
+        },
+        description="Waiting for database to be populated",
+        timeout=timeout,
+        timeout_exception=RuntimeError,
+    )
+    logger.info(
+        f"Database has been populated with {expected_entry_counts} installations, plants, inspection areas and access roles"
+    )
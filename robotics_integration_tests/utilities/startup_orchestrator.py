@@ -0,0 +1,129 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import AbstractContextManager, ExitStack
+from typing import Any, Callable, Dict, List, Set
+
+from loguru import logger
+
+from robotics_integration_tests.utilities.profiling import profile_phase
+
+
+class StartupComponent:
+    def __init__(
+        self,
+        name: str,
+        start: Callable[[Dict[str, Any]], AbstractContextManager],
+        dependencies: List[str],
+    ) -> None:
+        self.name: str = name
+        self.start: Callable[[Dict[str, Any]], AbstractContextManager] = start
+        self.dependencies: List[str] = dependencies
+
+
+class StartupOrchestrator:
+    """Starts components as a dependency graph, independent components are started
+    concurrently on a worker pool.
+
+    Each component is a function receiving the started values of its dependencies
+    and returning a context manager. Entered context managers are pushed onto the
+    exit stack given to start(), so dependents are always stopped before the
+    components they depend on, also when the startup fails halfway.
+    """
+
+    def __init__(self, max_workers: int = 8) -> None:
+        self.max_workers: int = max_workers
+        self.components: Dict[str, StartupComponent] = {}
+
+    def add_component(
+        self,
+        name: str,
+        start: Callable[[Dict[str, Any]], AbstractContextManager],
+        dependencies: List[str] | None = None,
+    ) -> None:
+        if name in self.components:
+            raise ValueError(f"Component '{name}' has already been added")
+        self.components[name] = StartupComponent(
+            name=name, start=start, dependencies=dependencies or []
+        )
+
+    def start(self, stack: ExitStack) -> Dict[str, Any]:
+        self._validate()
+
+        started: Dict[str, Any] = {}
+        pending: Dict[str, StartupComponent] = dict(self.components)
+        running: Dict[Future, str] = {}
+        errors: List[BaseException] = []
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="armada-startup"
+        ) as executor:
+            while pending or running:
+                if not errors:
+                    for name, component in list(pending.items()):
+                        if all(
+                            dependency in started
+                            for dependency in component.dependencies
+                        ):
+                            dependency_values: Dict[str, Any] = {
+                                dependency: started[dependency]
+                                for dependency in component.dependencies
+                            }
+                            running[
+                                executor.submit(
+                                    self._start_component, component, dependency_values
+                                )
+                            ] = name
+                            del pending[name]
+                elif not running:
+                    break
+
+                done, _ = wait(running.keys(), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name: str = running.pop(future)
+                    try:
+                        context_manager, value = future.result()
+                    except BaseException as e:
+                        logger.error(f"Component '{name}' failed to start: {e}")
+                        errors.append(e)
+                        continue
+                    stack.push(context_manager.__exit__)
+                    started[name] = value
+
+        if errors:
+            raise errors[0]
+        return started
+
+    @staticmethod
+    def _start_component(
+        component: StartupComponent, dependency_values: Dict[str, Any]
+    ) -> tuple[AbstractContextManager, Any]:
+        logger.info(f"Starting component '{component.name}'")
+        with profile_phase(component.name, "startup"):
+            context_manager: AbstractContextManager = component.start(dependency_values)
+            value: Any = context_manager.__enter__()
+        logger.info(f"Component '{component.name}' has started")
+        return context_manager, value
+
+    def _validate(self) -> None:
+        for component in self.components.values():
+            for dependency in component.dependencies:
+                if dependency not in self.components:
+                    raise ValueError(
+                        f"Component '{component.name}' depends on unknown component '{dependency}'"
+                    )
+
+        visited: Set[str] = set()
+        visiting: Set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle detected at component '{name}'")
+            visiting.add(name)
+            for dependency in self.components[name].dependencies:
+                visit(dependency)
+            visiting.remove(name)
+            visited.add(name)
+
+        for name in self.components:
+            visit(name)
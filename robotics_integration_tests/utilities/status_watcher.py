@@ -0,0 +1,136 @@
+import json
+import ssl
+import time
+import uuid
+from threading import Condition, Event
+from typing import Any, Dict, Optional
+
+import paho.mqtt.client as mqtt
+from loguru import logger
+
+# ISAR publishes mission, task and robot status changes on these topics per ISAR instance
+_status_topics: Dict[str, str] = {
+    "isar/+/mission": "mission",
+    "isar/+/task": "task",
+    "isar/+/status": "robot",
+}
+
+
+class FlotillaStatusWatcher:
+    """Follows the ISAR status topics on the Flotilla broker.
+
+    Waits use the watcher to sleep until a relevant status event arrives instead of
+    polling the backend on a fixed interval. The backend is still queried to confirm
+    the status, since Flotilla only updates its state after it has processed the event.
+    Events are counted per kind ("mission", "task", "robot") and per kind and robot
+    name, a waiter reads the count before querying the backend and then waits for the
+    count to change, so no event can slip in between.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        use_tls: bool = True,
+    ) -> None:
+        self.host: str = host
+        self.port: int = port
+        self.event_counts: Dict[str, int] = {}
+        self._condition: Condition = Condition()
+        self._connected: Event = Event()
+
+        self.client: mqtt.Client = mqtt.Client(
+            mqtt.CallbackAPIVersion.VERSION2,
+            client_id=f"armada-status-watcher-{uuid.uuid4().hex[:8]}",
+        )
+        self.client.username_pw_set(username=username, password=password)
+        if use_tls:
+            # The broker certificate is issued for the "broker" network alias, not localhost
+            self.client.tls_set(cert_reqs=ssl.CERT_NONE)
+            self.client.tls_insecure_set(True)
+        self.client.on_connect = self._on_connect
+        self.client.on_message = self._on_message
+
+    def start(self, timeout: float = 10) -> None:
+        self.client.connect(host=self.host, port=self.port)
+        self.client.loop_start()
+        if not self._connected.wait(timeout=timeout):
+            self.stop()
+            raise ConnectionError(
+                f"Status watcher could not connect to broker {self.host}:{self.port} within {timeout} seconds"
+            )
+        logger.info(f"Status watcher connected to broker {self.host}:{self.port}")
+
+    def stop(self) -> None:
+        self.client.disconnect()
+        self.client.loop_stop()
+
+    def event_count(self, kind: str, robot_name: Optional[str] = None) -> int:
+        with self._condition:
+            return self.event_counts.get(self._key(kind, robot_name), 0)
+
+    def wait_for_next_event(
+        self,
+        kind: str,
+        seen_count: int,
+        timeout: float,
+        robot_name: Optional[str] = None,
+    ) -> bool:
+        """Block until more than seen_count events of the kind have arrived.
+
+        Returns False if the timeout expired without a new event.
+        """
+        key: str = self._key(kind, robot_name)
+        deadline: float = time.monotonic() + timeout
+        with self._condition:
+            while self.event_counts.get(key, 0) <= seen_count:
+                remaining: float = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(timeout=remaining)
+            return True
+
+    @staticmethod
+    def _key(kind: str, robot_name: Optional[str]) -> str:
+        return kind if robot_name is None else f"{kind}/{robot_name}"
+
+    def _on_connect(
+        self,
+        client: mqtt.Client,
+        userdata: Any,
+        flags: mqtt.ConnectFlags,
+        reason_code: mqtt.ReasonCode,
+        properties: mqtt.Properties,
+    ) -> None:
+        if reason_code.is_failure:
+            logger.warning(f"Status watcher failed to connect to broker: {reason_code}")
+            return
+        # Subscribing on every connect restores the subscriptions after a reconnect
+        client.subscribe([(topic, 1) for topic in _status_topics])
+        self._connected.set()
+
+    def _on_message(
+        self, client: mqtt.Client, userdata: Any, message: mqtt.MQTTMessage
+    ) -> None:
+        kind: Optional[str] = next(
+            (
+                kind
+                for topic, kind in _status_topics.items()
+                if mqtt.topic_matches_sub(topic, message.topic)
+            ),
+            None,
+        )
+        if kind is None:
+            return
+
+        try:
+            robot_name: Optional[str] = json.loads(message.payload).get("robot_name")
+        except (ValueError, AttributeError):
+            robot_name = None
+
+        with self._condition:
+            for key in {self._key(kind, None), self._key(kind, robot_name)}:
+                self.event_counts[key] = self.event_counts.get(key, 0) + 1
+            self._condition.notify_all()